@@ -18,7 +18,7 @@
 ## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
 
 import enum
-from typing import NamedTuple
+from typing import NamedTuple, Optional, Tuple
 
 
 class MicroscopeError(Exception):
@@ -203,3 +203,100 @@ class TriggerMode(enum.Enum):
     BULB = 2
     STROBE = 3
     START = 4
+
+
+class OverflowPolicy(enum.Enum):
+    """Policy for a full :class:`microscope.abc.DataDevice` dispatch buffer.
+
+    The overflow policy defines what happens to new data when the
+    buffer of data waiting to be sent to the client is full, for
+    example, because the client is slower than the device.
+
+    :const:`OverflowPolicy.BLOCK`
+        Wait until there is space in the buffer.  This blocks the
+        thread that acquired the data, which may be a callback from
+        the device SDK.
+    :const:`OverflowPolicy.DROP_OLDEST`
+        Drop the oldest data in the buffer to make space for the new
+        data.
+    :const:`OverflowPolicy.DROP_NEWEST`
+        Drop the new data.
+    :const:`OverflowPolicy.LATEST_ONLY`
+        Drop all data in the buffer so that only the new data is
+        sent.  This is independent of the buffer being full.
+    """
+
+    BLOCK = 0
+    DROP_OLDEST = 1
+    DROP_NEWEST = 2
+    LATEST_ONLY = 3
+
+
+class FrameMetadata:
+    """Metadata of a single data item from a :class:`microscope.abc.DataDevice`.
+
+    Fields that are not known for a specific device are `None`.  The
+    metadata is only sent to clients that request it (see
+    :meth:`microscope.abc.DataDevice.set_client`).
+
+    Attributes:
+        timestamp: time, in seconds since the epoch, at which the
+            data was fetched from the device.
+        hardware_timestamp: time at which the data was acquired,
+            according to the device own clock.  Its units and epoch
+            are device specific.
+        frame_number: number of the frame, as counted by the device.
+            Gaps in the frame numbers mean that frames were dropped.
+        exposure_time: exposure time, in seconds.
+        roi: region of interest, :class:`microscope.ROI`.
+        binning: binning, :class:`microscope.Binning`.
+        transform: transform applied to the data, as a tuple of
+            `(fliplr, flipud, rot90)` flags.
+        driver_info: dict of other device specific fields.
+    """
+
+    __slots__ = (
+        "timestamp",
+        "hardware_timestamp",
+        "frame_number",
+        "exposure_time",
+        "roi",
+        "binning",
+        "transform",
+        "driver_info",
+    )
+
+    def __init__(
+        self,
+        timestamp: Optional[float] = None,
+        hardware_timestamp=None,
+        frame_number: Optional[int] = None,
+        exposure_time: Optional[float] = None,
+        roi: Optional[ROI] = None,
+        binning: Optional[Binning] = None,
+        transform: Optional[Tuple[bool, bool, bool]] = None,
+        driver_info: Optional[dict] = None,
+    ) -> None:
+        self.timestamp = timestamp
+        self.hardware_timestamp = hardware_timestamp
+        self.frame_number = frame_number
+        self.exposure_time = exposure_time
+        self.roi = roi
+        self.binning = binning
+        self.transform = transform
+        self.driver_info = driver_info
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            "%s=%r" % (name, getattr(self, name))
+            for name in self.__slots__
+            if getattr(self, name) is not None
+        )
+        return "%s(%s)" % (type(self).__name__, fields)
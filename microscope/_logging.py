@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+## Copyright (C) 2026 David Miguel Susano Pinto <carandraug@gmail.com>
+##
+## This file is part of Microscope.
+##
+## Microscope is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Microscope is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Logging for code that runs for each frame.
+
+Logging a message for each frame, even at a level that is filtered
+out later by the handlers, costs frame rate.  :class:`HotPathLogger`
+checks the level first, and then logs each message at most once per
+interval, without formatting the messages it suppresses.
+
+"""
+
+import logging
+import sys
+import threading
+import time
+from typing import Dict, List
+
+# Report the caller of HotPathLogger, not HotPathLogger itself, as
+# the origin of the messages.  Only Python 3.8 and later support it.
+if sys.version_info >= (3, 8):
+    _STACKLEVEL = {"stacklevel": 3}
+else:
+    _STACKLEVEL = {}
+
+
+class HotPathLogger:
+    """Rate limited logger for messages in hot loops.
+
+    Messages are identified by their format string.  The first
+    occurrence of a message is logged and then at most one per
+    `interval` seconds, with the number of occurrences suppressed
+    since the last one.  The records have ``suppressed`` and ``count``
+    attributes, with the number of suppressed and total occurrences,
+    for handlers and filters that want them.
+
+    Args:
+        logger: logger to log the messages to.
+        interval: minimum time, in seconds, between two records of
+            the same message.
+
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = 1.0):
+        self._logger = logger
+        self._interval = interval
+        # For each message, the number of occurrences, the number of
+        # them suppressed, and the time it can be logged again.
+        self._state: Dict[str, List] = {}
+        self._lock = threading.Lock()
+
+    def log(self, level: int, msg: str, *args) -> None:
+        if not self._logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.get(msg)
+            if state is None:
+                state = [0, 0, now]
+                self._state[msg] = state
+            state[0] += 1
+            if now < state[2]:
+                state[1] += 1
+                return
+            count = state[0]
+            suppressed = state[1]
+            state[1] = 0
+            state[2] = now + self._interval
+        if suppressed:
+            msg += " (%d similar messages suppressed)"
+            args += (suppressed,)
+        self._logger.log(
+            level,
+            msg,
+            *args,
+            extra={"suppressed": suppressed, "count": count},
+            **_STACKLEVEL,
+        )
+
+    def debug(self, msg: str, *args) -> None:
+        self.log(logging.DEBUG, msg, *args)
+
+    def info(self, msg: str, *args) -> None:
+        self.log(logging.INFO, msg, *args)
+
+    def get_counts(self) -> Dict[str, int]:
+        """Map of messages to their number of occurrences.
+
+        Only occurrences at a level that was enabled are counted.
+        """
+        with self._lock:
+            return {msg: state[0] for msg, state in self._state.items()}
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+## Copyright (C) 2026 David Miguel Susano Pinto <carandraug@gmail.com>
+##
+## This file is part of Microscope.
+##
+## Microscope is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Microscope is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Metrics for monitoring of devices.
+
+Devices report their metrics with
+:meth:`microscope.abc.Device.get_metrics` as a map of metric name to
+its value.  Values are numbers, for counters and gauges, or the
+snapshot of a :class:`Histogram`.  A metric with multiple values,
+e.g., one per method, has as value a list of labels and value pairs.
+The names follow the Prometheus conventions: counters end in
+``_total`` and the unit, if any, is the last part of the name, e.g.,
+``dispatch_latency_seconds``.
+
+"""
+
+import bisect
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+# Upper bounds, in seconds, of the default histogram buckets.  They
+# cover from the time to send a frame to a local client to the time
+# of a slow serial command.
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """Distribution of observed values, such as latencies.
+
+    Only the number of values in each bucket, and their sum, are
+    kept so observing a value is cheap and uses no extra memory.
+
+    Args:
+        buckets: upper bounds of the buckets.  There is always an
+            extra bucket for values larger than all bounds.
+
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._bounds = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state of the histogram.
+
+        Returns a dict with the ``"buckets"``, a list of upper bound
+        and number of values less or equal to it, the ``"sum"`` of all
+        values, and the ``"count"`` of values.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        buckets = []
+        cumulative = 0
+        for bound, count in zip(self._bounds + (math.inf,), counts):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        return {"buckets": buckets, "sum": total, "count": cumulative}
+
+
+def _format_labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        escaped.append('%s="%s"' % (name, value.replace("\n", "\\n")))
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_metrics(
+    samples: Iterable[Tuple[str, Mapping[str, str], Any]],
+    prefix: str = "microscope_",
+) -> str:
+    """Format metrics in the Prometheus text exposition format.
+
+    Args:
+        samples: tuples of metric name, labels, and value.  Values
+            that are not numbers or histogram snapshots are skipped.
+        prefix: prefix for the name of all metrics.
+
+    """
+    families: Dict[str, Tuple[str, List[str]]] = {}
+    for name, labels, value in samples:
+        name = prefix + name
+        if isinstance(value, dict):
+            kind = "histogram"
+            lines = []
+            for bound, count in value["buckets"]:
+                bucket_labels = dict(labels, le=_format_value(bound))
+                lines.append(
+                    "%s_bucket%s %d"
+                    % (name, _format_labels(bucket_labels), count)
+                )
+            lines.append(
+                "%s_sum%s %s"
+                % (name, _format_labels(labels), _format_value(value["sum"]))
+            )
+            lines.append(
+                "%s_count%s %d"
+                % (name, _format_labels(labels), value["count"])
+            )
+        elif isinstance(value, (int, float)):
+            kind = "counter" if name.endswith("_total") else "gauge"
+            lines = [
+                "%s%s %s"
+                % (name, _format_labels(labels), _format_value(value))
+            ]
+        else:
+            continue
+        families.setdefault(name, (kind, []))[1].extend(lines)
+    text = []
+    for name, (kind, lines) in families.items():
+        text.append("# TYPE %s %s" % (name, kind))
+        text.extend(lines)
+    return "\n".join(text) + "\n"
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+## Copyright (C) 2026 David Miguel Susano Pinto <carandraug@gmail.com>
+##
+## This file is part of Microscope.
+##
+## Microscope is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Microscope is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tracing of the stages each frame goes through in a data device.
+
+A :class:`TraceBuffer` keeps the most recent spans, the start and
+end time of a stage, such as fetching a frame from the hardware or
+sending it to a client.  These can be converted with
+:func:`to_chrome_trace` to the Chrome trace event format, which can
+be saved as JSON and opened with Perfetto (https://ui.perfetto.dev)
+or ``chrome://tracing``.
+
+"""
+
+import collections
+import os
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# A span is a tuple of stage name, start and end time, timestamp of
+# the frame (the time it was fetched), number of frames, and the
+# identifier of the thread.  Times are in seconds since the epoch.
+Span = Tuple[str, float, float, float, int, int]
+
+
+class TraceBuffer:
+    """Ring buffer of the most recent spans.
+
+    Recording a span is thread-safe and does not need a lock.
+
+    Args:
+        length: maximum number of spans to keep.
+
+    """
+
+    def __init__(self, length: int) -> None:
+        self._spans = collections.deque(maxlen=length)
+
+    @property
+    def length(self) -> int:
+        return self._spans.maxlen
+
+    def record(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        timestamp: float,
+        count: int = 1,
+    ) -> None:
+        """Record a stage of the frame fetched at `timestamp`.
+
+        Args:
+            name: name of the stage.
+            start: time the stage started.
+            end: time the stage ended.
+            timestamp: time the frame was fetched.  This identifies
+                the frame across stages.
+            count: number of frames, for stages that handle multiple
+                frames at once such as sending a batch.
+        """
+        self._spans.append(
+            (name, start, end, timestamp, count, threading.get_ident())
+        )
+
+    def spans(self) -> List[Span]:
+        return list(self._spans)
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+def to_chrome_trace(
+    spans: Sequence[Span],
+    process_name: Optional[str] = None,
+    thread_names: Optional[Mapping[int, str]] = None,
+) -> Dict[str, Any]:
+    """Convert spans to the Chrome trace event format.
+
+    Args:
+        spans: spans from a :class:`TraceBuffer`.
+        process_name: name to show for this process.
+        thread_names: map of thread identifiers to the name to show.
+
+    Returns:
+        A dict that can be saved with :func:`json.dump`.
+    """
+    pid = os.getpid()
+    events = []
+    if process_name is not None:
+        events.append(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": process_name},
+            }
+        )
+    for tid, name in (thread_names or {}).items():
+        events.append(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+        )
+    for name, start, end, timestamp, count, tid in spans:
+        events.append(
+            {
+                "name": name,
+                "cat": "frame",
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": {"timestamp": timestamp, "frames": count},
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
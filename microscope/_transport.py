@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+
+## Copyright (C) 2026 David Miguel Susano Pinto <carandraug@gmail.com>
+##
+## This file is part of Microscope.
+##
+## Microscope is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Microscope is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Transports for data sent from a data device to its clients.
+
+By default, data is sent to clients as arguments of a Pyro call so it
+is pickled and sent over a socket.  The transports in this module
+are alternatives that a client can request when it calls
+:meth:`microscope.abc.DataDevice.set_client`:
+
+shared memory
+    The device copies the data to shared memory and sends its
+    location over Pyro instead.  The client reads it from there.
+
+stream
+    The device sends the data over its own socket, without Pyro,
+    with the array memory written straight to the socket.
+
+Independently of the transport, remote clients can also ask for
+arrays to be compressed, see :func:`get_codec`.
+
+"""
+
+import importlib
+import logging
+import pickle
+import socket
+import struct
+import sys
+import threading
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    # multiprocessing.shared_memory is only available in Python 3.8
+    # or later.
+    resource_tracker = None
+    shared_memory = None
+
+
+_logger = logging.getLogger(__name__)
+
+
+# Pickle protocol 5, with out-of-band buffers, is only available in
+# Python 3.8 or later.
+HAS_OUT_OF_BAND_PICKLE = pickle.HIGHEST_PROTOCOL >= 5
+
+
+# Alignment, in bytes, of the slots in shared memory.
+_ALIGNMENT = 64
+
+
+def _align(nbytes: int) -> int:
+    return -(-nbytes // _ALIGNMENT) * _ALIGNMENT
+
+
+class SharedMemoryFrame:
+    """Location of an array in a :class:`SharedMemoryRing`.
+
+    This is what is sent over Pyro instead of the array itself.
+    """
+
+    __slots__ = ("name", "slot", "sequence", "offset", "shape", "dtype")
+
+    def __init__(self, name, slot, sequence, offset, shape, dtype) -> None:
+        self.name = name
+        self.slot = slot
+        self.sequence = sequence
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+class SharedMemoryRing:
+    """Ring buffer of arrays in shared memory, the device side.
+
+    Each array written to the ring is copied to the next slot, and
+    the slot is reused once all other slots have been used.  A client
+    that reads a frame after its slot has been reused gets nothing
+    instead of the wrong data.  This is detected with a sequence
+    number per slot, kept at the start of the shared memory, which is
+    set to -1 while the slot is being written.
+
+    The shared memory is allocated on the first write, with slots
+    large enough for that array.  If a larger array is written later,
+    such as a larger batch of frames, a new shared memory block with
+    at least twice the slot size replaces the old one.  This way,
+    arrays of varying size only cause a few allocations.
+
+    Args:
+        n_slots: number of arrays in the ring.
+
+    """
+
+    def __init__(self, n_slots: int) -> None:
+        if shared_memory is None:
+            raise NotImplementedError(
+                "shared memory requires Python 3.8 or later"
+            )
+        self._n_slots = n_slots
+        self._shm = None
+        self._sequences = None
+        self._slot_nbytes = 0
+        self._sequence = 0
+
+    def _allocate(self, nbytes: int) -> None:
+        self.close()
+        self._slot_nbytes = _align(nbytes)
+        header_nbytes = _align(8 * self._n_slots)
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=header_nbytes + self._n_slots * self._slot_nbytes
+        )
+        self._sequences = np.ndarray(
+            (self._n_slots,), dtype=np.int64, buffer=self._shm.buf
+        )
+        self._sequences[:] = -1
+        _logger.debug(
+            "Allocated shared memory '%s' with %d slots of %d bytes",
+            self._shm.name,
+            self._n_slots,
+            self._slot_nbytes,
+        )
+
+    def _slot_offset(self, slot: int) -> int:
+        return _align(8 * self._n_slots) + slot * self._slot_nbytes
+
+    def write(self, array: np.ndarray) -> SharedMemoryFrame:
+        """Copy an array to the next slot and return its location."""
+        if self._shm is None or array.nbytes > self._slot_nbytes:
+            self._allocate(max(array.nbytes, 2 * self._slot_nbytes))
+        slot = self._sequence % self._n_slots
+        offset = self._slot_offset(slot)
+        self._sequences[slot] = -1
+        destination = np.ndarray(
+            array.shape, dtype=array.dtype, buffer=self._shm.buf, offset=offset
+        )
+        np.copyto(destination, array)
+        del destination
+        self._sequences[slot] = self._sequence
+        frame = SharedMemoryFrame(
+            self._shm.name,
+            slot,
+            self._sequence,
+            offset,
+            array.shape,
+            array.dtype.str,
+        )
+        self._sequence += 1
+        return frame
+
+    def close(self) -> None:
+        """Release the shared memory.
+
+        Clients that already opened it can still read from it.
+        """
+        if self._shm is not None:
+            self._sequences = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+class SharedMemoryReader:
+    """Reads arrays from a :class:`SharedMemoryRing`, the client side."""
+
+    def __init__(self) -> None:
+        if shared_memory is None:
+            raise NotImplementedError(
+                "shared memory requires Python 3.8 or later"
+            )
+        self._segments: Dict[str, shared_memory.SharedMemory] = {}
+
+    def _open(self, name: str):
+        shm = self._segments.get(name)
+        if shm is None:
+            if sys.version_info >= (3, 13):
+                shm = shared_memory.SharedMemory(name=name, track=False)
+            else:
+                shm = shared_memory.SharedMemory(name=name)
+                # The shared memory is owned by the device so the
+                # resource tracker must not unlink it when this
+                # process exits.
+                resource_tracker.unregister(shm._name, "shared_memory")
+            # The device only replaces the shared memory with a
+            # larger one so the old ones are no longer needed.
+            self.close()
+            self._segments[name] = shm
+        return shm
+
+    def read(self, frame: SharedMemoryFrame) -> Optional[np.ndarray]:
+        """Return a copy of the array, or `None` if it was overwritten."""
+        try:
+            shm = self._open(frame.name)
+        except FileNotFoundError:
+            # The device already replaced the shared memory.
+            return None
+        sequences = np.ndarray(
+            (frame.slot + 1,), dtype=np.int64, buffer=shm.buf
+        )
+        source = np.ndarray(
+            frame.shape,
+            dtype=np.dtype(frame.dtype),
+            buffer=shm.buf,
+            offset=frame.offset,
+        )
+        try:
+            if sequences[frame.slot] != frame.sequence:
+                return None
+            array = source.copy()
+            if sequences[frame.slot] != frame.sequence:
+                return None
+            return array
+        finally:
+            del sequences, source
+
+    def close(self) -> None:
+        for shm in self._segments.values():
+            shm.close()
+        self._segments.clear()
+
+
+# Prefix of each message in a stream: length of the pickled data and
+# number of out-of-band buffers.  It is followed by the length of each
+# buffer, the pickled data, and the buffers.
+_STREAM_PREFIX = struct.Struct("<QI")
+_STREAM_BUFFER_LENGTH = struct.Struct("<Q")
+
+
+def _recv_exactly(sock: socket.socket, buffer) -> bool:
+    """Fill buffer from socket.  Returns `False` if the socket closed."""
+    view = memoryview(buffer).cast("B")
+    while view.nbytes:
+        n = sock.recv_into(view)
+        if n == 0:
+            return False
+        view = view[n:]
+    return True
+
+
+class StreamSender:
+    """Sends data over a socket, the device side.
+
+    Data is pickled with protocol 5 so that the memory of contiguous
+    arrays is written directly to the socket instead of being copied
+    into the pickle.  Non-contiguous arrays, such as the views made
+    by a camera transform, are copied in the pickle.
+
+    Args:
+        address: `(host, port)` of the :class:`StreamReceiver`.  The
+            connection is only made when the first data is sent.
+    """
+
+    def __init__(self, address: Tuple[str, int]) -> None:
+        if not HAS_OUT_OF_BAND_PICKLE:
+            raise NotImplementedError(
+                "stream transport requires Python 3.8 or later"
+            )
+        self._address = tuple(address)
+        self._socket: Optional[socket.socket] = None
+
+    def send(self, data, timestamp, metadata) -> None:
+        if self._socket is None:
+            self._socket = socket.create_connection(self._address)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        buffers = []
+        header = pickle.dumps(
+            (data, timestamp, metadata),
+            protocol=5,
+            buffer_callback=buffers.append,
+        )
+        raw_buffers = [buffer.raw() for buffer in buffers]
+        self._socket.sendall(
+            b"".join(
+                [_STREAM_PREFIX.pack(len(header), len(raw_buffers))]
+                + [_STREAM_BUFFER_LENGTH.pack(b.nbytes) for b in raw_buffers]
+                + [header]
+            )
+        )
+        for raw in raw_buffers:
+            self._socket.sendall(raw)
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+
+class StreamReceiver:
+    """Receives data from :class:`StreamSender`, the client side.
+
+    Listens for connections on a socket and, for each data item
+    received, calls `callback` with `(data, timestamp, metadata)`.
+    Out-of-band buffers are received straight into new uninitialised
+    arrays which become the memory of the unpickled arrays, so the
+    array data is never copied.
+
+    Args:
+        host: the interface on which to listen.
+        callback: function called with each data item.
+    """
+
+    def __init__(self, host: str, callback: Callable) -> None:
+        if not HAS_OUT_OF_BAND_PICKLE:
+            raise NotImplementedError(
+                "stream transport requires Python 3.8 or later"
+            )
+        self._callback = callback
+        self._socket = socket.create_server((host, 0))
+        self.address = self._socket.getsockname()[:2]
+        thread = threading.Thread(target=self._accept_loop)
+        thread.daemon = True
+        thread.start()
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                # Socket was closed.
+                return
+            thread = threading.Thread(
+                target=self._receive_loop, args=(connection,)
+            )
+            thread.daemon = True
+            thread.start()
+
+    def _receive_loop(self, connection: socket.socket) -> None:
+        prefix = bytearray(_STREAM_PREFIX.size)
+        with connection:
+            while _recv_exactly(connection, prefix):
+                header_length, n_buffers = _STREAM_PREFIX.unpack(prefix)
+                lengths = bytearray(n_buffers * _STREAM_BUFFER_LENGTH.size)
+                header = bytearray(header_length)
+                if not (
+                    _recv_exactly(connection, lengths)
+                    and _recv_exactly(connection, header)
+                ):
+                    return
+                buffers = []
+                for (length,) in _STREAM_BUFFER_LENGTH.iter_unpack(lengths):
+                    buffer = np.empty(length, dtype=np.uint8)
+                    if not _recv_exactly(connection, buffer):
+                        return
+                    buffers.append(buffer)
+                try:
+                    self._callback(*pickle.loads(header, buffers=buffers))
+                except Exception as err:
+                    _logger.error("in StreamReceiver:", exc_info=err)
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+class CompressedFrame:
+    """A compressed array, as sent to clients that asked for it."""
+
+    __slots__ = ("codec", "shape", "dtype", "data")
+
+    def __init__(self, codec: str, shape, dtype: str, data) -> None:
+        self.codec = codec
+        self.shape = shape
+        self.dtype = dtype
+        self.data = data
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def decompress(self) -> np.ndarray:
+        """Return the original array."""
+        return get_codec(self.codec).decompress(self)
+
+
+class _Codec:
+    """Lossless compression of arrays.
+
+    Codecs that need an optional dependency import it on
+    construction and raise `ImportError` if it is missing.
+    """
+
+    name = ""
+
+    def compress(self, array: np.ndarray) -> CompressedFrame:
+        array = np.ascontiguousarray(array)
+        return CompressedFrame(
+            self.name, array.shape, array.dtype.str, self._compress(array)
+        )
+
+    def decompress(self, frame: CompressedFrame) -> np.ndarray:
+        out = np.empty(frame.shape, dtype=np.dtype(frame.dtype))
+        self._decompress_into(frame.data, out)
+        return out
+
+    def _compress(self, array: np.ndarray) -> bytes:
+        raise NotImplementedError()
+
+    def _decompress_into(self, data: bytes, out: np.ndarray) -> None:
+        raise NotImplementedError()
+
+
+class _ZlibCodec(_Codec):
+    """zlib, from the standard library.  Always available but slow."""
+
+    name = "zlib"
+
+    def _compress(self, array):
+        return zlib.compress(array, 1)
+
+    def _decompress_into(self, data, out):
+        out.reshape(-1).view(np.uint8)[:] = np.frombuffer(
+            zlib.decompress(data, bufsize=out.nbytes), dtype=np.uint8
+        )
+
+
+class _LZ4Codec(_Codec):
+    name = "lz4"
+
+    def __init__(self) -> None:
+        self._lz4 = importlib.import_module("lz4.frame")
+
+    def _compress(self, array):
+        return self._lz4.compress(array)
+
+    def _decompress_into(self, data, out):
+        out.reshape(-1).view(np.uint8)[:] = np.frombuffer(
+            self._lz4.decompress(data), dtype=np.uint8
+        )
+
+
+class _ZstdCodec(_Codec):
+    name = "zstd"
+
+    def __init__(self) -> None:
+        zstandard = importlib.import_module("zstandard")
+        # Compressor objects are not thread safe, so each thread
+        # gets its own.
+        self._local = threading.local()
+        self._zstandard = zstandard
+
+    def _compress(self, array):
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = self._zstandard.ZstdCompressor(level=1)
+        return self._local.compressor.compress(array)
+
+    def _decompress_into(self, data, out):
+        raw = self._zstandard.ZstdDecompressor().decompress(
+            data, max_output_size=out.nbytes
+        )
+        out.reshape(-1).view(np.uint8)[:] = np.frombuffer(raw, dtype=np.uint8)
+
+
+class _BloscCodec(_Codec):
+    """Blosc with bit shuffle and LZ4, usually best for images."""
+
+    name = "blosc"
+
+    def __init__(self) -> None:
+        self._blosc = importlib.import_module("blosc")
+
+    def _compress(self, array):
+        return self._blosc.compress_ptr(
+            array.__array_interface__["data"][0],
+            array.size,
+            typesize=array.dtype.itemsize,
+            clevel=5,
+            shuffle=self._blosc.BITSHUFFLE,
+            cname="lz4",
+        )
+
+    def _decompress_into(self, data, out):
+        self._blosc.decompress_ptr(data, out.__array_interface__["data"][0])
+
+
+_CODECS = {
+    codec.name: codec
+    for codec in [_ZlibCodec, _LZ4Codec, _ZstdCodec, _BloscCodec]
+}
+
+_codecs_cache: Dict[str, _Codec] = {}
+
+
+def get_codec(name: str) -> _Codec:
+    """Return the compression codec with the given name.
+
+    The codecs are ``"zlib"``, which is always available, ``"lz4"``,
+    ``"zstd"``, and ``"blosc"`` which require the `lz4`, `zstandard`,
+    and `blosc` packages respectively.
+
+    Raises:
+        KeyError: if there is no codec with that name.
+        ImportError: if the package for the codec is not installed.
+    """
+    codec = _codecs_cache.get(name)
+    if codec is None:
+        codec = _CODECS[name]()
+        _codecs_cache[name] = codec
+    return codec
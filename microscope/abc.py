@@ -36,8 +36,14 @@ import numpy as np
 import Pyro4
 
 import microscope
+import microscope._logging
+import microscope._metrics
+import microscope._tracing
+import microscope._transport
 
 _logger = logging.getLogger(__name__)
+# For messages logged for each data item.
+_hot_logger = microscope._logging.HotPathLogger(_logger)
 
 
 # Mapping of setting data types descriptors to allowed-value types.
@@ -75,6 +81,15 @@ class _Setting:
             function will return `True` or `False` to indicate its
             current state.  If set to no `None` (default), then its
             value will be dependent on the value of `set_func`.
+        cache_ttl: for how long, in seconds, the value read with
+            `get_func` can be reused.  If `None` (default), the value
+            is read each time.  Use `math.inf` for values that only
+            change when the setting is set.
+        requires_restart: whether data devices need to stop and
+            restart acquisition to change this setting.
+        static_values: whether `values`, if a function, always
+            returns the same description.  If so, it is only called
+            once, or again after :meth:`invalidate`.
 
     A client needs some way of knowing a setting name and data type,
     retrieving the current value and, if settable, a way to retrieve
@@ -94,6 +109,24 @@ class _Setting:
 
     """
 
+    # There are many settings and they are used often, e.g., on
+    # parameter sweeps, so avoid a dict per instance.
+    __slots__ = [
+        "name",
+        "dtype",
+        "requires_restart",
+        "_get",
+        "_set",
+        "_values",
+        "_enum",
+        "_static_values",
+        "_values_cache",
+        "_last_written",
+        "_cache_ttl",
+        "_cache",
+        "_readonly",
+    ]
+
     def __init__(
         self,
         name: str,
@@ -102,6 +135,9 @@ class _Setting:
         set_func: Optional[Callable[[Any], None]] = None,
         values: Any = None,
         readonly: Optional[Callable[[], bool]] = None,
+        cache_ttl: Optional[float] = None,
+        requires_restart: bool = True,
+        static_values: bool = False,
     ) -> None:
         self.name = name
         if dtype not in DTYPES:
@@ -112,9 +148,20 @@ class _Setting:
                 % (dtype, name, DTYPES[dtype])
             )
         self.dtype = dtype
+        self.requires_restart = requires_restart
         self._get = get_func
         self._values = values
+        # Resolved once here instead of on every get and set.
+        self._enum = values if isinstance(values, EnumMeta) else None
+        # Allowed values that never change are only computed once,
+        # the first time they're needed.
+        self._static_values = static_values or self._enum is not None
+        self._values_cache: Optional[list] = None
         self._last_written = None
+        self._cache_ttl = cache_ttl
+        # Tuple of value and time it was read, or None.  Replaced,
+        # never modified, so that reading it is thread safe.
+        self._cache: Optional[Tuple[Any, float]] = None
         if self._get is not None:
             self._set = set_func
         else:
@@ -147,14 +194,33 @@ class _Setting:
         }
 
     def get(self):
+        return self.get_with_age()[0]
+
+    def get_with_age(self, max_age: Optional[float] = None):
+        """Return the value and how long ago, in seconds, it was read.
+
+        The age is only non zero for cached values.  `max_age`
+        further limits the age of a cached value.
+        """
+        cache = self._cache
+        if cache is not None:
+            age = time.monotonic() - cache[1]
+            if age <= self._cache_ttl and (max_age is None or age <= max_age):
+                return cache[0], age
         if self._get is not None:
             value = self._get()
         else:
             value = self._last_written
-        if isinstance(self._values, EnumMeta):
-            return self._values(value).value
-        else:
-            return value
+        if self._enum is not None:
+            value = self._enum(value).value
+        if self._cache_ttl and self._get is not None:
+            self._cache = (value, time.monotonic())
+        return value, 0.0
+
+    def invalidate(self) -> None:
+        """Discard the cached value and allowed values, if any."""
+        self._cache = None
+        self._values_cache = None
 
     def readonly(self) -> bool:
         return self._readonly()
@@ -164,13 +230,27 @@ class _Setting:
         if self._set is None:
             raise NotImplementedError()
         # TODO further validation.
-        if isinstance(self._values, EnumMeta):
-            value = self._values(value)
-        self._set(value)
+        if self._enum is not None:
+            value = self._enum(value)
+        try:
+            self._set(value)
+        finally:
+            # The device may have coerced the value so read it again
+            # next time instead of caching what was set.
+            self._cache = None
 
     def values(self):
-        if isinstance(self._values, EnumMeta):
-            return [(v.value, v.name) for v in self._values]
+        if self._static_values:
+            if self._values_cache is None:
+                self._values_cache = self._compute_values()
+            # A copy so that the caller can't modify the cache.
+            values = self._values_cache
+            return list(values) if isinstance(values, list) else values
+        return self._compute_values()
+
+    def _compute_values(self):
+        if self._enum is not None:
+            return [(v.value, v.name) for v in self._enum]
         values = _call_if_callable(self._values)
         if values is not None:
             if self.dtype == "enum":
@@ -283,9 +363,22 @@ class TriggerTargetMixin(metaclass=abc.ABCMeta):
 class Device(metaclass=abc.ABCMeta):
     """A base device class. All devices should subclass this class."""
 
+    # Changes are sent to listeners at most once per
+    # `_change_interval` seconds.  Values read from the hardware,
+    # e.g., the stage position, are only checked if
+    # `_change_poll_interval` is set, every that many seconds (see
+    # `add_change_listener`).
+    _change_interval = 0.1
+    _change_poll_interval: Optional[float] = None
+    _change_thread: Optional[Thread] = None
+
     def __init__(self) -> None:
         self.enabled = False
         self._settings: Dict[str, _Setting] = {}
+        self._change_listeners: Dict[Any, Callable[[dict], None]] = {}
+        self._change_lock = threading.Lock()
+        self._pending_changes: Dict[str, Any] = {}
+        self._watched_values: Dict[str, Any] = {}
 
     def __del__(self) -> None:
         self.shutdown()
@@ -293,6 +386,15 @@ class Device(metaclass=abc.ABCMeta):
     def get_is_enabled(self) -> bool:
         return self.enabled
 
+    def get_metrics(self) -> Dict[str, Any]:
+        """Counters, gauges, and histograms for monitoring the device.
+
+        Returns a map of metric name to its value, either a number or
+        the snapshot of a histogram (see :mod:`microscope._metrics`).
+        Subclasses that keep metrics should extend this.
+        """
+        return {}
+
     def _do_disable(self):
         """Do any device-specific work on disable.
 
@@ -390,6 +492,10 @@ class Device(metaclass=abc.ABCMeta):
             self.disable()
         except Exception as e:
             _logger.warning("Exception in disable() during shutdown: %s", e)
+        if self._change_thread is not None:
+            # The thread stops itself once there are no listeners.
+            with self._change_lock:
+                self._change_listeners.clear()
         _logger.info("Shutting down ... ... ...")
         self._do_shutdown()
         _logger.info("... ... ... ... shut down completed.")
@@ -402,6 +508,9 @@ class Device(metaclass=abc.ABCMeta):
         set_func,
         values,
         readonly: Optional[Callable[[], bool]] = None,
+        cache_ttl: Optional[float] = None,
+        requires_restart: bool = True,
+        static_values: bool = False,
     ) -> None:
         """Add a setting definition.
 
@@ -419,6 +528,23 @@ class Device(metaclass=abc.ABCMeta):
                 indicate its current state.  If set to no `None`
                 (default), then its value will be dependent on the
                 value of `set_func`.
+            cache_ttl: for how long, in seconds, a value read with
+                `get_func` can be reused instead of calling
+                `get_func` again.  If `None` (default), it is never
+                reused.  Use `math.inf` for values that never change,
+                such as a serial number, or that only change when the
+                setting is set.  Setting a value always discards the
+                cached value.
+            requires_restart: whether :class:`DataDevice` needs to
+                stop acquisition while setting this setting, and
+                restart it afterwards.  Settings that only affect how
+                data is processed or sent, and settings the hardware
+                can change while acquiring, should set this to
+                `False`.  Ignored for other devices.
+            static_values: whether `values`, if a function, always
+                returns the same description, in which case it is
+                only called once.  Use :meth:`clear_settings_cache`
+                if it changes.
 
         A client needs some way of knowing a setting name and data
         type, retrieving the current value and, if settable, a way to
@@ -439,7 +565,15 @@ class Device(metaclass=abc.ABCMeta):
             )
         else:
             self._settings[name] = _Setting(
-                name, dtype, get_func, set_func, values, readonly
+                name,
+                dtype,
+                get_func,
+                set_func,
+                values,
+                readonly,
+                cache_ttl,
+                requires_restart,
+                static_values,
             )
 
     def get_setting(self, name: str):
@@ -464,6 +598,44 @@ class Device(metaclass=abc.ABCMeta):
 
         return {k: catch(v.get) for k, v in self._settings.items()}
 
+    def get_settings_snapshot(self, max_age: Optional[float] = None):
+        """Return the value of all settings and their age.
+
+        Unlike :meth:`get_all_settings`, settings with a cache TTL (see
+        :meth:`add_setting`) are not read from the device if their
+        cached value is recent enough.
+
+        Args:
+            max_age: maximum age, in seconds, of cached values.  By
+                default, use the cache TTL of each setting.
+
+        Returns:
+            A dict mapping setting names to a tuple of value and its
+            age in seconds.  Settings that fail to be read have a
+            value and age of `None`.
+        """
+        snapshot = {}
+        for name, setting in self._settings.items():
+            try:
+                snapshot[name] = setting.get_with_age(max_age)
+            except Exception as err:
+                _logger.error("getting %s: %s", name, err)
+                snapshot[name] = (None, None)
+        return snapshot
+
+    def clear_settings_cache(self, name: Optional[str] = None) -> None:
+        """Discard cached setting values and allowed values.
+
+        Args:
+            name: the setting whose value to discard.  If `None`,
+                discard the values of all settings.
+        """
+        if name is None:
+            for setting in self._settings.values():
+                setting.invalidate()
+        else:
+            self._settings[name].invalidate()
+
     def set_setting(self, name: str, value) -> None:
         """Set a setting."""
         try:
@@ -471,6 +643,8 @@ class Device(metaclass=abc.ABCMeta):
         except Exception as err:
             _logger.error("in set_setting(%s):", name, exc_info=err)
             raise
+        if self._change_listeners:
+            self._notify_settings_changed([name])
 
     def describe_setting(self, name: str):
         """Return ordered setting descriptions as a list of dicts."""
@@ -481,44 +655,401 @@ class Device(metaclass=abc.ABCMeta):
         return [(k, v.describe()) for (k, v) in self._settings.items()]
 
     def update_settings(self, incoming, init: bool = False):
-        """Update settings based on dict of settings and values."""
+        """Update settings based on dict of settings and values.
+
+        Settings are set in the order they were added with
+        :meth:`add_setting`, so settings whose allowed values depend
+        on other settings should be added after them.  Unless `init`
+        is `True`, only settings whose current value, which may be a
+        cached value, differs from the new value are set.  If `init`
+        is `True`, all settings that are not read-only must be given.
+
+        Returns:
+            A dict with the value of the updated settings, read back
+            after all settings have been set.
+        """
         if init:
-            # Assume nothing about state: set everything.
-            my_keys = set(self._settings.keys())
-            their_keys = set(incoming.keys())
-            update_keys = my_keys & their_keys
-            if update_keys != my_keys:
-                missing = ", ".join([k for k in my_keys - their_keys])
-                msg = (
-                    "update_settings init=True but missing keys: %s." % missing
+            # Assume nothing about state: set everything.  Read-only
+            # settings can't be set so need not be given.
+            missing = [
+                key
+                for key, setting in self._settings.items()
+                if key not in incoming and not setting.readonly()
+            ]
+            if missing:
+                msg = "update_settings init=True but missing keys: %s." % (
+                    ", ".join(missing)
                 )
                 _logger.debug(msg)
                 raise Exception(msg)
+            update_keys = [key for key in self._settings if key in incoming]
         else:
             # Only update changed values.
-            my_keys = set(self._settings.keys())
-            their_keys = set(incoming.keys())
-            update_keys = set(
+            update_keys = [
                 key
-                for key in my_keys & their_keys
-                if self.get_setting(key) != incoming[key]
-            )
-        results = {}
-        # Update values.
-        for key in update_keys:
-            if key not in my_keys or not self._settings[key].set:
-                # Setting not recognised or no set function implemented
-                results[key] = NotImplemented
-                update_keys.remove(key)
-                continue
-            if self._settings[key].readonly():
+                for key in self._settings.keys()
+                if key in incoming and self.get_setting(key) != incoming[key]
+            ]
+        values = {
+            key: incoming[key]
+            for key in update_keys
+            if not self._settings[key].readonly()
+        }
+        if values:
+            self._set_settings(values)
+        # Read back values once all are set.
+        results = {key: self._settings[key].get() for key in update_keys}
+        if self._change_listeners and results:
+            self._notify_changes(settings=results)
+        return results
+
+    def _set_settings(self, values: Mapping[str, Any]) -> None:
+        """Set multiple settings, in order, for `update_settings`."""
+        for name, value in values.items():
+            self._settings[name].set(value)
+
+    def add_change_listener(self, listener) -> None:
+        """Notify a listener of changes to the device.
+
+        Changes are sent as a dict with any of the keys:
+
+        ``"settings"``
+            dict of setting name to the new value.  Only includes
+            settings set with :meth:`set_setting` or
+            :meth:`update_settings`.
+        ``"enabled"``
+            the new enabled state.
+        ``"power"``
+            for light sources, the new power.
+        ``"position"``
+            for stages, the new position of all axes.
+
+        Changes are coalesced, i.e., multiple changes within a short
+        time are sent together and only the last value of each is
+        sent.  Only the settings are sent as soon as they are set.
+        The other values are checked periodically, while there are
+        listeners.  The power and position are read from the
+        hardware so are only checked if the device has a
+        ``_change_poll_interval``, which is not the case by default.
+
+        Args:
+            listener: either a callable, which is called with the
+                changes, or the URI of a remote object with a
+                ``receiveChanges`` method, which should be
+                `Pyro4.oneway`.  :class:`microscope.clients.Client`
+                takes care of the remote object.
+        """
+        if isinstance(listener, (str, Pyro4.core.URI)):
+            listener = Pyro4.Proxy(listener)
+        if isinstance(listener, Pyro4.Proxy):
+            notify = listener.receiveChanges
+        else:
+            notify = listener
+        with self._change_lock:
+            if self._change_thread is None:
+                self._watched_values = self._get_watched_values()
+                if self._change_poll_interval is not None:
+                    self._watched_values.update(self._get_polled_values())
+                self._change_thread = Thread(
+                    target=self._change_loop, daemon=True
+                )
+                self._change_thread.start()
+            self._change_listeners[listener] = notify
+        _logger.info("Added change listener %s.", str(listener))
+
+    def remove_change_listener(self, listener) -> None:
+        """Stop notifying a listener of changes to the device."""
+        if isinstance(listener, (str, Pyro4.core.URI)):
+            listener = Pyro4.Proxy(listener)
+        with self._change_lock:
+            if listener not in self._change_listeners:
+                raise ValueError("%s is not a change listener" % listener)
+            del self._change_listeners[listener]
+        _logger.info("Removed change listener %s.", str(listener))
+
+    def _get_watched_values(self) -> Dict[str, Any]:
+        """Values to check for changes while there are change listeners.
+
+        These are checked often so must not be read from the
+        hardware.  See :meth:`_get_polled_values` for those.
+        """
+        return {"enabled": self.enabled}
+
+    def _get_polled_values(self) -> Dict[str, Any]:
+        """Values read from the hardware to check for changes.
+
+        Subclasses can extend this for values that may change without
+        being set, e.g., because the hardware takes time to reach
+        them or because they can be changed on the hardware itself.
+        These are only checked if `_change_poll_interval` is set.
+        """
+        return {}
+
+    def _notify_changes(self, settings=None, **values) -> None:
+        """Queue changes to be sent to change listeners."""
+        with self._change_lock:
+            if not self._change_listeners:
+                return
+            if settings:
+                self._pending_changes.setdefault("settings", {}).update(
+                    settings
+                )
+            self._pending_changes.update(values)
+
+    def _notify_settings_changed(self, names) -> None:
+        settings = {}
+        for name in names:
+            try:
+                settings[name] = self._settings[name].get()
+            except Exception as err:
+                _logger.error("getting %s: %s", name, err)
+        self._notify_changes(settings=settings)
+
+    def _change_loop(self) -> None:
+        last_poll = time.monotonic()
+        while True:
+            time.sleep(self._change_interval)
+            poll_interval = self._change_poll_interval
+            try:
+                values = self._get_watched_values()
+                if (
+                    poll_interval is not None
+                    and time.monotonic() - last_poll >= poll_interval
+                ):
+                    last_poll = time.monotonic()
+                    values.update(self._get_polled_values())
+            except Exception as err:
+                _logger.error("checking for changes: %s", err)
+                values = {}
+            changed = {
+                k: v
+                for k, v in values.items()
+                if k not in self._watched_values
+                or self._watched_values[k] != v
+            }
+            self._watched_values.update(values)
+            if changed:
+                self._notify_changes(**changed)
+            with self._change_lock:
+                if not self._change_listeners:
+                    self._change_thread = None
+                    self._pending_changes = {}
+                    return
+                changes = self._pending_changes
+                self._pending_changes = {}
+                listeners = list(self._change_listeners.items())
+            if not changes:
                 continue
-            self._settings[key].set(incoming[key])
-        # Read back values in second loop.
-        for key in update_keys:
-            results[key] = self._settings[key].get()
+            for listener, notify in listeners:
+                try:
+                    notify(changes)
+                except Exception as err:
+                    _logger.warning(
+                        "removing change listener %s: %s", listener, err
+                    )
+                    with self._change_lock:
+                        self._change_listeners.pop(listener, None)
+
+    def call_many(self, calls, return_exceptions: bool = False) -> list:
+        """Call multiple methods in a single call.
+
+        This is meant for remote clients that need to query many
+        values, e.g., all settings and the stage position, where each
+        call would otherwise be a separate round trip.
+
+        Args:
+            calls: sequence of calls.  Each call is either a method
+                name or a tuple `(name, args, kwargs)`, where `args`
+                and `kwargs` are optional.  If `name` is an attribute
+                or property and not a method, its value is returned.
+            return_exceptions: if `True`, exceptions raised by a call
+                are returned in place of its result and the remaining
+                calls are still made.  Otherwise, the first exception
+                is raised.
+
+        Returns:
+            A list with the result of each call, in the same order.
+
+        .. code-block:: python
+
+            exposure, position = device.call_many(
+                [("get_setting", ("exposure time",)), "position"]
+            )
+
+        """
+        results = []
+        for call in calls:
+            try:
+                results.append(self._call_one(call))
+            except Exception as err:
+                if not return_exceptions:
+                    raise
+                results.append(err)
         return results
 
+    def _call_one(self, call):
+        if isinstance(call, str):
+            name, args, kwargs = call, (), {}
+        else:
+            name, *rest = call
+            args = rest[0] if len(rest) > 0 else ()
+            kwargs = rest[1] if len(rest) > 1 else {}
+        # Only what would be accessible to a remote client.
+        if name.startswith("_"):
+            raise AttributeError("%r is not a public attribute" % name)
+        attr = getattr(self, name)
+        if callable(attr):
+            return attr(*args, **kwargs)
+        elif args or kwargs:
+            raise TypeError("%r is not callable" % name)
+        return attr
+
+
+class _BufferPool:
+    """Pool of reusable ndarrays, keyed by shape and dtype.
+
+    Arrays are borrowed with :meth:`acquire` and handed back with
+    :meth:`release`.  Released arrays are kept for reuse by later
+    calls to :meth:`acquire` with the same shape and dtype, up to
+    `capacity` arrays per key.  Only arrays that were borrowed from
+    the pool are taken back, anything else passed to `release` is
+    silently ignored.
+
+    An array may be shared by multiple holders, for example when the
+    same frame is sent to multiple clients.  Each extra holder must
+    call :meth:`retain` and the array is only taken back once all
+    holders have released it.
+
+    Args:
+        capacity: maximum number of free arrays kept per shape and
+            dtype.
+
+    """
+
+    def __init__(self, capacity: int = 8) -> None:
+        self.capacity = capacity
+        self._free: Dict[Tuple[Tuple[int, ...], np.dtype], List] = {}
+        # Arrays currently lent, indexed by their id, as a list of
+        # [array, number of holders, whether it can be reused].
+        # Keeping a reference to them ensures that their ids are not
+        # reused while they are out.
+        self._lent: Dict[int, List] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, shape, dtype) -> np.ndarray:
+        """Borrow an uninitialised array of given shape and dtype."""
+        key = (tuple(shape), np.dtype(dtype))
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                array = free.pop()
+                self.hits += 1
+            else:
+                array = np.empty(key[0], dtype=key[1])
+                self.misses += 1
+            self._lent[id(array)] = [array, 1, True]
+        return array
+
+    def retain(self, array) -> None:
+        """Add a holder to a borrowed array."""
+        with self._lock:
+            entry = self._lent.get(id(array))
+            if entry is not None:
+                entry[1] += 1
+
+    def release(self, array, reuse: bool = True) -> None:
+        """Return a borrowed array to the pool.
+
+        Args:
+            array: the borrowed array.
+            reuse: whether the array can be reused.  This should be
+                `False` if a reference to the array was handed over
+                to someone else, for example, a local client.  The
+                pool then stops tracking the array instead of reusing
+                it.
+        """
+        with self._lock:
+            entry = self._lent.get(id(array))
+            if entry is None:
+                return
+            entry[1] -= 1
+            entry[2] = entry[2] and reuse
+            if entry[1] > 0:
+                return
+            del self._lent[id(array)]
+            if entry[2]:
+                free = self._free.setdefault((array.shape, array.dtype), [])
+                if len(free) < self.capacity:
+                    free.append(array)
+
+    def clear(self) -> None:
+        """Drop all free arrays.
+
+        Arrays currently borrowed are not affected and are still
+        taken back when released.
+        """
+        with self._lock:
+            self._free.clear()
+
+    @property
+    def n_free(self) -> int:
+        """Number of arrays available for reuse."""
+        with self._lock:
+            return sum(len(v) for v in self._free.values())
+
+    @property
+    def n_lent(self) -> int:
+        """Number of arrays currently borrowed."""
+        with self._lock:
+            return len(self._lent)
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes held by the pool, both free and borrowed."""
+        with self._lock:
+            free = sum(a.nbytes for v in self._free.values() for a in v)
+            return free + sum(e[0].nbytes for e in self._lent.values())
+
+
+class _DispatchWorker:
+    """A client of a :class:`DataDevice` and its dispatch queue.
+
+    Each client has its own queue of data and its own thread sending
+    it, so that a slow client does not delay the others.
+
+    """
+
+    # Put in the queue to wake up the dispatch thread once stopped.
+    STOP = object()
+
+    def __init__(self, client, maxsize: int) -> None:
+        self.client = client
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.thread: Optional[Thread] = None
+        # Set to stop the dispatch thread.
+        self.stopped = threading.Event()
+        # Whether to send the metadata of each data item.
+        self.send_metadata = False
+        # Transports used instead of sending the data via Pyro, if
+        # requested by the client (see microscope._transport).
+        self.shared_memory = None
+        self.stream = None
+        # Transports no longer requested by the client, to be closed
+        # once the dispatch thread is no longer using them.
+        self.retired: List = []
+        # Codec to compress arrays, if requested by the client.
+        self.codec = None
+
+
+def _trace(tracer, name, start, end, timestamp) -> None:
+    """Record a span of a single data item or of a batch of them."""
+    if isinstance(timestamp, np.ndarray):
+        tracer.record(name, start, end, float(timestamp[0]), len(timestamp))
+    else:
+        tracer.record(name, start, end, timestamp)
+
 
 def keep_acquiring(func):
     """Wrapper to preserve acquiring state of data capture devices."""
@@ -527,6 +1058,7 @@ def keep_acquiring(func):
         if self._acquiring:
             self.abort()
             result = func(self, *args, **kwargs)
+            self._update_frame_metadata_defaults()
             self._do_enable()
         else:
             result = func(self, *args, **kwargs)
@@ -540,18 +1072,29 @@ class DataDevice(Device, metaclass=abc.ABCMeta):
 
     This class handles a thread to fetch data from a device and dispatch
     it to a client.  The client is set using set_client(uri) or (legacy)
-    receiveClient(uri).
+    receiveClient(uri).  Data can also be sent to other clients that
+    subscribe to it with :meth:`add_subscriber`.  Each client has its
+    own dispatch buffer and thread so that a slow client does not
+    delay the others.
 
     Derived classed should implement:
 
     * :meth:`abort` (required)
     * :meth:`_fetch_data` (required)
+    * :meth:`_wait_for_data` (optional)
     * :meth:`_process_data` (optional)
 
     Derived classes may override ``__init__``, ``enable`` and
     ``disable``, but must ensure to call this class's implementations
     as indicated in the docstrings.
 
+    Args:
+        buffer_length: maximum number of data items waiting to be
+            sent to each client.  Zero, the default, means no limit.
+            What happens when the limit is reached depends on the
+            ``"dispatch overflow policy"`` setting (see
+            :class:`microscope.OverflowPolicy`).
+
     """
 
     def __init__(self, buffer_length: int = 0, **kwargs) -> None:
@@ -565,23 +1108,134 @@ class DataDevice(Device, metaclass=abc.ABCMeta):
         self._using_callback = False
         # Clients to which we send data.
         self._clientStack = []
+        # Clients that get all data, independently of the client stack.
+        self._subscribers = []
+        # Options requested by each client, such as sending metadata.
+        self._client_options = {}
         # A set of live clients to avoid repeated dispatch to disconnected client.
         self._liveClients = set()
-        # A thread to dispatch data.
-        self._dispatch_thread = None
-        # A buffer for data dispatch.
-        self._dispatch_buffer = queue.Queue(maxsize=buffer_length)
+        # Clients to which new data is sent: the client at the top of
+        # the stack and all subscribers.
+        self._dispatch_targets = tuple()
+        # A dispatch buffer and thread for each live client, and
+        # whether the dispatch threads should be running.
+        self._dispatch_workers = {}
+        self._dispatch_workers_lock = threading.RLock()
+        self._dispatching = False
+        # Maximum length of each client dispatch buffer.
+        self._buffer_length = buffer_length
+        # Number of frames in the ring buffer of clients that use the
+        # shared memory transport.
+        self._shared_memory_slots = 16
+        # Bytes before and after compression, and time spent on it,
+        # for all clients that requested compression.
+        self._compression_stats_lock = threading.Lock()
+        self._compressed_nbytes_in = 0
+        self._compressed_nbytes_out = 0
+        self._compression_time = 0.0
+        # What to do with new data when a dispatch buffer is full,
+        # and how much data has been dropped because of it.
+        self._overflow_policy = microscope.OverflowPolicy.BLOCK
+        self._n_dropped = 0
+        # Number of data items fetched and sent to clients, and time
+        # between fetching and sending them.
+        self._n_fetched = 0
+        self._n_dispatched = 0
+        self._dispatch_latency = microscope._metrics.Histogram()
+        # Spans of the stages of recent frames, if tracing is enabled
+        # (see get_trace).
+        self._tracer: Optional[microscope._tracing.TraceBuffer] = None
+        # Serialises producers when the policy requires removing
+        # older data from a dispatch buffer.
+        self._put_lock = threading.Lock()
         # A flag to indicate if device is ready to acquire.
         self._acquiring = False
         # A condition to signal arrival of a new data and unblock grab_next_data
         self._new_data_condition = threading.Condition()
+        # Interval, in seconds, between polls of devices that can't
+        # wait for data (see _wait_for_data) and its limits.
+        self._min_poll_interval = 0.0001
+        self._max_poll_interval = 0.01
+        self._poll_interval = self._min_poll_interval
+        # Maximum time, in seconds, that the fetch thread waits for
+        # data before checking whether it should stop.
+        self._fetch_wait_timeout = 0.1
+        # A pool of reusable arrays for frames.
+        self._buffer_pool = _BufferPool()
+        # Metadata fields common to all frames, cached until the
+        # device is enabled again, and fields of the next frame set
+        # by the driver.
+        self._frame_metadata_defaults: Optional[dict] = None
+        self._frame_metadata: Optional[dict] = None
+        # Maximum number of data items sent to a client in a single
+        # call, and maximum time (in seconds) to wait for a batch to
+        # fill.  A batch size of 1 disables batching.
+        self._batch_size = 1
+        self._batch_latency = 0.0
+        self.add_setting(
+            "dispatch batch size",
+            "int",
+            lambda: self._batch_size,
+            lambda value: setattr(self, "_batch_size", value),
+            (1, 1024),
+            requires_restart=False,
+        )
+        self.add_setting(
+            "dispatch batch latency",
+            "float",
+            lambda: self._batch_latency,
+            lambda value: setattr(self, "_batch_latency", value),
+            (0.0, 10.0),
+            requires_restart=False,
+        )
+        self.add_setting(
+            "dispatch buffer length",
+            "int",
+            lambda: self._buffer_length,
+            self._set_buffer_length,
+            (0, 100000),
+            requires_restart=False,
+        )
+        self.add_setting(
+            "dispatch overflow policy",
+            "enum",
+            lambda: self._overflow_policy,
+            lambda value: setattr(self, "_overflow_policy", value),
+            microscope.OverflowPolicy,
+            requires_restart=False,
+        )
+        self.add_setting(
+            "trace buffer length",
+            "int",
+            self._get_trace_buffer_length,
+            self._set_trace_buffer_length,
+            (0, 1000000),
+            requires_restart=False,
+        )
+        self.add_setting(
+            "buffer pool capacity",
+            "int",
+            lambda: self._buffer_pool.capacity,
+            lambda value: setattr(self._buffer_pool, "capacity", value),
+            (0, 1024),
+            requires_restart=False,
+        )
 
     def __del__(self):
         self.disable()
         super().__del__()
 
-    # Wrap set_setting to pause and resume acquisition.
-    set_setting = keep_acquiring(Device.set_setting)
+    def set_setting(self, name: str, value) -> None:
+        """Set a setting, pausing acquisition if the setting requires it."""
+        setting = self._settings.get(name)
+        if setting is not None and setting.requires_restart:
+            self._set_setting_restarting(name, value)
+        else:
+            super().set_setting(name, value)
+
+    @keep_acquiring
+    def _set_setting_restarting(self, name: str, value) -> None:
+        super().set_setting(name, value)
 
     @abc.abstractmethod
     def abort(self) -> None:
@@ -608,6 +1262,7 @@ class DataDevice(Device, metaclass=abc.ABCMeta):
             self.enabled = False
         else:
             self.enabled = True
+            self._update_frame_metadata_defaults()
             if self._using_callback:
                 _logger.debug("Setup with callback, disabling fetch thread")
                 if self._fetch_thread:
@@ -619,13 +1274,11 @@ class DataDevice(Device, metaclass=abc.ABCMeta):
                     self._fetch_thread.daemon = True
                     self._fetch_thread.start()
 
-            if self._dispatch_thread and self._dispatch_thread.is_alive():
-                _logger.debug("Found live dispatch thread.")
-            else:
-                _logger.debug("Setting up dispatch thread")
-                self._dispatch_thread = Thread(target=self._dispatch_loop)
-                self._dispatch_thread.daemon = True
-                self._dispatch_thread.start()
+            _logger.debug("Setting up dispatch threads")
+            with self._dispatch_workers_lock:
+                self._dispatching = True
+                for worker in self._dispatch_workers.values():
+                    self._start_dispatch_worker(worker)
 
             _logger.debug("... enabled.")
 
@@ -642,8 +1295,19 @@ class DataDevice(Device, metaclass=abc.ABCMeta):
                 self._fetch_thread_run = False
                 self._fetch_thread.join()
             _logger.debug("Fetch thread is dead.")
+        # Frame shape and dtype may change before the next enable.
+        self._buffer_pool.clear()
         super().disable()
 
+    def shutdown(self) -> None:
+        super().shutdown()
+        # Stop the dispatch threads, which also releases resources
+        # used by the client transports, such as shared memory.
+        with self._dispatch_workers_lock:
+            self._clientStack = []
+            self._subscribers = []
+            self._update_dispatch_workers()
+
     @abc.abstractmethod
     def _fetch_data(self) -> None:
         """Poll for data and return it, with minimal processing.
@@ -655,27 +1319,142 @@ class DataDevice(Device, metaclass=abc.ABCMeta):
         function can just return a reference to the object.  If no
         data is available, return `None`.
 
+        To avoid allocating a new array for each frame, the copy
+        should be made into an array borrowed from the device buffer
+        pool (see :meth:`_acquire_buffer` and
+        :meth:`_copy_to_pooled_buffer`).
+
+        If the SDK provides metadata for each data item, such as a
+        hardware timestamp or a frame counter, set it with
+        :meth:`_set_frame_metadata` before returning the data.
+
         """
         raise NotImplementedError()
 
+    def _set_frame_metadata(self, **fields) -> None:
+        """Set metadata fields of the next data item.
+
+        Must be called from the thread that puts the data item in the
+        dispatch buffer, i.e., from :meth:`_fetch_data` or from the
+        SDK callback that calls :meth:`_put`, before the data is put.
+        The keyword arguments are attributes of
+        :class:`microscope.FrameMetadata`.
+
+        """
+        self._frame_metadata = fields
+
+    def _get_frame_metadata_defaults(self) -> dict:
+        """Return metadata fields common to all data items.
+
+        The returned fields are cached when the device is enabled so
+        this is not called for each data item.
+        """
+        return {}
+
+    def _update_frame_metadata_defaults(self) -> None:
+        """Read the metadata fields common to all data items.
+
+        Called when the device is enabled, and when the fields may
+        have changed, so that they are read on the thread controlling
+        the device and not on the fetch thread or an SDK callback.
+        """
+        if not self.enabled:
+            # They will be read once enabled.
+            self._frame_metadata_defaults = None
+            return
+        try:
+            defaults = self._get_frame_metadata_defaults()
+        except Exception as err:
+            _logger.error("in _get_frame_metadata_defaults:", exc_info=err)
+            defaults = {}
+        self._frame_metadata_defaults = defaults
+
+    def _new_frame_metadata(
+        self, timestamp: float
+    ) -> microscope.FrameMetadata:
+        """Create the metadata of a new data item."""
+        metadata = microscope.FrameMetadata(
+            timestamp=timestamp, **(self._frame_metadata_defaults or {})
+        )
+        if self._frame_metadata is not None:
+            for name, value in self._frame_metadata.items():
+                setattr(metadata, name, value)
+            self._frame_metadata = None
+        return metadata
+
+    def _wait_for_data(self, timeout: float) -> bool:
+        """Block until there may be new data to fetch.
+
+        This is called by the fetch thread each time
+        :meth:`_fetch_data` returns `None`.  Devices whose SDK can
+        signal the arrival of new data should override this method to
+        block on that signal for at most `timeout` seconds, and
+        return `True` if there is new data or `False` if it timed out.
+
+        The default implementation is for devices that can only be
+        polled.  It sleeps for an interval that doubles each
+        consecutive time that no data is fetched, up to a maximum of
+        10 milliseconds, and returns `False`.  The interval is reset
+        each time there is new data.
+
+        """
+        time.sleep(self._poll_interval)
+        self._poll_interval = min(
+            2 * self._poll_interval, self._max_poll_interval
+        )
+        return False
+
+    def _acquire_buffer(self, shape, dtype) -> np.ndarray:
+        """Borrow an uninitialised array from the buffer pool.
+
+        Arrays borrowed from the pool and then passed to :meth:`_put`,
+        either directly or by returning them from :meth:`_fetch_data`,
+        are returned to the pool once they are sent to a remote
+        client.  Arrays sent to local clients are never returned to
+        the pool since the client keeps a reference to them.
+
+        """
+        return self._buffer_pool.acquire(shape, dtype)
+
+    def _copy_to_pooled_buffer(self, data) -> np.ndarray:
+        """Return a copy of `data` in an array borrowed from the pool."""
+        array = self._buffer_pool.acquire(data.shape, data.dtype)
+        np.copyto(array, data)
+        return array
+
     def _process_data(self, data):
         """Do any data processing and return data."""
         return data
 
-    def _send_data(self, client, data, timestamp):
-        """Dispatch data to the client."""
-        _logger.debug("sending data to client")
+    def _send_data(self, client, data, timestamp, metadata=None):
+        """Dispatch data to the client.
+
+        If data is being sent in batches (see the ``"dispatch batch
+        size"`` setting) then `data` is a stack of data items along
+        its first dimension and `timestamp` is an array with the
+        timestamp of each item.
+
+        `metadata` is only given to clients that requested it (see
+        :meth:`set_client`).  It is a :class:`microscope.FrameMetadata`
+        or, for batches, a list of them.
+
+        """
+        _hot_logger.debug("sending data to client")
         try:
             # Cockpit will send a client with receiveData and expects
-            # two arguments (data and timestamp).  But we really want
-            # to use Python's Queue and instead of just the timestamp
-            # we should be sending some proper metadata object.  We
-            # don't have that proper metadata class yet so just send
-            # the image data as a numpy ndarray for now.
+            # two arguments (data and timestamp).  Clients that want
+            # the metadata have to ask for it.  Python's Queue gets
+            # only the image data as a numpy ndarray or, if it asked
+            # for metadata, a (data, metadata) tuple.
             if hasattr(client, "put"):
-                client.put(data)
-            else:
+                if metadata is None:
+                    client.put(data)
+                else:
+                    client.put((data, metadata))
+            elif metadata is None:
                 client.receiveData(data, timestamp)
+            else:
+                client.receiveData(data, timestamp, metadata)
         except (
             Pyro4.errors.ConnectionClosedError,
             Pyro4.errors.CommunicationError,
@@ -684,43 +1463,411 @@ class DataDevice(Device, metaclass=abc.ABCMeta):
             _logger.info(
                 "Removing %s from client stack: disconnected.", client._pyroUri
             )
+            self._remove_client(client)
+
+    def _send_to_worker(self, worker, data, timestamp, metadata) -> None:
+        """Send processed data to the worker client.
+
+        Applies the transport and options requested by the client.
+        """
+        if not worker.send_metadata:
+            metadata = None
+        if worker.codec is not None and isinstance(data, np.ndarray):
+            data = self._compress(worker.codec, data, timestamp)
+        # The transports may change, on another thread, while sending.
+        ring = worker.shared_memory
+        if ring is not None and isinstance(data, np.ndarray):
+            data = ring.write(data)
+        stream = worker.stream
+        if stream is not None:
+            self._send_stream(worker, stream, data, timestamp, metadata)
+        else:
+            self._send_data(worker.client, data, timestamp, metadata)
+
+    def _compress(self, codec, data, timestamp):
+        start = time.perf_counter()
+        compressed = codec.compress(data)
+        elapsed = time.perf_counter() - start
+        tracer = self._tracer
+        if tracer is not None:
+            end = time.time()
+            _trace(tracer, "compress", end - elapsed, end, timestamp)
+        with self._compression_stats_lock:
+            self._compressed_nbytes_in += data.nbytes
+            self._compressed_nbytes_out += len(compressed.data)
+            self._compression_time += elapsed
+        return compressed
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = super().get_metrics()
+        with self._dispatch_workers_lock:
+            workers = list(self._dispatch_workers.values())
+        with self._compression_stats_lock:
+            compressed_in = self._compressed_nbytes_in
+            compressed_out = self._compressed_nbytes_out
+            compression_time = self._compression_time
+        metrics.update(
+            {
+                "frames_fetched_total": self._n_fetched,
+                "frames_dispatched_total": self._n_dispatched,
+                "frames_dropped_total": self._n_dropped,
+                "dispatch_clients": len(workers),
+                "dispatch_buffer_depth": sum(w.queue.qsize() for w in workers),
+                "dispatch_latency_seconds": self._dispatch_latency.snapshot(),
+                "compression_input_bytes_total": compressed_in,
+                "compression_output_bytes_total": compressed_out,
+                "compression_seconds_total": compression_time,
+                "buffer_pool_hits_total": self._buffer_pool.hits,
+                "buffer_pool_misses_total": self._buffer_pool.misses,
+                "buffer_pool_bytes": self._buffer_pool.nbytes,
+            }
+        )
+        return metrics
+
+    def _get_trace_buffer_length(self) -> int:
+        tracer = self._tracer
+        return 0 if tracer is None else tracer.length
+
+    def _set_trace_buffer_length(self, length: int) -> None:
+        if length == 0:
+            self._tracer = None
+        elif length != self._get_trace_buffer_length():
+            self._tracer = microscope._tracing.TraceBuffer(length)
+
+    def get_trace(self) -> Dict[str, Any]:
+        """Trace of the stages of the most recent frames.
+
+        Tracing is disabled by default.  It is enabled by setting the
+        ``"trace buffer length"`` setting to the maximum number of
+        spans to keep.  Each frame has a span for each stage: the
+        ``"fetch"`` from the hardware, the ``"put"`` in the dispatch
+        buffers, the time it waited in the ``"queue"`` of each client,
+        and its ``"process"``, ``"compress"``, and ``"send"`` to each
+        client.  Spans of the same frame have the same ``timestamp``
+        argument.
+
+        Returns:
+            The trace in the Chrome trace event format.  Save it with
+            :func:`json.dump` to view it with Perfetto or
+            ``chrome://tracing``.
+        """
+        tracer = self._tracer
+        spans = [] if tracer is None else tracer.spans()
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        return microscope._tracing.to_chrome_trace(
+            spans, type(self).__name__, thread_names
+        )
+
+    def clear_trace(self) -> None:
+        """Drop all spans recorded so far."""
+        tracer = self._tracer
+        if tracer is not None:
+            tracer.clear()
+
+    def _send_stream(self, worker, stream, data, timestamp, metadata):
+        """Send data to the worker client over its stream."""
+        contiguous = None
+        if isinstance(data, np.ndarray) and not (
+            data.flags.c_contiguous or data.flags.f_contiguous
+        ):
+            # Only contiguous arrays are pickled out-of-band.  Copying
+            # to a pooled array is cheaper than the copy pickle would
+            # do to a new bytes object.
+            contiguous = self._copy_to_pooled_buffer(data)
+            data = contiguous
+        try:
+            stream.send(data, timestamp, metadata)
+        except OSError as err:
+            _logger.info(
+                "Removing %s from clients: stream failed (%s).",
+                worker.client,
+                err,
+            )
+            self._remove_client(worker.client)
+        finally:
+            if contiguous is not None:
+                self._buffer_pool.release(contiguous)
+
+    def _remove_client(self, client) -> None:
+        """Stop sending data to a client, e.g., because it disconnected."""
+        with self._dispatch_workers_lock:
             self._clientStack = list(filter(client.__ne__, self._clientStack))
-            self._liveClients = self._liveClients.difference([client])
+            self._subscribers = list(filter(client.__ne__, self._subscribers))
+            self._update_dispatch_workers()
+
+    def _dispatch(self, worker, data, timestamp, metadata=None) -> None:
+        """Process and send a single data item to the worker client."""
+        client = worker.client
+        if isinstance(data, Exception):
+            standard_exception = Exception(str(data).encode("ascii"))
+            self._send_data(client, standard_exception, timestamp)
+            return
+        tracer = self._tracer
+        try:
+            if tracer is None:
+                processed = self._process_data(data)
+                self._send_to_worker(worker, processed, timestamp, metadata)
+            else:
+                start = time.time()
+                processed = self._process_data(data)
+                processed_at = time.time()
+                self._send_to_worker(worker, processed, timestamp, metadata)
+                tracer.record("process", start, processed_at, timestamp)
+                tracer.record("send", processed_at, time.time(), timestamp)
+        finally:
+            # Data sent to a remote client has been serialised by now
+            # so its array can be reused.  Local clients keep a
+            # reference to the array so it must not be reused.
+            self._buffer_pool.release(
+                data, reuse=isinstance(client, Pyro4.Proxy)
+            )
+
+    def _dispatch_batch(self, worker, batch) -> None:
+        """Process and send multiple data items in a single call.
+
+        The processed data is stacked into a single array and sent
+        together with an array of timestamps and a list of metadata.
+        If the processed data can't be stacked, because it has
+        different shapes or types, each item is sent on its own.
+
+        """
+        client = worker.client
+        tracer = self._tracer
+        if tracer is not None:
+            start = time.time()
+        processed = [self._process_data(data) for data, _, _ in batch]
+        if tracer is not None:
+            processed_at = time.time()
+            tracer.record(
+                "process", start, processed_at, batch[0][1], len(batch)
+            )
+        first = processed[0]
+        if not all(
+            isinstance(p, np.ndarray)
+            and p.shape == first.shape
+            and p.dtype == first.dtype
+            for p in processed
+        ):
+            for (data, timestamp, metadata), p in zip(batch, processed):
+                self._send_to_worker(worker, p, timestamp, metadata)
+                self._buffer_pool.release(
+                    data, reuse=isinstance(client, Pyro4.Proxy)
+                )
+            return
+        stack = self._acquire_buffer((len(batch),) + first.shape, first.dtype)
+        np.stack(processed, out=stack)
+        # The stack is a copy so the original arrays can be reused,
+        # even if the client is local.
+        for data, _, _ in batch:
+            self._buffer_pool.release(data)
+        timestamps = np.array([timestamp for _, timestamp, _ in batch])
+        metadata = [m for _, _, m in batch]
+        try:
+            self._send_to_worker(worker, stack, timestamps, metadata)
+            if tracer is not None:
+                _trace(tracer, "send", processed_at, time.time(), timestamps)
+        finally:
+            self._buffer_pool.release(
+                stack, reuse=isinstance(client, Pyro4.Proxy)
+            )
+
+    def _get_batch(self, worker, item):
+        """Take more data from a client dispatch buffer.
+
+        Waits at most the batch latency for more data.  Returns a list
+        of `(data, timestamp, metadata)` items and, if one was taken
+        from the dispatch buffer but could not be part of the batch,
+        the next item to dispatch.
 
-    def _dispatch_loop(self) -> None:
-        """Process data and send results to any client."""
+        """
+        batch = [item]
+        deadline = time.monotonic() + self._batch_latency
+        while len(batch) < self._batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    item = worker.queue.get(timeout=timeout)
+                else:
+                    item = worker.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DispatchWorker.STOP or isinstance(item[0], Exception):
+                return batch, item
+            batch.append(item)
+        return batch, None
+
+    def _dispatch_loop(self, worker) -> None:
+        """Process data and send results to the worker client."""
+        client = worker.client
+        item = None
         while True:
-            _logger.debug("Getting data from dispatch buffer")
-            client, data, timestamp = self._dispatch_buffer.get(block=True)
+            if item is None:
+                _hot_logger.debug("Getting data from dispatch buffer")
+                item = worker.queue.get(block=True)
+            if worker.stopped.is_set():
+                if item is not _DispatchWorker.STOP:
+                    self._drop(item[0], count=False)
+                worker.queue.task_done()
+                break
+            data, timestamp, metadata = item
             if client not in self._liveClients:
-                _logger.debug("Client not in liveClients so ignoring data.")
+                _hot_logger.debug(
+                    "Client not in liveClients so ignoring data."
+                )
+                self._buffer_pool.release(data)
+                worker.queue.task_done()
+                item = None
                 continue
-            err = None
-            if isinstance(data, Exception):
-                standard_exception = Exception(str(data).encode("ascii"))
-                try:
-                    self._send_data(client, standard_exception, timestamp)
-                except Exception as e:
-                    err = e
+            if self._batch_size > 1 and not isinstance(data, Exception):
+                batch, item = self._get_batch(worker, item)
             else:
-                try:
-                    self._send_data(
-                        client, self._process_data(data), timestamp
+                batch, item = [item], None
+            tracer = self._tracer
+            if tracer is not None:
+                now = time.time()
+                for _, queued_timestamp, _ in batch:
+                    tracer.record(
+                        "queue", queued_timestamp, now, queued_timestamp
                     )
-                except Exception as e:
-                    err = e
-            if err:
+            try:
+                if len(batch) > 1:
+                    self._dispatch_batch(worker, batch)
+                else:
+                    self._dispatch(worker, data, timestamp, metadata)
+            except Exception as err:
                 # Raising an exception will kill the dispatch loop. We need
                 # another way to notify the client that there was a problem.
                 _logger.error("in _dispatch_loop:", exc_info=err)
-            self._dispatch_buffer.task_done()
+            else:
+                now = time.time()
+                for _, sent_timestamp, _ in batch:
+                    self._dispatch_latency.observe(now - sent_timestamp)
+                self._n_dispatched += len(batch)
+            if worker.retired:
+                self._close_retired(worker)
+            for _ in batch:
+                worker.queue.task_done()
+        # Anything still in the buffer was put there after the client
+        # was removed.
+        while self._drop_oldest(worker, count=False):
+            pass
+        for transport in (worker.shared_memory, worker.stream):
+            if transport is not None:
+                transport.close()
+        self._close_retired(worker)
+
+    def _close_retired(self, worker) -> None:
+        """Close the transports no longer used by the worker client."""
+        while True:
+            try:
+                transport = worker.retired.pop()
+            except IndexError:
+                return
+            transport.close()
+
+    def _retire_transport(self, worker, name: str) -> None:
+        """Stop using a transport of the worker client and close it.
+
+        The dispatch thread may still be using it so, if running, the
+        thread closes it once done.
+        """
+        transport = getattr(worker, name)
+        setattr(worker, name, None)
+        worker.retired.append(transport)
+        if worker.thread is None or not worker.thread.is_alive():
+            self._close_retired(worker)
+
+    def _start_dispatch_worker(self, worker) -> None:
+        if worker.thread is None:
+            worker.thread = Thread(target=self._dispatch_loop, args=(worker,))
+            worker.thread.daemon = True
+            worker.thread.start()
+
+    def _stop_dispatch_worker(self, worker) -> None:
+        """Drop all data for the worker client and stop its thread.
+
+        This does not wait for the thread to finish since it may be
+        called from the thread itself.  It does not block either,
+        since it is called with the dispatch workers lock.
+        """
+        worker.stopped.set()
+        while self._drop_oldest(worker, count=False):
+            pass
+        try:
+            worker.queue.put_nowait(_DispatchWorker.STOP)
+        except queue.Full:
+            # A put that was blocked on the full buffer filled it
+            # again.  The thread will wake up to that data instead.
+            pass
+
+    def _update_dispatch_workers(self) -> None:
+        """Start and stop dispatch workers after changes of clients.
+
+        Must be called after any change to the client stack or the
+        subscribers.
+        """
+        with self._dispatch_workers_lock:
+            self._liveClients = set(self._clientStack).union(self._subscribers)
+            targets = []
+            for client in [self._client] + self._subscribers:
+                if client is not None and client not in targets:
+                    targets.append(client)
+            for client in targets:
+                worker = self._dispatch_workers.get(client)
+                if worker is None:
+                    worker = _DispatchWorker(client, self._buffer_length)
+                    self._dispatch_workers[client] = worker
+                    if self._dispatching:
+                        self._start_dispatch_worker(worker)
+                options = self._client_options.get(client, {})
+                worker.send_metadata = options.get("send_metadata", False)
+                transport = options.get("transport")
+                if transport != "shm" and worker.shared_memory is not None:
+                    self._retire_transport(worker, "shared_memory")
+                if transport != "stream" and worker.stream is not None:
+                    self._retire_transport(worker, "stream")
+                if transport == "shm" and worker.shared_memory is None:
+                    worker.shared_memory = (
+                        microscope._transport.SharedMemoryRing(
+                            self._shared_memory_slots
+                        )
+                    )
+                elif transport == "stream" and worker.stream is None:
+                    worker.stream = microscope._transport.StreamSender(
+                        options["stream_address"]
+                    )
+                if options.get("compression") is not None:
+                    worker.codec = microscope._transport.get_codec(
+                        options["compression"]
+                    )
+                else:
+                    worker.codec = None
+            for client in list(self._dispatch_workers.keys()):
+                if client not in self._liveClients:
+                    worker = self._dispatch_workers.pop(client)
+                    self._stop_dispatch_worker(worker)
+            for client in list(self._client_options.keys()):
+                if client not in self._liveClients:
+                    del self._client_options[client]
+            self._dispatch_targets = tuple(
+                self._dispatch_workers[client] for client in targets
+            )
+
+    def _set_buffer_length(self, length: int) -> None:
+        with self._dispatch_workers_lock:
+            self._buffer_length = length
+            for worker in self._dispatch_workers.values():
+                worker.queue.maxsize = length
 
     def _fetch_loop(self) -> None:
         """Poll source for data and put it into dispatch buffer."""
         self._fetch_thread_run = True
 
         while self._fetch_thread_run:
-            _logger.debug("Fetching data from device.")
+            _hot_logger.debug("Fetching data from device.")
+            tracer = self._tracer
+            if tracer is not None:
+                start = time.time()
             try:
                 data = self._fetch_data()
             except Exception as e:
@@ -731,13 +1878,23 @@ class DataDevice(Device, metaclass=abc.ABCMeta):
                 self._put(e, timestamp)
                 data = None
             if data is not None:
-                _logger.debug("Fetch data to be put into dispatch buffer.")
-                # TODO Add support for timestamp from hardware.
+                _hot_logger.debug("Fetch data to be put into dispatch buffer.")
+                # Timestamps from hardware, if any, are in the
+                # metadata set by _fetch_data.
                 timestamp = time.time()
+                if tracer is not None:
+                    tracer.record("fetch", start, timestamp, timestamp)
                 self._put(data, timestamp)
+                self._poll_interval = self._min_poll_interval
             else:
-                _logger.debug("Fetched no data from device.")
-                time.sleep(0.001)
+                _hot_logger.debug("Fetched no data from device.")
+                try:
+                    self._wait_for_data(self._fetch_wait_timeout)
+                except Exception as e:
+                    _logger.error("in _fetch_loop:", exc_info=e)
+                    # Fallback to polling so that a failing wait does
+                    # not become a busy loop.
+                    DataDevice._wait_for_data(self, self._fetch_wait_timeout)
 
     @property
     def _client(self):
@@ -747,17 +1904,100 @@ class DataDevice(Device, metaclass=abc.ABCMeta):
     @_client.setter
     def _client(self, val):
         """Push or pop a client from the _clientStack."""
-        if val is None:
-            self._clientStack.pop()
-        else:
-            self._clientStack.append(val)
-        self._liveClients = set(self._clientStack)
+        with self._dispatch_workers_lock:
+            if val is None:
+                self._clientStack.pop()
+            else:
+                self._clientStack.append(val)
+            self._update_dispatch_workers()
+
+    def _put(self, data, timestamp, metadata=None) -> None:
+        """Put data and timestamp into the dispatch buffer of each client.
+
+        Data is sent to the current client and to all subscribers.
+        The same data object is put in all dispatch buffers, it is not
+        copied.  If a dispatch buffer is full, the data is handled
+        according to the ``"dispatch overflow policy"`` setting (see
+        :class:`microscope.OverflowPolicy`).
+
+        If `metadata` is not given, and a client requested it, a
+        :class:`microscope.FrameMetadata` is created from `timestamp`
+        and the fields set with :meth:`_set_frame_metadata`.
+
+        """
+        targets = self._dispatch_targets
+        if not isinstance(data, Exception):
+            self._n_fetched += 1
+            if metadata is None:
+                if any(worker.send_metadata for worker in targets):
+                    metadata = self._new_frame_metadata(timestamp)
+                else:
+                    # Fields set by the driver are for this item only.
+                    self._frame_metadata = None
+        if not targets:
+            _hot_logger.debug("No client so ignoring data.")
+            self._buffer_pool.release(data)
+            return
+        for i in range(len(targets) - 1):
+            self._buffer_pool.retain(data)
+        tracer = self._tracer
+        if tracer is not None:
+            start = time.time()
+        for worker in targets:
+            self._put_to_worker(worker, data, timestamp, metadata)
+        if tracer is not None:
+            tracer.record("put", start, time.time(), timestamp)
+
+    def _put_to_worker(self, worker, data, timestamp, metadata) -> None:
+        item = (data, timestamp, metadata)
+        policy = self._overflow_policy
+        if policy is microscope.OverflowPolicy.BLOCK:
+            worker.queue.put(item)
+            return
+        with self._put_lock:
+            if policy is microscope.OverflowPolicy.LATEST_ONLY:
+                while self._drop_oldest(worker):
+                    pass
+            while True:
+                try:
+                    worker.queue.put_nowait(item)
+                except queue.Full:
+                    if policy is microscope.OverflowPolicy.DROP_OLDEST:
+                        self._drop_oldest(worker)
+                    else:
+                        self._drop(data)
+                        return
+                else:
+                    return
+
+    def _drop(self, data, count: bool = True) -> None:
+        """Drop data that will not be dispatched."""
+        if count:
+            self._n_dropped += 1
+        self._buffer_pool.release(data)
 
-    def _put(self, data, timestamp) -> None:
-        """Put data and timestamp into dispatch buffer with target dispatch client."""
-        self._dispatch_buffer.put((self._client, data, timestamp))
+    def _drop_oldest(self, worker, count: bool = True) -> bool:
+        """Drop the oldest item in a client dispatch buffer.
 
-    def set_client(self, new_client) -> None:
+        Returns `False` if the dispatch buffer was already empty.
+        """
+        try:
+            item = worker.queue.get_nowait()
+        except queue.Empty:
+            return False
+        if item is not _DispatchWorker.STOP:
+            self._drop(item[0], count=count)
+        worker.queue.task_done()
+        return True
+
+    def set_client(
+        self,
+        new_client,
+        send_metadata: bool = False,
+        transport: str = "pyro",
+        stream_address: Optional[Tuple[str, int]] = None,
+        compression: Optional[str] = None,
+    ) -> None:
         """Set up a connection to our client.
 
         Clients now sit in a stack so that a single device may send
@@ -773,11 +2013,51 @@ class DataDevice(Device, metaclass=abc.ABCMeta):
         rework here to identify the caller and remove only that caller
         from the client stack.
 
+        Args:
+            new_client: the URI of a remote client, a local client
+                object, or `None` to pop the current client.
+            send_metadata: whether to also send the
+                :class:`microscope.FrameMetadata` of each data item.
+                Clients with a ``receiveData`` method get it as a
+                third argument, clients with a ``put`` method get
+                `(data, metadata)` tuples.
+            transport: how to send data to a remote client.
+                ``"pyro"``, the default, sends the data as an argument
+                of ``receiveData``.  ``"shm"`` is for clients on the
+                same computer as the device.  It copies the data to a
+                ring buffer in shared memory and sends only its
+                location, which :class:`microscope.clients.DataClient`
+                reads transparently.  Frames not read before the ring
+                buffer wraps around are lost.  ``"stream"`` sends the
+                data over a separate socket, connected to
+                `stream_address`, pickled with protocol 5 so that
+                arrays are written to the socket without being copied
+                into the pickle first.
+            stream_address: `(host, port)` where the client listens
+                for data, for the ``"stream"`` transport.
+            compression: name of the codec to compress arrays sent to
+                a remote client, or `None` for no compression.  The
+                codecs are ``"zlib"``, which is always available,
+                ``"lz4"``, ``"zstd"``, and ``"blosc"``, which need the
+                `lz4`, `zstandard`, and `blosc` packages.  Arrays are
+                sent as `CompressedFrame` objects which
+                :class:`microscope.clients.DataClient` decompresses
+                transparently.  The ``compression_...`` metrics (see
+                :meth:`get_metrics`) report how well it works.
+
         """
         if new_client is not None:
             if isinstance(new_client, (str, Pyro4.core.URI)):
-                self._client = Pyro4.Proxy(new_client)
-            else:
+                new_client = Pyro4.Proxy(new_client)
+            options = self._check_client_options(
+                new_client,
+                send_metadata=send_metadata,
+                transport=transport,
+                stream_address=stream_address,
+                compression=compression,
+            )
+            with self._dispatch_workers_lock:
+                self._client_options[new_client] = options
                 self._client = new_client
         else:
             self._client = None
@@ -787,10 +2067,114 @@ class DataDevice(Device, metaclass=abc.ABCMeta):
         else:
             _logger.info("Current client is %s.", str(self._client))
 
+    def _check_client_options(self, client, **options) -> dict:
+        """Validate options requested by a client and return them."""
+        transport = options["transport"]
+        if transport not in ("pyro", "shm", "stream"):
+            raise ValueError("unknown transport '%s'" % transport)
+        if transport == "shm":
+            if microscope._transport.shared_memory is None:
+                raise microscope.UnsupportedFeatureError(
+                    "shared memory transport requires Python 3.8 or later"
+                )
+        elif transport == "stream":
+            if not microscope._transport.HAS_OUT_OF_BAND_PICKLE:
+                raise microscope.UnsupportedFeatureError(
+                    "stream transport requires Python 3.8 or later"
+                )
+            if options.get("stream_address") is None:
+                raise ValueError("stream transport requires stream_address")
+        if transport != "pyro" and not isinstance(client, Pyro4.Proxy):
+            raise ValueError(
+                "%s transport is only for remote clients" % transport
+            )
+        compression = options["compression"]
+        if compression is not None:
+            if not isinstance(client, Pyro4.Proxy):
+                raise ValueError("compression is only for remote clients")
+            if transport == "shm":
+                raise ValueError(
+                    "compression is not for the shared memory transport"
+                )
+            try:
+                microscope._transport.get_codec(compression)
+            except KeyError:
+                raise ValueError("unknown compression '%s'" % compression)
+            except ImportError as err:
+                raise microscope.UnsupportedFeatureError(
+                    "compression '%s' is not available: %s"
+                    % (compression, err)
+                ) from err
+        return options
+
+    def add_subscriber(
+        self,
+        client,
+        send_metadata: bool = False,
+        transport: str = "pyro",
+        stream_address: Optional[Tuple[str, int]] = None,
+        compression: Optional[str] = None,
+    ) -> None:
+        """Send all data to an additional client.
+
+        Unlike the client set with :meth:`set_client`, subscribers
+        are not in the client stack and get all data until they are
+        removed with :meth:`remove_subscriber`.  The data is sent to
+        each client from a separate thread so a slow client does not
+        delay the others.
+
+        Args:
+            client: the URI of a remote client, or a local client
+                object.
+            send_metadata: whether to also send the metadata of each
+                data item (see :meth:`set_client`).
+            transport: how to send data to a remote client (see
+                :meth:`set_client`).
+            stream_address: where the client listens for data, for
+                the ``"stream"`` transport (see :meth:`set_client`).
+            compression: codec to compress arrays sent to a remote
+                client (see :meth:`set_client`).
+        """
+        if isinstance(client, (str, Pyro4.core.URI)):
+            client = Pyro4.Proxy(client)
+        options = self._check_client_options(
+            client,
+            send_metadata=send_metadata,
+            transport=transport,
+            stream_address=stream_address,
+            compression=compression,
+        )
+        with self._dispatch_workers_lock:
+            self._client_options[client] = options
+            if client not in self._subscribers:
+                self._subscribers.append(client)
+            self._update_dispatch_workers()
+        _logger.info("Added subscriber %s.", str(client))
+
+    def remove_subscriber(self, client) -> None:
+        """Stop sending data to a client added with :meth:`add_subscriber`.
+
+        Any data not yet sent to the client is dropped.
+        """
+        if isinstance(client, (str, Pyro4.core.URI)):
+            client = Pyro4.Proxy(client)
+        with self._dispatch_workers_lock:
+            if client not in self._subscribers:
+                raise ValueError("%s is not a subscriber" % client)
+            self._subscribers.remove(client)
+            self._update_dispatch_workers()
+        _logger.info("Removed subscriber %s.", str(client))
+
+    def _set_settings(self, values: Mapping[str, Any]) -> None:
+        """Set multiple settings, restarting acquisition at most once."""
+        if any(self._settings[name].requires_restart for name in values):
+            self._set_settings_restarting(values)
+        else:
+            super()._set_settings(values)
+
     @keep_acquiring
-    def update_settings(self, settings, init: bool = False) -> None:
-        """Update settings, toggling acquisition if necessary."""
-        super().update_settings(settings, init)
+    def _set_settings_restarting(self, values: Mapping[str, Any]) -> None:
+        super()._set_settings(values)
 
     # noinspection PyPep8Naming
     def receiveClient(self, client_uri: str) -> None:
@@ -827,6 +2211,40 @@ class DataDevice(Device, metaclass=abc.ABCMeta):
             self._new_data_condition.notify()
 
 
+def _compile_transform(transform: Tuple[bool, bool, bool]):
+    """Convert a camera transform into a view of the data.
+
+    The transform `(fliplr, flipud, rot90)` is a rotation by 90
+    degrees followed by the flips.  This is the same as swapping the
+    first two axes followed by reversing either of them, so it can be
+    applied to an array as a single strided view.  Returns whether to
+    swap the axes and the index for the view, or `None` for the
+    identity transform.
+    """
+    lr, ud, rot = transform
+    if rot:
+        # rot90(data) is swapaxes(data, 0, 1)[::-1] so a flip up-down
+        # after the rotation cancels its reversal of the rows.
+        ud = not ud
+    reverse = slice(None, None, -1)
+    index = (reverse if ud else slice(None), reverse if lr else slice(None))
+    if not rot and not lr and not ud:
+        return None
+    return (bool(rot), index)
+
+
+def _update_frame_metadata(func):
+    """Wrapper to update the frame metadata defaults after a change."""
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        result = func(self, *args, **kwargs)
+        self._update_frame_metadata_defaults()
+        return result
+
+    return wrapper
+
+
 class Camera(TriggerTargetMixin, DataDevice):
     """Adds functionality to :class:`DataDevice` to support cameras.
 
@@ -835,6 +2253,15 @@ class Camera(TriggerTargetMixin, DataDevice):
 
     """
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # set_exposure_time is implemented by the concrete classes so
+        # wrap it there to keep the frame metadata up to date.
+        if "set_exposure_time" in cls.__dict__:
+            cls.set_exposure_time = _update_frame_metadata(
+                cls.__dict__["set_exposure_time"]
+            )
+
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
         # Transforms to apply to data (fliplr, flipud, rot90)
@@ -844,23 +2271,52 @@ class Camera(TriggerTargetMixin, DataDevice):
         self._client_transform = (False, False, False)
         # Result of combining client and readout transforms
         self._transform = (False, False, False)
+        # The part of the transform done in software, compiled into a
+        # view (see _compile_transform).
+        self._transform_view = None
+        # Whether to have the camera hardware do the transform.
+        self._transform_in_hardware = False
         self.add_setting("roi", "tuple", self.get_roi, self.set_roi, None)
+        if (
+            type(self)._set_hardware_transform
+            is not Camera._set_hardware_transform
+        ):
+            self.add_setting(
+                "transform in hardware",
+                "bool",
+                lambda: self._transform_in_hardware,
+                self._set_transform_in_hardware,
+                None,
+            )
+
+    def _get_frame_metadata_defaults(self) -> dict:
+        """Return the camera settings for the frame metadata.
+
+        The exposure time, ROI, and binning are read when the camera
+        is enabled, or after they are changed via
+        :meth:`set_exposure_time`, :meth:`set_roi`,
+        :meth:`set_binning`, or a setting.  Drivers whose SDK reports
+        them for each frame should set them with
+        :meth:`_set_frame_metadata`.
+        """
+        return {
+            "exposure_time": self.get_exposure_time(),
+            "roi": self.get_roi(),
+            "binning": self.get_binning(),
+            "transform": self._transform,
+        }
 
     def _process_data(self, data):
-        """Apply self._transform to data."""
-        flips = (self._transform[0], self._transform[1])
-        rot = self._transform[2]
-
-        # Choose appropriate transform based on (flips, rot).
-        # Do rotation
-        data = np.rot90(data, rot)
-        # Flip
-        data = {
-            (0, 0): lambda d: d,
-            (0, 1): np.flipud,
-            (1, 0): np.fliplr,
-            (1, 1): lambda d: np.fliplr(np.flipud(d)),
-        }[flips](data)
+        """Apply self._transform to data.
+
+        The data is not copied, the transform is a view of it.
+        """
+        view = self._transform_view
+        if view is not None:
+            swap, index = view
+            if swap:
+                data = data.swapaxes(0, 1)
+            data = data[index]
         return super()._process_data(data)
 
     def get_transform(self) -> Tuple[bool, bool, bool]:
@@ -876,7 +2332,40 @@ class Camera(TriggerTargetMixin, DataDevice):
         if self._readout_transform[2] and self._client_transform[2]:
             lr = not lr
             ud = not ud
-        self._transform = (lr, ud, rot)
+        transform = (lr, ud, rot)
+        if self._transform_in_hardware:
+            software_transform = self._set_hardware_transform(transform)
+        else:
+            software_transform = transform
+        self._transform = transform
+        self._transform_view = _compile_transform(software_transform)
+        self._update_frame_metadata_defaults()
+
+    def _set_hardware_transform(
+        self, transform: Tuple[bool, bool, bool]
+    ) -> Tuple[bool, bool, bool]:
+        """Do as much of the transform as possible in the hardware.
+
+        Drivers for cameras that can flip or rotate the image during
+        readout should override this method.  If they do, the camera
+        gets a ``"transform in hardware"`` setting to enable it.
+
+        Args:
+            transform: the whole transform, as `(fliplr, flipud,
+                rot90)`, that should be applied to the data.
+
+        Returns:
+            The transform that remains to be done in software to the
+            data read from the hardware.  The default implementation
+            does nothing in hardware and returns `transform`.
+        """
+        return transform
+
+    def _set_transform_in_hardware(self, value: bool) -> None:
+        if not value and self._transform_in_hardware:
+            self._set_hardware_transform((False, False, False))
+        self._transform_in_hardware = value
+        self._update_transform()
 
     def set_transform(self, transform: Tuple[bool, bool, bool]) -> None:
         """Set client transform and update resultant transform."""
@@ -932,6 +2421,7 @@ class Camera(TriggerTargetMixin, DataDevice):
         """Set binning along both axes.  Return `True` if successful."""
         pass
 
+    @_update_frame_metadata
     def set_binning(self, binning: microscope.Binning) -> None:
         """Set binning along both axes.  Return `True` if successful."""
         h_bin, v_bin = binning
@@ -960,6 +2450,7 @@ class Camera(TriggerTargetMixin, DataDevice):
         """Set the ROI on the hardware.  Return `True` if successful."""
         return False
 
+    @_update_frame_metadata
     def set_roi(self, roi: microscope.ROI) -> None:
         """Set the ROI according to the provided rectangle.
 
@@ -1001,6 +2492,12 @@ class SerialDeviceMixin(metaclass=abc.ABCMeta):
         #       the constructor of other parent classes.
         self.connection = None  # serial.Serial (to be constructed by child)
         self._comms_lock = threading.RLock()
+        self._command_latency = microscope._metrics.Histogram()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = super().get_metrics()
+        metrics["serial_command_seconds"] = self._command_latency.snapshot()
+        return metrics
 
     def _readline(self) -> bytes:
         """Read a line from connection without leading and trailing whitespace."""
@@ -1031,8 +2528,12 @@ class SerialDeviceMixin(metaclass=abc.ABCMeta):
         @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
             with self._comms_lock:
+                start = time.perf_counter()
                 self.connection.flushInput()
-                return func(self, *args, **kwargs)
+                try:
+                    return func(self, *args, **kwargs)
+                finally:
+                    self._command_latency.observe(time.perf_counter() - start)
 
         return wrapper
 
@@ -1231,11 +2732,18 @@ class LightSource(TriggerTargetMixin, Device, metaclass=abc.ABCMeta):
         clipped_power = max(min(power, 1.0), 0.0)
         self._do_set_power(clipped_power)
         self._set_point = clipped_power
+        if self._change_listeners:
+            self._notify_changes(power=self.power)
 
     def get_set_power(self) -> float:
         """Return the power set point."""
         return self._set_point
 
+    def _get_polled_values(self) -> Dict[str, Any]:
+        values = super()._get_polled_values()
+        values["power"] = self.power
+        return values
+
 
 class FilterWheel(Device, metaclass=abc.ABCMeta):
     """ABC for filter wheels, cube turrets, and filter sliders.
@@ -1363,6 +2871,19 @@ class StageAxis(metaclass=abc.ABCMeta):
         raise NotImplementedError()
 
 
+def _notify_position(func):
+    """Wrapper to notify change listeners of the position after a move."""
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        result = func(self, *args, **kwargs)
+        if self._change_listeners:
+            self._notify_changes(position=dict(self.position))
+        return result
+
+    return wrapper
+
+
 class Stage(Device, metaclass=abc.ABCMeta):
     """A stage device, composed of :class:`StageAxis` instances.
 
@@ -1429,6 +2950,14 @@ class Stage(Device, metaclass=abc.ABCMeta):
     :func:`enable` (see also :func:`may_move_on_enable`).
     """
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # move_by and move_to are implemented by the concrete classes
+        # so wrap them there to notify of the new position.
+        for name in ("move_by", "move_to"):
+            if name in cls.__dict__:
+                setattr(cls, name, _notify_position(cls.__dict__[name]))
+
     @property
     @abc.abstractmethod
     def axes(self) -> Mapping[str, StageAxis]:
@@ -1557,6 +3086,11 @@ class Stage(Device, metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
+    def _get_polled_values(self) -> Dict[str, Any]:
+        values = super()._get_polled_values()
+        values["position"] = dict(self.position)
+        return values
+
 
 class DigitalIO(DataDevice, metaclass=abc.ABCMeta):
     """ABC for digital IO devices.
@@ -323,6 +323,9 @@ class AndorSDK3(
         self._img_height = None
         self._img_encoding = None
         self._buffers_valid = False
+        # A (pointer, length) pair returned by WaitBuffer in
+        # _wait_for_data and not yet fetched.
+        self._ready_buffer = None
         self._exposure_callback = None
 
         self.initialize()
@@ -369,6 +372,7 @@ class AndorSDK3(
                 "Can not modify buffers while camera acquiring."
             )
         SDK3.Flush(self.handle)
+        self._ready_buffer = None
         while True:
             try:
                 self.buffers.get(block=False)
@@ -411,20 +415,34 @@ class AndorSDK3(
 
         return wrapper
 
-    def _fetch_data(self, timeout=5, debug=False):
-        """Fetch data and recycle buffers."""
+    def _wait_for_data(self, timeout: float) -> bool:
         try:
-            ptr, length = SDK3.WaitBuffer(self.handle, timeout)
-        except SDK3.TimeoutError as e:
-            if debug:
-                _logger.debug(e)
-            return None
+            self._ready_buffer = SDK3.WaitBuffer(
+                self.handle, int(timeout * 1000)
+            )
+        except SDK3.TimeoutError:
+            return False
+        return True
+
+    def _fetch_data(self, timeout=0, debug=False):
+        """Fetch data and recycle buffers."""
+        if self._ready_buffer is not None:
+            # Buffer already returned by WaitBuffer in _wait_for_data.
+            ptr, length = self._ready_buffer
+            self._ready_buffer = None
+        else:
+            try:
+                ptr, length = SDK3.WaitBuffer(self.handle, timeout)
+            except SDK3.TimeoutError as e:
+                if debug:
+                    _logger.debug(e)
+                return None
 
         raw = self.buffers.get()
         width = self._img_width
         height = self._img_height
         data = raw  # .reshape((-1, bytes_per_row))[:, 0:width].copy()
-        data = np.empty((height, width), dtype="uint16")
+        data = self._acquire_buffer((height, width), "uint16")
         SDK3.ConvertBuffer(
             ptr,
             data.ctypes.data_as(DPTR_TYPE),
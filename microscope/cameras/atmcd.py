@@ -1382,6 +1382,11 @@ class AndorAtmcd(
         # The following parameters will be populated after hardware init.
         self._roi = None
         self._binning = None
+        # Horizontal flip to correct for the readout amplifier, and
+        # (horizontal, vertical) flips of the transform done in
+        # hardware.
+        self._amplifier_flip = False
+        self._hardware_flips = (False, False)
         self.initialize()
 
     def _bind(self, fn):
@@ -1603,6 +1608,20 @@ class AndorAtmcd(
                 name, "bool", None, self._bind(SetHighCapacity), None
             )
 
+    def _wait_for_data(self, timeout: float) -> bool:
+        # Waiting by handle does not need the current camera to be
+        # set, so we don't hold the DLL lock while waiting.
+        try:
+            WaitForAcquisitionByHandleTimeOut(
+                self._handle, int(timeout * 1000)
+            )
+        except AtmcdException as e:
+            if e.status == DRV_NO_NEW_DATA:
+                return False
+            else:
+                raise e
+        return True
+
     def _fetch_data(self):
         """Poll for data and return it, with minimal processing.
 
@@ -1743,9 +1762,27 @@ class AndorAtmcd(
             # opposite edges from the chip. We set the horizontal flip
             # so that the returned image orientation is independent of
             # amplifier selection
-            SetImageFlip(not mode.amp, 0)
+            self._amplifier_flip = not mode.amp
+            self._set_image_flip()
             SetHSSpeed(mode.amp, mode.hsindex)
 
+    def _set_image_flip(self):
+        h_flip, v_flip = self._hardware_flips
+        with self:
+            SetImageFlip(int(self._amplifier_flip ^ h_flip), int(v_flip))
+
+    def _set_hardware_transform(self, transform):
+        """Do the flips in hardware, leave the rotation to software."""
+        lr, ud, rot = transform
+        # The hardware flips the image before the rotation is done in
+        # software.  Flipping left-right after a rotation by 90
+        # degrees is the same as flipping up-down before it.
+        if rot:
+            lr, ud = ud, lr
+        self._hardware_flips = (lr, ud)
+        self._set_image_flip()
+        return (False, False, rot)
+
     def _get_sensor_shape(self):
         """Return the sensor geometry."""
         with self:
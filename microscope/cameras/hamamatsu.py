@@ -306,11 +306,15 @@ class HamamatsuCamera(microscope.abc.Camera):
 
         self._wait_start = _create_struct_with_size(dcam.WAIT_START)
         self._wait_start.eventmask = dcam.WAIT_EVENT.FRAMEREADY
-        # We will wait for one second and not forever because when
-        # disable() is called, it joins the fetch thread (where this
-        # timeout is used) before aborting the waiting (which is done
-        # in _do_disable).  Maybe that should be changed.
+        # The timeout is set on each call to _wait_for_data.  We don't
+        # wait forever because when disable() is called, it joins the
+        # fetch thread (where this timeout is used) before aborting
+        # the waiting (which is done in _do_disable).  Maybe that
+        # should be changed.
         self._wait_start.timeout = 1000  # milliseconds
+        # Whether a FRAMEREADY event has happened since the last frame
+        # was copied.
+        self._frame_ready = False
 
         self._init_method_check_wait_for_frameready_support()
 
@@ -618,6 +622,7 @@ class HamamatsuCamera(microscope.abc.Camera):
 
         _logger.debug("Acquiring wait handle")
         _call(dcam.wait_open, ctypes.byref(self._wait_open))
+        self._frame_ready = False
 
         nframes = 10  # FIXME: no hardcoded 10
         _logger.debug("Allocating buffer for %d frames", nframes)
@@ -732,22 +737,30 @@ class HamamatsuCamera(microscope.abc.Camera):
     def _set_roi(self, roi: microscope.ROI) -> None:
         pass
 
-    def _fetch_data(self) -> Optional[np.ndarray]:
+    def _wait_for_data(self, timeout: float) -> bool:
         _logger.debug("Start waiting for FRAMEREADY")
+        self._wait_start.timeout = int(timeout * 1000)  # milliseconds
         status = dcam.wait_start(
             self._wait_open.hwait, ctypes.byref(self._wait_start)
         )
         if status == dcam.ERR.TIMEOUT.value:
             _logger.debug("Timeout waiting for FRAMEREADY")
-            return None
+            return False
         elif dcam.failed(status):
-            _logger.warning(
-                "dcamwait_start failed: %d", _status_to_error(status)
+            # Raise so that the fetch loop falls back to polling
+            # instead of calling us again straight away.
+            raise microscope.DeviceError(
+                "dcamwait_start failed: %s" % _status_to_error(status)
             )
-            return None
-
         # We don't bother checking for what event happened because we
         # are only waiting for FRAMEREADY anyway.
+        self._frame_ready = True
+        return True
+
+    def _fetch_data(self) -> Optional[np.ndarray]:
+        if not self._frame_ready:
+            return None
+        self._frame_ready = False
         _logger.debug(
             "Copying frame %d (w=%d,h=%d,type=%d) from capturing buffer.",
             self._frame.iFrame,
@@ -755,10 +768,23 @@ class HamamatsuCamera(microscope.abc.Camera):
             self._frame.height,
             self._frame.type,
         )
+        # Have DCAM copy the frame straight into an array from the
+        # pool instead of copying it twice via self._buffer.
+        data = self._acquire_buffer(self._buffer.shape, self._buffer.dtype)
+        self._frame.buf = data.ctypes.data_as(ctypes.c_void_p)
         status = dcam.buf_copyframe(self._hdcam, ctypes.byref(self._frame))
         if dcam.failed(status):
+            self._buffer_pool.release(data)
             raise microscope.DeviceError(status)
-        return self._buffer.copy()
+        self._set_frame_metadata(
+            hardware_timestamp=(
+                self._frame.timestamp.sec
+                + self._frame.timestamp.microsec * 1e-6
+            ),
+            frame_number=self._frame.framestamp,
+            driver_info={"camerastamp": self._frame.camerastamp},
+        )
+        return data
 
     def _do_trigger(self) -> None:
         _call(dcam.cap_firetrigger, self._hdcam, 0)
@@ -1506,7 +1506,7 @@ class PVCamera(
             def cb():
                 """Soft trigger mode end-of-frame callback."""
                 timestamp = time.time()
-                frame = self._buffer.copy()
+                frame = self._copy_to_pooled_buffer(self._buffer)
                 _logger.debug("Fetched single frame.")
                 _exp_finish_seq(self.handle, CCS_CLEAR)
                 self._put(frame, timestamp)
@@ -1542,17 +1542,31 @@ class PVCamera(
             if buffer_dtype == "uint8":
                 frame_type = uns8
 
+            # Filled with the frame number and timestamps of each
+            # frame.  Timestamps are in the camera clock units.
+            frame_info = FRAME_INFO()
+
             def cb():
                 """Circular buffer mode end-of-frame callback."""
                 timestamp = time.time()
                 frame_p = ctypes.cast(
-                    _exp_get_latest_frame(self.handle),
+                    _exp_get_latest_frame_ex(
+                        self.handle, ctypes.byref(frame_info)
+                    ),
                     ctypes.POINTER(frame_type),
                 )
-                frame = np.ctypeslib.as_array(
-                    frame_p, (self.roi[2], self.roi[3])
-                ).copy()
+                frame = self._copy_to_pooled_buffer(
+                    np.ctypeslib.as_array(frame_p, (self.roi[2], self.roi[3]))
+                )
                 _logger.debug("Fetched frame from circular buffer.")
+                self._set_frame_metadata(
+                    hardware_timestamp=frame_info.TimeStamp,
+                    frame_number=frame_info.FrameNr,
+                    driver_info={
+                        "TimeStampBOF": frame_info.TimeStampBOF,
+                        "ReadoutTime": frame_info.ReadoutTime,
+                    },
+                )
                 self._put(frame, timestamp)
                 return
 
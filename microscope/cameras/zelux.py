@@ -40,7 +40,11 @@ class ZeluxCamera(microscope.abc.Camera):
     def _fetch_data(self):
         frame = self.camera.get_pending_frame_or_null()
         if frame:
-            return np.copy(frame.image_buffer), frame.frame_count
+            self._set_frame_metadata(
+                hardware_timestamp=frame.time_stamp_relative_ns_or_null,
+                frame_number=frame.frame_count,
+            )
+            return np.copy(frame.image_buffer)
         return None
 
     def _get_binning(self):
@@ -20,87 +20,478 @@
 """TODO: complete this docstring
 """
 
-import inspect
-import itertools
+import asyncio
+import contextlib
+import functools
+import logging
 import queue
 import socket
 import threading
+from typing import AsyncIterator, Optional
 
+import numpy as np
 import Pyro4
 
+import microscope._transport
+
 # Pyro configuration. Use pickle because it can serialize numpy ndarrays.
 Pyro4.config.SERIALIZERS_ACCEPTED.add("pickle")
 Pyro4.config.SERIALIZER = "pickle"
 
 LISTENERS = {}
 
+_logger = logging.getLogger(__name__)
+
+
+# Remote metadata, i.e., the exposed methods and attributes, of each
+# device URI.  Devices do not change their interface while running so
+# this saves a round trip for each device and client created.
+_metadata_cache = {}
+_metadata_cache_lock = threading.Lock()
+
+
+def clear_metadata_cache(url=None) -> None:
+    """Forget the remote metadata of devices.
+
+    The exposed methods and attributes of a device are only queried
+    the first time a client for its URI is created.  Call this if the
+    device server was restarted with a different device on the same
+    URI.
+
+    Args:
+        url: URI of the device to forget.  If `None`, forget all.
+    """
+    with _metadata_cache_lock:
+        if url is None:
+            _metadata_cache.clear()
+        else:
+            _metadata_cache.pop(str(url), None)
+
+
+def _get_listener(url):
+    """Return interface and Pyro daemon to receive calls from `url`.
+
+    Daemons are shared between all clients on the same interface.
+    """
+    if str(url).split("@")[1].split(":")[0] in ["127.0.0.1", "localhost"]:
+        iface = "127.0.0.1"
+    else:
+        # TODO: support multiple interfaces. Could use ifaddr.get_adapters() to
+        # query ip addresses then pick first interface on the same subnet.
+        iface = socket.gethostbyname(socket.gethostname())
+    if iface not in LISTENERS:
+        LISTENERS[iface] = Pyro4.Daemon(host=iface)
+        lthread = threading.Thread(target=LISTENERS[iface].requestLoop)
+        lthread.daemon = True
+        lthread.start()
+    return iface, LISTENERS[iface]
+
+
+class _ChangeReceiver:
+    """Remote object to pass device changes to a callback."""
+
+    def __init__(self, callback) -> None:
+        self._callback = callback
+
+    @Pyro4.expose
+    @Pyro4.oneway
+    # noinspection PyPep8Naming
+    def receiveChanges(self, changes) -> None:
+        self._callback(changes)
+
 
 class Client:
-    """Base Client object that makes methods on proxy available locally."""
+    """Base Client object that makes methods on proxy available locally.
+
+    Methods and attributes of the remote device are only looked up
+    when first used, and the remote metadata is cached per URI (see
+    :func:`clear_metadata_cache`), so creating a client does not
+    connect to the device.
+    """
 
     def __init__(self, url):
         self._url = url
         self._proxy = None
+        self._change_receivers = {}
         self._connect()
 
     def _connect(self):
         """Connect to a proxy and set up self passthrough to proxy methods."""
         self._proxy = Pyro4.Proxy(self._url)
-        self._proxy._pyroGetMetadata()
-
-        # Derived classes may over-ride some methods. Leave these alone.
-        my_methods = [
-            m[0] for m in inspect.getmembers(self, predicate=inspect.ismethod)
-        ]
-        methods = set(self._proxy._pyroMethods).difference(my_methods)
-        # But in the case of propertyes, we need to inspect the class.
-        my_properties = [
-            m[0]
-            for m in inspect.getmembers(
-                self.__class__, predicate=inspect.isdatadescriptor
+        key = str(self._url)
+        with _metadata_cache_lock:
+            metadata = _metadata_cache.get(key)
+        if metadata is None:
+            self._proxy._pyroGetMetadata()
+            metadata = {
+                "methods": frozenset(self._proxy._pyroMethods),
+                "attrs": frozenset(self._proxy._pyroAttrs),
+                "oneway": frozenset(self._proxy._pyroOneway),
+            }
+            with _metadata_cache_lock:
+                _metadata_cache[key] = metadata
+        else:
+            self._proxy._pyroGetMetadata(known_metadata=metadata)
+
+    def __getattr__(self, name):
+        # Only called if the attribute is not found normally, so
+        # methods defined in derived classes are left alone.
+        proxy = self.__dict__.get("_proxy")
+        if proxy is None or name.startswith("_"):
+            raise AttributeError(name)
+        if name in proxy._pyroMethods:
+            method = getattr(proxy, name)
+            # Bind it so that the next lookup does not come here.
+            self.__dict__[name] = method
+            return method
+        elif name in proxy._pyroAttrs:
+            return getattr(proxy, name)
+        raise AttributeError(
+            "%r object has no attribute %r" % (type(self).__name__, name)
+        )
+
+    def __setattr__(self, name, value):
+        proxy = self.__dict__.get("_proxy")
+        if (
+            proxy is not None
+            and not name.startswith("_")
+            and name in proxy._pyroAttrs
+        ):
+            setattr(proxy, name, value)
+        else:
+            super().__setattr__(name, value)
+
+    def __dir__(self):
+        names = set(super().__dir__())
+        if self._proxy is not None:
+            names.update(self._proxy._pyroMethods, self._proxy._pyroAttrs)
+        return sorted(names)
+
+    def add_change_listener(self, callback) -> None:
+        """Call `callback` with the changes to the remote device.
+
+        See :meth:`microscope.abc.Device.add_change_listener` for
+        the changes.  `callback` is called from a different thread.
+        """
+        iface, daemon = _get_listener(self._url)
+        receiver = _ChangeReceiver(callback)
+        uri = daemon.register(receiver)
+        self._change_receivers[callback] = (receiver, uri)
+        self._proxy.add_change_listener(uri)
+
+    def remove_change_listener(self, callback) -> None:
+        """Stop calling `callback` with the changes to the device."""
+        receiver, uri = self._change_receivers.pop(callback)
+        try:
+            self._proxy.remove_change_listener(uri)
+        finally:
+            _get_listener(self._url)[1].unregister(receiver)
+
+    def call_many(self, calls, return_exceptions: bool = False) -> list:
+        """Call multiple remote methods in a single round trip.
+
+        See :meth:`microscope.abc.Device.call_many` for the format of
+        `calls`.  If the remote object does not implement
+        `call_many`, Pyro's own batch calls are used instead, in
+        which case only methods, and not attributes, can be used.
+        """
+        if "call_many" in self._proxy._pyroMethods:
+            return self._proxy.call_many(list(calls), return_exceptions)
+
+        calls = [_parse_call(call) for call in calls]
+        batch = Pyro4.batch(self._proxy)
+        for name, args, kwargs in calls:
+            getattr(batch, name)(*args, **kwargs)
+        results = []
+        try:
+            for result in batch():
+                results.append(result)
+        except Exception as err:
+            if not return_exceptions:
+                raise
+            # Pyro stops the batch on the first error so make the
+            # remaining calls again.
+            results.append(err)
+            results.extend(
+                self.call_many(calls[len(results) :], return_exceptions)
             )
-        ]
-        properties = set(self._proxy._pyroAttrs).difference(my_properties)
+        return results
+
+    @contextlib.contextmanager
+    def batch(self, return_exceptions: bool = False):
+        """Context manager to record calls and make them in one go.
+
+        Calls on the returned object are recorded and made with
+        :meth:`call_many` at the end of the ``with`` block.  Their
+        results are then on its `results` attribute.  Attributes are
+        recorded as calls without arguments.
+
+        .. code-block:: python
+
+            with stage.batch() as batch:
+                batch.get_is_enabled()
+                batch.position()
+            enabled, position = batch.results
+
+        """
+        batch = _CallBatch()
+        yield batch
+        batch.results = self.call_many(batch.calls, return_exceptions)
+
+
+def _parse_call(call):
+    """Split a call for `call_many` into name, args, and kwargs."""
+    if isinstance(call, str):
+        return call, (), {}
+    name, *rest = call
+    args = rest[0] if len(rest) > 0 else ()
+    kwargs = rest[1] if len(rest) > 1 else {}
+    return name, args, kwargs
+
+
+class _CallBatch:
+    """Calls recorded by :meth:`Client.batch`."""
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.results = None
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
 
-        for attr in itertools.chain(methods, properties):
-            setattr(self, attr, getattr(self._proxy, attr))
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+
+        return record
 
 
 class DataClient(Client):
-    """A client that can receive and buffer data."""
+    """A client that can receive and buffer data.
 
-    def __init__(self, url):
+    Args:
+        url: URI of the remote data device.
+        metadata: whether to ask the device for the metadata of each
+            data item.  If so, the buffered items are `(data,
+            timestamp, metadata)` instead of `(data, timestamp)`.
+        transport: how the device sends data to the client (see
+            :meth:`microscope.abc.DataDevice.set_client`).  Use
+            ``"shm"`` if the device is on the same computer, and
+            ``"stream"`` to avoid copying the data in and out of
+            Pyro messages.
+        compression: name of the codec the device should use to
+            compress arrays (see
+            :meth:`microscope.abc.DataDevice.set_client`), or `None`.
+            Arrays are decompressed transparently.
+    """
+
+    def __init__(
+        self,
+        url,
+        metadata: bool = False,
+        transport: str = "pyro",
+        compression: Optional[str] = None,
+    ):
         super().__init__(url)
         self._buffer = queue.Queue()
+        self._metadata = metadata
+        self._transport = transport
+        self._compression = compression
+        if transport == "shm":
+            self._shm_reader = microscope._transport.SharedMemoryReader()
         # Register self with a listener.
-        if self._url.split("@")[1].split(":")[0] in ["127.0.0.1", "localhost"]:
-            iface = "127.0.0.1"
-        else:
-            # TODO: support multiple interfaces. Could use ifaddr.get_adapters() to
-            # query ip addresses then pick first interface on the same subnet.
-            iface = socket.gethostbyname(socket.gethostname())
-        if iface not in LISTENERS:
-            LISTENERS[iface] = Pyro4.Daemon(host=iface)
-            lthread = threading.Thread(target=LISTENERS[iface].requestLoop)
-            lthread.daemon = True
-            lthread.start()
-        self._client_uri = LISTENERS[iface].register(self)
+        iface, daemon = _get_listener(self._url)
+        self._client_uri = daemon.register(self)
+        if transport == "stream":
+            self._stream_receiver = microscope._transport.StreamReceiver(
+                iface, self.receiveData
+            )
 
     def enable(self):
         """Set the client on the remote and enable it."""
-        self.set_client(self._client_uri)
+        # Only pass options that are not the default so that this
+        # still works with devices that don't support them.
+        options = {}
+        if self._metadata:
+            options["send_metadata"] = True
+        if self._transport != "pyro":
+            options["transport"] = self._transport
+        if self._transport == "stream":
+            options["stream_address"] = self._stream_receiver.address
+        if self._compression is not None:
+            options["compression"] = self._compression
+        self.set_client(self._client_uri, **options)
         self._proxy.enable()
 
     @Pyro4.expose
     @Pyro4.oneway
     # noinspection PyPep8Naming
     # Legacy naming convention.
-    def receiveData(self, data, timestamp, *args):
+    def receiveData(self, data, timestamp, metadata=None, *args):
         del args
-        self._buffer.put((data, timestamp))
+        if isinstance(data, microscope._transport.SharedMemoryFrame):
+            data = self._shm_reader.read(data)
+            if data is None:
+                _logger.warning("frame overwritten before it was read")
+                return
+        elif isinstance(data, microscope._transport.CompressedFrame):
+            data = data.decompress()
+        if isinstance(timestamp, np.ndarray):
+            # A batch of data stacked along the first dimension.
+            if metadata is None:
+                items = zip(data, timestamp)
+            else:
+                items = zip(data, timestamp, metadata)
+            for item in items:
+                self._put(item)
+        elif metadata is None:
+            self._put((data, timestamp))
+        else:
+            self._put((data, timestamp, metadata))
+
+    def _put(self, item) -> None:
+        """Buffer a received data item."""
+        self._buffer.put(item)
 
     def trigger_and_wait(self):
         if not hasattr(self, "trigger"):
             raise Exception("Device has no trigger method.")
         self.trigger()
         return self._buffer.get(block=True)
+
+
+class AsyncClient:
+    """A client to use a device from an asyncio event loop.
+
+    Remote methods are available as coroutine functions, which run
+    the Pyro call in the event loop default executor.  This allows a
+    single event loop to control multiple devices concurrently, for
+    example:
+
+    .. code-block:: python
+
+        stage = AsyncClient(stage_uri)
+        filterwheel = AsyncClient(filterwheel_uri)
+        await asyncio.gather(
+            stage.move_to({"x": 100.0}),
+            filterwheel.set_position(2),
+        )
+
+    Remote attributes, such as properties, are read with
+    :meth:`get_attribute`.
+
+    """
+
+    _client_class = Client
+
+    def __init__(self, url, **kwargs):
+        self._client = self._client_class(url, **kwargs)
+
+    async def call(self, name: str, *args, **kwargs):
+        """Call a remote method by name."""
+        loop = asyncio.get_running_loop()
+        method = getattr(self._client._proxy, name)
+        return await loop.run_in_executor(
+            None, functools.partial(method, *args, **kwargs)
+        )
+
+    async def call_many(self, calls, return_exceptions: bool = False):
+        """Call multiple remote methods in a single round trip."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self._client.call_many, calls, return_exceptions
+        )
+
+    async def get_attribute(self, name: str):
+        """Read a remote attribute."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, getattr, self._client._proxy, name
+        )
+
+    def __getattr__(self, name):
+        # Only called for attributes not found the usual way.
+        if (
+            name.startswith("_")
+            or name not in self._client._proxy._pyroMethods
+        ):
+            raise AttributeError(
+                "%r object has no attribute %r" % (type(self).__name__, name)
+            )
+        return functools.partial(self.call, name)
+
+
+class _AsyncDataClientReceiver(DataClient):
+    """DataClient that passes data to an asyncio queue."""
+
+    def __init__(self, url, **kwargs):
+        super().__init__(url, **kwargs)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_buffer: Optional[asyncio.Queue] = None
+
+    def _put(self, item) -> None:
+        # Called from the Pyro listener threads.
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(
+                self._async_buffer.put_nowait, item
+            )
+
+
+class AsyncDataClient(AsyncClient):
+    """An asyncio client that can receive data.
+
+    The arguments are the same as for :class:`DataClient`.
+
+    .. code-block:: python
+
+        camera = AsyncDataClient(camera_uri)
+        await camera.enable()
+        data, timestamp = await camera.grab()
+        async for data, timestamp in camera.stream():
+            ...
+
+    """
+
+    _client_class = _AsyncDataClientReceiver
+
+    async def enable(self) -> None:
+        """Set the client on the remote and enable it.
+
+        Data is received in the event loop that calls this method.
+        """
+        if self._client._loop is None:
+            self._client._loop = asyncio.get_running_loop()
+            self._client._async_buffer = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._client.enable)
+
+    async def trigger(self) -> None:
+        """Trigger the device."""
+        await self.call("trigger")
+
+    async def grab(self, soft_trigger: bool = True):
+        """Return the next data item.
+
+        Args:
+            soft_trigger: whether to trigger the device first.
+        """
+        if soft_trigger:
+            await self.trigger()
+        return await self._get()
+
+    async def stream(self, count: Optional[int] = None) -> AsyncIterator:
+        """Iterate over data items as they arrive.
+
+        Args:
+            count: number of data items after which the iteration
+                stops, or `None` to never stop.
+        """
+        n = 0
+        while count is None or n < count:
+            yield await self._get()
+            n += 1
+
+    async def _get(self):
+        if self._client._async_buffer is None:
+            raise RuntimeError("enable must be awaited before getting data")
+        return await self._client._async_buffer.get()
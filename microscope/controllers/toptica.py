@@ -18,6 +18,7 @@
 ## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
 
 import logging
+import math
 from typing import Dict, List
 
 import serial
@@ -173,9 +174,24 @@ class _iChromeLaser(microscope.abc.LightSource):
 
         # FIXME: set values to '0' because we need to pass an int as
         # values for settings of type str.  Probably a bug on
-        # Device.set_setting.
-        self.add_setting("label", "str", self._conn.get_label, None, values=0)
-        self.add_setting("type", "str", self._conn.get_type, None, values=0)
+        # Device.set_setting.  The label and type of a laser do not
+        # change so there's no need to ask the controller every time.
+        self.add_setting(
+            "label",
+            "str",
+            self._conn.get_label,
+            None,
+            values=0,
+            cache_ttl=math.inf,
+        )
+        self.add_setting(
+            "type",
+            "str",
+            self._conn.get_type,
+            None,
+            values=0,
+            cache_ttl=math.inf,
+        )
 
         self.add_setting(
             "delay", "int", self._conn.get_delay, None, values=tuple()
@@ -35,23 +35,42 @@ where ``CONFIG-FILEPATH`` is the path for a python file that defines a
 """
 
 import argparse
+import collections
 import copy
+import functools
+import http.server
 import importlib.machinery
 import importlib.util
+import itertools
 import logging
 import multiprocessing
+import multiprocessing.connection
 import os.path
+import queue
 import signal
 import sys
+import threading
 import time
 from collections.abc import Iterable
 from dataclasses import dataclass
 from logging import FileHandler, StreamHandler
 from threading import Thread
-from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import Pyro4
+import Pyro4.util
 
+import microscope._metrics
 import microscope.abc
 from microscope.abc import FloatingDeviceMixin
 
@@ -83,6 +102,8 @@ def device(
     port: int,
     conf: Optional[Mapping[str, Any]] = None,
     uid: Optional[str] = None,
+    group: Optional[str] = None,
+    retry_policy: Optional["RetryPolicy"] = None,
 ):
     """Define devices and where to serve them.
 
@@ -100,6 +121,15 @@ def device(
         uid: used to identify "floating" devices (see documentation
             for :class:`FloatingDeviceMixin`).  This must be specified
             if ``cls`` is a floating device.
+        group: name of a group of devices to serve together.  By
+            default, each device definition is served on its own
+            process.  All devices in the same group are served on the
+            same process and Pyro daemon so they must all have the
+            same ``host`` and ``port``.  Devices that may crash, or
+            hang, should not be grouped with others since the whole
+            group is restarted.
+        retry_policy: how to retry constructing the devices if it
+            fails.  Defaults to :class:`RetryPolicy` defaults.
 
     Example
 
@@ -115,7 +145,10 @@ def device(
             device(construct_devices, '127.0.0.1', 8000),
             # passing a Device class
             device(Camera, '127.0.0.1', 8001,
-                   conf={'kwarg1': some, 'kwarg2': arguments})
+                   conf={'kwarg1': some, 'kwarg2': arguments}),
+            # two devices on the same process and port
+            device(FilterWheel, '127.0.0.1', 8002, group='misc'),
+            device(LightSource, '127.0.0.1', 8002, group='misc'),
         ]
 
     """
@@ -129,7 +162,42 @@ def device(
             raise TypeError("uid must be specified for floating devices")
         elif not issubclass(cls, FloatingDeviceMixin) and uid is not None:
             raise TypeError("uid must not be given for non floating devices")
-    return dict(cls=cls, host=host, port=int(port), uid=uid, conf=conf)
+    return dict(
+        cls=cls,
+        host=host,
+        port=int(port),
+        uid=uid,
+        conf=conf,
+        group=group,
+        retry_policy=retry_policy,
+    )
+
+
+def _group_devices(devices) -> list:
+    """Group device definitions by the process that will serve them.
+
+    Returns:
+        A list of device definitions, for devices served on their own
+        process, and of lists of device definitions, one for each
+        group.
+    """
+    groups: Dict[str, list] = {}
+    processes = []
+    for dev in devices:
+        group = dev.get("group")
+        if group is None:
+            processes.append(dev)
+        elif group in groups:
+            groups[group].append(dev)
+        else:
+            groups[group] = [dev]
+            processes.append(groups[group])
+    for group, devs in groups.items():
+        if len(set((dev["host"], dev["port"]) for dev in devs)) != 1:
+            raise ValueError(
+                "devices in group '%s' have different host or port" % group
+            )
+    return processes
 
 
 def _create_log_formatter(name: str):
@@ -200,6 +268,199 @@ class DeviceServerOptions:
     config_fpath: str
     logging_level: int
     logging_dir: str
+    health_check_interval: float = 0.0
+    health_check_timeout: float = 5.0
+    metrics_host: str = "127.0.0.1"
+    metrics_port: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How to retry constructing devices that fail.
+
+    Devices often fail to construct while the hardware is still
+    starting, e.g., after a power cycle.  The delay between attempts
+    starts at `initial_delay` seconds and is multiplied by `factor`
+    after each failure, up to `max_delay`.  If `max_attempts` is not
+    `None`, the device server process fails after that many attempts
+    (and is then restarted).
+
+    """
+
+    initial_delay: float = 0.5
+    max_delay: float = 30.0
+    factor: float = 2.0
+    max_attempts: Optional[int] = None
+
+    def delay(self, retry: int) -> float:
+        """Delay to wait before a retry, counting from zero."""
+        return min(self.initial_delay * self.factor**retry, self.max_delay)
+
+    def delays(self) -> Iterator[float]:
+        """Delays to wait before each retry."""
+        if self.max_attempts is None:
+            retries = itertools.count()
+        else:
+            retries = range(self.max_attempts - 1)
+        for retry in retries:
+            yield self.delay(retry)
+
+
+# Pyro object ID of the `_DeviceServerStatus` on each device server.
+STATUS_OBJECT_ID = "DeviceServer"
+
+
+class _DeviceServerStatus:
+    """Served with the devices to report whether they are ready.
+
+    Each `DeviceServer` serves this on the same Pyro daemon as its
+    devices with the `STATUS_OBJECT_ID`, as soon as the host and port
+    are known and before the devices are constructed.
+
+    """
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self._lock = threading.Lock()
+        # Name of device definitions (class or function) still being
+        # constructed, and the last error, if any.
+        self._pending: Dict[str, Optional[str]] = {n: None for n in names}
+        # Multiple definitions may have the same name.
+        self._n_pending = collections.Counter(names)
+        self._devices: Dict[str, str] = {}
+        # Functions returning the metrics of each served object.
+        self._metrics: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def is_ready(self) -> bool:
+        """Whether all devices are constructed and served."""
+        with self._lock:
+            return not self._pending
+
+    def get_devices(self) -> Dict[str, str]:
+        """Map of the name of the devices already served to their URI."""
+        with self._lock:
+            return dict(self._devices)
+
+    def get_pending(self) -> Dict[str, Optional[str]]:
+        """Map of devices still being constructed to their last error."""
+        with self._lock:
+            return dict(self._pending)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Map of the name of the served objects to their metrics.
+
+        The metrics of the device server itself, such as the latency
+        of Pyro requests, are under `STATUS_OBJECT_ID`.
+        """
+        with self._lock:
+            sources = list(self._metrics.items())
+        metrics = {}
+        for name, get_metrics in sources:
+            try:
+                metrics[name] = get_metrics()
+            except Exception as e:
+                _logger.error("failed to get metrics of %s: %s", name, e)
+        return metrics
+
+    def _add_metrics(
+        self, name: str, get_metrics: Callable[[], Dict[str, Any]]
+    ) -> None:
+        with self._lock:
+            self._metrics[name] = get_metrics
+
+    def _set_failure(self, name: str, error: Exception) -> None:
+        with self._lock:
+            self._pending[name] = repr(error)
+
+    def _set_ready(self, obj_id: str, uri: str) -> None:
+        with self._lock:
+            self._devices[obj_id] = uri
+
+    def _set_done(self, name: str) -> None:
+        with self._lock:
+            self._n_pending[name] -= 1
+            if self._n_pending[name] == 0:
+                del self._pending[name]
+
+
+# The objects and methods called by the request being handled on
+# each thread, while handled by a _MetricsDaemon.
+_current_calls = threading.local()
+
+
+def _record_call(func):
+    """Wrapper for Pyro functions that look up a method or attribute."""
+
+    @functools.wraps(func)
+    def wrapper(obj, name, *args, **kwargs):
+        calls = getattr(_current_calls, "calls", None)
+        if calls is not None:
+            calls.append((getattr(obj, "_pyroId", ""), name))
+        return func(obj, name, *args, **kwargs)
+
+    wrapper._records_calls = True
+    return wrapper
+
+
+class _MetricsDaemon(Pyro4.Daemon):
+    """Pyro daemon that measures the latency of requests.
+
+    Pyro has no hook to run code around each method call so this is
+    the time to handle a whole request, from reading the call to
+    sending the reply.  The object and method called are found by
+    wrapping the functions that Pyro uses to look them up.  Batched
+    calls are reported with the ``"batch"`` method.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._request_latency = microscope._metrics.Histogram()
+        # Map of (object ID, method name) to the latency of its calls.
+        self._call_latency: Dict[
+            Tuple[str, str], microscope._metrics.Histogram
+        ] = {}
+        self._call_latency_lock = threading.Lock()
+        for name in (
+            "getAttribute",
+            "get_exposed_property_value",
+            "set_exposed_property_value",
+        ):
+            func = getattr(Pyro4.util, name)
+            if not getattr(func, "_records_calls", False):
+                setattr(Pyro4.util, name, _record_call(func))
+
+    def handleRequest(self, conn):
+        calls: List[Tuple[str, str]] = []
+        _current_calls.calls = calls
+        start = time.perf_counter()
+        try:
+            return super().handleRequest(conn)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_calls.calls = None
+            self._request_latency.observe(elapsed)
+            # Pings and failed look ups call no method.
+            if calls:
+                if len(calls) == 1:
+                    key = calls[0]
+                else:
+                    key = (calls[0][0], "batch")
+                with self._call_latency_lock:
+                    histogram = self._call_latency.get(key)
+                    if histogram is None:
+                        histogram = microscope._metrics.Histogram()
+                        self._call_latency[key] = histogram
+                histogram.observe(elapsed)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._call_latency_lock:
+            call_latency = list(self._call_latency.items())
+        return {
+            "pyro_request_seconds": self._request_latency.snapshot(),
+            "pyro_call_seconds": [
+                ({"device": obj_id, "method": method}, histogram.snapshot())
+                for (obj_id, method), histogram in call_latency
+            ],
+        }
 
 
 def _check_autoproxy_feature() -> None:
@@ -245,13 +506,16 @@ class DeviceServer(multiprocessing.Process):
     """Initialise a device and serve at host/port according to its id.
 
     Args:
-        device_def: definition of the device.
+        device_def: definition of the device, or list of definitions
+            of devices to serve together on the same Pyro daemon.
         options: configuration for the device server.
         id_to_host: host or mapping of device identifiers to hostname.
         id_to_port: map or mapping of device identifiers to port
             number.
         exit_event: a shared event to signal that the process should
             quit.
+        address_queue: a queue where to put the process ID, host,
+            and port, once the Pyro daemon is started.
 
     """
 
@@ -262,9 +526,14 @@ class DeviceServer(multiprocessing.Process):
         id_to_host: Mapping[str, str],
         id_to_port: Mapping[str, int],
         exit_event: Optional[multiprocessing.Event] = None,
+        address_queue: Optional[multiprocessing.Queue] = None,
     ):
         # The device to serve.
         self._device_def = device_def
+        if isinstance(device_def, dict):
+            self._device_defs = [device_def]
+        else:
+            self._device_defs = list(device_def)
         self._options = options
         self._devices: Dict[str, microscope.abc.Device] = {}
         # Where to serve it.
@@ -272,6 +541,7 @@ class DeviceServer(multiprocessing.Process):
         self._id_to_port = id_to_port
         # A shared event to allow clean shutdown.
         self.exit_event = exit_event
+        self._address_queue = address_queue
         super().__init__()
         self.daemon = True
 
@@ -287,11 +557,115 @@ class DeviceServer(multiprocessing.Process):
             self._id_to_host,
             self._id_to_port,
             exit_event=self.exit_event,
+            address_queue=self._address_queue,
+        )
+
+    @property
+    def name_for_logs(self) -> str:
+        """Name to sign log messages and name log files."""
+        if len(self._device_defs) == 1:
+            return self._device_defs[0]["cls"].__name__
+        else:
+            return self._device_defs[0]["group"]
+
+    def _create_devices(self, device_def) -> Dict[str, microscope.abc.Device]:
+        """Construct the devices in a device definition.
+
+        Failures are retried according to the definition retry
+        policy.  Returns an empty dict if the server is asked to exit
+        first.
+        """
+        cls = device_def["cls"]
+        retry_policy = device_def.get("retry_policy") or RetryPolicy()
+        delays = retry_policy.delays()
+        while not self.exit_event.is_set():
+            try:
+                # The cls argument can either be a Device subclass, or
+                # it can be a function that returns a map of names to
+                # devices.
+                if isinstance(cls, type):
+                    return {cls.__name__: cls(**device_def["conf"])}
+                else:
+                    return cls(**device_def["conf"])
+            except Exception as e:
+                delay = next(delays, None)
+                if delay is None:
+                    raise
+                _logger.info(
+                    "Failed to start device. Retrying in %gs.",
+                    delay,
+                    exc_info=e,
+                )
+                self._status._set_failure(cls.__name__, e)
+                # Sleep in short steps to check for exit (see comment
+                # on the exit_event loop in run()).
+                wake_time = time.monotonic() + delay
+                while (
+                    time.monotonic() < wake_time
+                    and not self.exit_event.is_set()
+                ):
+                    time.sleep(min(0.1, delay))
+        return {}
+
+    def _get_address(self, device_def, devices):
+        """Return host and port to serve the devices of a definition."""
+        cls = device_def["cls"]
+        if isinstance(cls, type) and issubclass(cls, FloatingDeviceMixin):
+            uid = str(list(devices.values())[0].get_id())
+            if uid not in self._id_to_host or uid not in self._id_to_port:
+                raise Exception(
+                    "Host or port not found for device %s" % (uid,)
+                )
+            return self._id_to_host[uid], self._id_to_port[uid]
+        else:
+            return device_def["host"], device_def["port"]
+
+    def _start_daemon(self, host, port):
+        """Start serving, for now only the server status."""
+        name = self.name_for_logs
+        self._pyro_daemon = _MetricsDaemon(port=port, host=host)
+        self._pyro_daemon.register(self._status, STATUS_OBJECT_ID)
+        self._status._add_metrics(
+            STATUS_OBJECT_ID, self._pyro_daemon.get_metrics
         )
 
+        log_handler = FileHandler(
+            os.path.join(
+                self._options.logging_dir,
+                "%s_%s_%s.log" % (name, host, port),
+            )
+        )
+        log_handler.setFormatter(_create_log_formatter(name))
+        logging.getLogger().addHandler(log_handler)
+
+        # Run the Pyro daemon in a separate thread so that we can do
+        # clean shutdown under Windows.
+        self._pyro_thread = Thread(target=self._pyro_daemon.requestLoop)
+        self._pyro_thread.daemon = True
+        self._pyro_thread.start()
+        if self._address_queue is not None:
+            self._address_queue.put((os.getpid(), host, port))
+
+    def _serve(self, devices) -> None:
+        for obj_id, device in devices.items():
+            if obj_id in self._devices:
+                raise Exception("More than one device named '%s'" % (obj_id,))
+            self._devices[obj_id] = device
+            _register_device(self._pyro_daemon, device, obj_id=obj_id)
+            uri = self._pyro_daemon.uriFor(device)
+            self._status._set_ready(obj_id, str(uri))
+            if isinstance(device, microscope.abc.Device):
+                self._status._add_metrics(obj_id, device.get_metrics)
+            _logger.info("Serving %s", uri)
+            if isinstance(device, FloatingDeviceMixin):
+                _logger.info(
+                    "Device UID on port %s is %s",
+                    uri.port,
+                    device.get_id(),
+                )
+
     def run(self):
-        cls = self._device_def["cls"]
-        cls_name = cls.__name__
+        name = self.name_for_logs
 
         # If the multiprocessing start method is fork, the child
         # process gets a copy of the root logger.  The copy is
@@ -313,71 +687,70 @@ class DeviceServer(multiprocessing.Process):
         # log to stderr until then.
 
         stderr_handler = StreamHandler(sys.stderr)
-        stderr_handler.setFormatter(_create_log_formatter(cls_name))
+        stderr_handler.setFormatter(_create_log_formatter(name))
         root_logger.addHandler(stderr_handler)
         root_logger.debug("Debugging messages on.")
 
         root_logger.addFilter(Filter())
 
-        # The cls argument can either be a Device subclass, or it can
-        # be a function that returns a map of names to devices.
-        cls_is_type = isinstance(cls, type)
-
-        if not cls_is_type:
-            self._devices = cls(**self._device_def["conf"])
-        else:
-            while not self.exit_event.is_set():
-                try:
-                    device = cls(**self._device_def["conf"])
-                except Exception as e:
-                    _logger.info(
-                        "Failed to start device. Retrying in 5s.", exc_info=e
-                    )
-                    time.sleep(5)
-                else:
-                    break
-            # FIXME: if the above never succeds, then local variable
-            # 'device' will now be referenced before assignment.
-            self._devices = {cls_name: device}
-
-        if cls_is_type and issubclass(cls, FloatingDeviceMixin):
-            uid = str(list(self._devices.values())[0].get_id())
-            if uid not in self._id_to_host or uid not in self._id_to_port:
-                raise Exception(
-                    "Host or port not found for device %s" % (uid,)
-                )
-            host = self._id_to_host[uid]
-            port = self._id_to_port[uid]
-        else:
-            host = self._device_def["host"]
-            port = self._device_def["port"]
-
-        pyro_daemon = Pyro4.Daemon(port=port, host=host)
-
-        log_handler = FileHandler(
-            os.path.join(
-                self._options.logging_dir,
-                "%s_%s_%s.log" % (cls_name, host, port),
-            )
+        self._status = _DeviceServerStatus(
+            [d["cls"].__name__ for d in self._device_defs]
         )
-        log_handler.setFormatter(_create_log_formatter(cls_name))
-        root_logger.addHandler(log_handler)
-
-        _logger.info("Device initialized; starting daemon.")
-        for obj_id, device in self._devices.items():
-            _register_device(pyro_daemon, device, obj_id=obj_id)
-
-        # Run the Pyro daemon in a separate thread so that we can do
-        # clean shutdown under Windows.
-        pyro_thread = Thread(target=pyro_daemon.requestLoop)
-        pyro_thread.daemon = True
-        pyro_thread.start()
-        for device in self._devices.values():
-            _logger.info("Serving %s", pyro_daemon.uriFor(device))
-            if isinstance(device, FloatingDeviceMixin):
-                _logger.info(
-                    "Device UID on port %s is %s", port, device.get_id()
+        self._pyro_daemon = None
+        self._pyro_thread = None
+
+        # Non floating devices are served as soon as they are ready,
+        # while the others are being constructed.  Floating devices
+        # are only known where to be served once constructed.
+        address = None
+        for device_def in self._device_defs:
+            cls = device_def["cls"]
+            if not (
+                isinstance(cls, type) and issubclass(cls, FloatingDeviceMixin)
+            ):
+                address = (device_def["host"], device_def["port"])
+                self._start_daemon(*address)
+                break
+
+        # Devices of different classes are constructed concurrently.
+        # Devices of the same class may share an SDK which may not be
+        # thread safe so those are constructed one at a time.
+        by_class: Dict[Any, list] = {}
+        for device_def in self._device_defs:
+            by_class.setdefault(device_def["cls"], []).append(device_def)
+        results: "queue.Queue" = queue.Queue()
+
+        def create_class_devices(device_defs):
+            try:
+                for device_def in device_defs:
+                    devices = self._create_devices(device_def)
+                    results.put((device_def, devices))
+            except Exception as e:
+                results.put(e)
+
+        for device_defs in by_class.values():
+            Thread(
+                target=create_class_devices, args=(device_defs,), daemon=True
+            ).start()
+
+        for i in range(len(self._device_defs)):
+            result = results.get()
+            if isinstance(result, Exception):
+                raise result
+            device_def, devices = result
+            if not devices:
+                continue  # asked to exit while constructing
+            device_address = self._get_address(device_def, devices)
+            if address is None:
+                address = device_address
+                self._start_daemon(*address)
+            elif device_address != address:
+                raise Exception(
+                    "Devices to serve together have different host or port"
                 )
+            self._serve(devices)
+            self._status._set_done(device_def["cls"].__name__)
+            _logger.info("Device initialized.")
 
         # Wait for termination event. We should just be able to call
         # wait() on the exit_event, but this causes issues with locks
@@ -388,8 +761,9 @@ class DeviceServer(multiprocessing.Process):
                 time.sleep(5)
             except (KeyboardInterrupt, IOError):
                 pass
-        pyro_daemon.shutdown()
-        pyro_thread.join()
+        if self._pyro_daemon is not None:
+            self._pyro_daemon.shutdown()
+            self._pyro_thread.join()
         for device in self._devices.values():
             try:
                 device.shutdown()
@@ -399,6 +773,346 @@ class DeviceServer(multiprocessing.Process):
                 _logger.error("Failure to shutdown device %s", device, ex)
 
 
+class _ServerRecord:
+    """State of a `DeviceServer` kept by the `_Supervisor`."""
+
+    def __init__(self, server: DeviceServer) -> None:
+        self.server = server
+        device_def = server._device_defs[0]
+        self.name = "%s@%s:%d" % (
+            server.name_for_logs,
+            device_def["host"],
+            device_def["port"],
+        )
+        self.started_at = 0.0
+        self.restarts = 0
+        # Number of consecutive times the server did not run for long.
+        self.failures = 0
+        # Where the server is serving, once it tells us.
+        self.address: Optional[Tuple[str, int]] = None
+        self.healthy: Optional[bool] = None
+        self.next_check = 0.0
+        # Whether a health check is running in another thread.
+        self.checking = False
+        # Time to start the server again, if waiting to restart.
+        self.restart_at: Optional[float] = None
+
+
+class _Supervisor:
+    """Keep `DeviceServer` processes alive and responsive.
+
+    Processes that die are restarted.  Processes that do not respond
+    to health checks, pings of the served devices via Pyro, are
+    killed and restarted.  Processes that fail again soon after being
+    restarted are restarted with exponential backoff.
+
+    Args:
+        servers: `DeviceServer` instances to start.
+        exit_event: event which stops the supervisor once set.
+        address_queue: queue given to the servers for them to report
+            where they serve the devices.
+        health_check_interval: time, in seconds, between health
+            checks of each server.  If zero, the default, there are
+            no health checks, only whether the processes are alive.
+        health_check_timeout: time, in seconds, to wait for devices
+            to respond to a health check.
+        restart_policy: delays between consecutive restarts of a
+            server that does not stay up for `stable_time` seconds.
+            The first restart is always immediate.
+        stable_time: time, in seconds, after which a server is
+            considered to be running fine.
+
+    """
+
+    def __init__(
+        self,
+        servers: Sequence[DeviceServer],
+        exit_event,
+        address_queue: multiprocessing.Queue,
+        health_check_interval: float = 0.0,
+        health_check_timeout: float = 5.0,
+        restart_policy: RetryPolicy = RetryPolicy(
+            initial_delay=1.0, max_delay=60.0
+        ),
+        stable_time: float = 60.0,
+    ) -> None:
+        self._records = [_ServerRecord(server) for server in servers]
+        self._records_lock = threading.Lock()
+        self._exit_event = exit_event
+        self._address_queue = address_queue
+        self._health_check_interval = health_check_interval
+        self._health_check_timeout = health_check_timeout
+        self._restart_policy = restart_policy
+        self._stable_time = stable_time
+
+    @property
+    def servers(self) -> List[DeviceServer]:
+        with self._records_lock:
+            return [record.server for record in self._records]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Map of server name to its PID, uptime, restarts, and health."""
+        now = time.monotonic()
+        stats = {}
+        with self._records_lock:
+            for record in self._records:
+                running = record.restart_at is None
+                stats[record.name] = {
+                    "pid": record.server.pid if running else None,
+                    "uptime": now - record.started_at if running else 0.0,
+                    "restarts": record.restarts,
+                    "healthy": record.healthy,
+                }
+        return stats
+
+    def get_metrics(self) -> List[Tuple[str, Dict[str, str], Any]]:
+        """Metrics of the supervised servers and of their devices.
+
+        Returns a list of samples, tuples of metric name, labels, and
+        value, for :func:`microscope._metrics.format_metrics`.
+        """
+        stats = self.get_stats()
+        with self._records_lock:
+            addresses = {
+                record.name: record.address
+                for record in self._records
+                if record.restart_at is None
+            }
+        samples = []
+        for name, server_stats in stats.items():
+            labels = {"server": name}
+            healthy = bool(server_stats["healthy"])
+            samples.append(("server_healthy", labels, healthy))
+            restarts = server_stats["restarts"]
+            samples.append(("server_restarts_total", labels, restarts))
+            uptime = server_stats["uptime"]
+            samples.append(("server_uptime_seconds", labels, uptime))
+            if addresses.get(name) is None:
+                continue
+            try:
+                with self._status_proxy(addresses[name]) as status:
+                    all_metrics = status.get_metrics()
+            except Exception as e:
+                _logger.error("failed to get metrics of %s: %s", name, e)
+                continue
+            for obj_id, metrics in all_metrics.items():
+                if obj_id == STATUS_OBJECT_ID:
+                    obj_labels = labels
+                else:
+                    obj_labels = dict(labels, device=obj_id)
+                for metric, value in metrics.items():
+                    if isinstance(value, list):
+                        # Labelled values, see microscope._metrics.
+                        for value_labels, labelled_value in value:
+                            samples.append(
+                                (
+                                    metric,
+                                    dict(obj_labels, **value_labels),
+                                    labelled_value,
+                                )
+                            )
+                    else:
+                        samples.append((metric, obj_labels, value))
+        return samples
+
+    def _status_proxy(self, address: Tuple[str, int]) -> Pyro4.Proxy:
+        """Proxy to the status object of the server at `address`."""
+        status = Pyro4.Proxy("PYRO:%s@%s:%d" % ((STATUS_OBJECT_ID,) + address))
+        status._pyroTimeout = self._health_check_timeout
+        return status
+
+    def _start(self, record: _ServerRecord) -> None:
+        record.server.start()
+        record.started_at = time.monotonic()
+        record.next_check = record.started_at + self._health_check_interval
+        record.address = None
+        record.healthy = None
+        record.restart_at = None
+
+    def _restart(self, record: _ServerRecord) -> None:
+        old_pid = record.server.pid
+        record.server = record.server.clone()
+        record.restarts += 1
+        self._start(record)
+        _logger.info(
+            "... DeviceServer with PID %s restarted as PID %s.",
+            old_pid,
+            record.server.pid,
+        )
+
+    def _schedule_restart(self, record: _ServerRecord) -> None:
+        now = time.monotonic()
+        if now - record.started_at < self._stable_time:
+            record.failures += 1
+        else:
+            record.failures = 1
+        record.healthy = False
+        # Restart immediately, unless it keeps failing.
+        if record.failures > 1:
+            delay = self._restart_policy.delay(record.failures - 2)
+        else:
+            delay = 0.0
+        record.restart_at = now + delay
+        if delay:
+            _logger.info("... restarting in %g seconds.", delay)
+
+    def _kill(self, record: _ServerRecord) -> None:
+        # Devices servers ignore SIGTERM (see term_func on
+        # serve_devices) and a hung process may not be able to exit
+        # cleanly anyway.
+        record.server.kill()
+        record.server.join(self._health_check_timeout)
+
+    def _read_addresses(self) -> None:
+        while True:
+            try:
+                pid, host, port = self._address_queue.get_nowait()
+            except queue.Empty:
+                return
+            for record in self._records:
+                if record.server.pid == pid:
+                    record.address = (host, port)
+
+    def _ping(self, uri: str) -> None:
+        with Pyro4.Proxy(uri) as proxy:
+            proxy._pyroTimeout = self._health_check_timeout
+            proxy._pyroBind()
+            if "get_is_enabled" in proxy._pyroMethods:
+                proxy.get_is_enabled()
+
+    def _is_responsive(self, name: str, address: Tuple[str, int]) -> bool:
+        """Ping the server and all of its devices."""
+        try:
+            with self._status_proxy(address) as status:
+                uris = status.get_devices()
+            for uri in uris.values():
+                self._ping(uri)
+        except Exception as e:
+            _logger.error("DeviceServer %s failed health check: %s", name, e)
+            return False
+        return True
+
+    def _health_check(
+        self,
+        record: _ServerRecord,
+        server: DeviceServer,
+        address: Tuple[str, int],
+    ) -> None:
+        # Runs on its own thread so that a hung server does not delay
+        # the checks of the others, nor holds the records lock.
+        healthy = self._is_responsive(record.name, address)
+        with self._records_lock:
+            record.checking = False
+            if record.server is not server or record.restart_at is not None:
+                # Restarted while we were waiting for it.
+                return
+            record.healthy = healthy
+            record.next_check = time.monotonic() + self._health_check_interval
+
+    def _check(self, record: _ServerRecord) -> bool:
+        """Check a server, must be called with the records lock.
+
+        Returns whether the server is hung and needs to be killed.
+        Killing it waits for the process, so is left to the caller to
+        do without the lock.
+        """
+        if self._exit_event.is_set():
+            # Servers are exiting, do not restart them.
+            return False
+        if record.restart_at is not None:
+            if time.monotonic() >= record.restart_at:
+                self._restart(record)
+        elif not record.server.is_alive():
+            _logger.info(
+                "DeviceServer Failure. Process %s is dead with"
+                " exitcode %s. Restarting...",
+                record.server.pid,
+                record.server.exitcode,
+            )
+            record.server.join()
+            self._schedule_restart(record)
+        elif record.healthy is False:
+            _logger.info(
+                "DeviceServer Failure. Process %s is not responding."
+                " Restarting...",
+                record.server.pid,
+            )
+            return True
+        elif (
+            self._health_check_interval > 0
+            and record.address is not None
+            and not record.checking
+            and time.monotonic() >= record.next_check
+        ):
+            record.checking = True
+            threading.Thread(
+                target=self._health_check,
+                args=(record, record.server, record.address),
+                daemon=True,
+            ).start()
+        return False
+
+    def run(self) -> None:
+        with self._records_lock:
+            for record in self._records:
+                self._start(record)
+        while not self._exit_event.is_set():
+            with self._records_lock:
+                if not self._records:
+                    # Log and exit if no servers running. May want to
+                    # change this if we add some interface to
+                    # interactively restart servers.
+                    _logger.info("No servers running. Exiting.")
+                    self._exit_event.set()
+                    return
+                self._read_addresses()
+                hung = [
+                    record for record in self._records if self._check(record)
+                ]
+            for record in hung:
+                self._kill(record)
+            with self._records_lock:
+                for record in hung:
+                    self._schedule_restart(record)
+                sentinels = [
+                    record.server.sentinel
+                    for record in self._records
+                    if record.restart_at is None
+                ]
+            # Wake up as soon as a server process dies.  Health checks
+            # run on other threads so do not delay this.
+            multiprocessing.connection.wait(sentinels, timeout=0.5)
+
+
+class _MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serve the metrics of the supervisor of a `_MetricsServer`."""
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        samples = self.server.supervisor.get_metrics()
+        body = microscope._metrics.format_metrics(samples).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        _logger.debug("metrics request: " + format, *args)
+
+
+class _MetricsServer(http.server.ThreadingHTTPServer):
+    """HTTP server for Prometheus to scrape the device servers metrics."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], supervisor: _Supervisor):
+        super().__init__(address, _MetricsRequestHandler)
+        self.supervisor = supervisor
+
+
 def serve_devices(devices, options: DeviceServerOptions, exit_event=None):
     root_logger = logging.getLogger()
 
@@ -412,9 +1126,10 @@ def serve_devices(devices, options: DeviceServerOptions, exit_event=None):
     if exit_event is None:
         exit_event = multiprocessing.Event()
 
-    servers = (
-        []
-    )  # DeviceServers instances that we need to wait for when exiting
+    # DeviceServers instances to start, and the queue where they
+    # report their address for the health checks.
+    servers = []
+    address_queue = multiprocessing.Queue()
 
     # Child processes inherit signal handling from the parent so we
     # need to make sure that only the parent process sets the exit
@@ -428,10 +1143,10 @@ def serve_devices(devices, options: DeviceServerOptions, exit_event=None):
         if parent == multiprocessing.current_process():
             _logger.debug("Shutting down all servers.")
             exit_event.set()
-            # Join keep_alive_thread so that it can't modify the list
+            # Join supervisor_thread so that it can't modify the list
             # of servers.
-            keep_alive_thread.join()
-            for this_server in servers:
+            supervisor_thread.join()
+            for this_server in supervisor.servers:
                 this_server.join()
             sys.exit()
 
@@ -441,6 +1156,7 @@ def serve_devices(devices, options: DeviceServerOptions, exit_event=None):
 
     # Group devices by class.
     by_class = {}
+    device_defs = []
     for dev in devices:
         ## We may change dev['conf'] later so make a copy of it (see
         ## original issue #211 and PRs #212 and #217 - most discussion
@@ -448,23 +1164,23 @@ def serve_devices(devices, options: DeviceServerOptions, exit_event=None):
         ## not 'devices' because 'devices' may have internal refs
         ## which are kept on a deepcopy (issue #274).
         dev = copy.deepcopy(dev)
+        device_defs.append(dev)
 
         by_class[dev["cls"]] = by_class.get(dev["cls"], []) + [dev]
 
     if not by_class:
         _logger.warning("No valid devices specified. Maybe an empty list?")
 
+    # Floating devices are devices that can only be identified after
+    # having been initialized, so the constructor will return any
+    # device that it supports.  To work around this we map all device
+    # uid to host/port first.  After the DeviceServer constructs the
+    # device, it can check on the map where to serve it.  For non
+    # floating devices that information is part of the device
+    # definition, no map is needed.
+    uid_to_host = {}
+    uid_to_port = {}
     for cls, devs in by_class.items():
-        # Floating devices are devices that can only be identified
-        # after having been initialized, so the constructor will
-        # return any device that it supports.  To work around this we
-        # map all device uid to host/port first.  After the
-        # DeviceServer constructs the device, it can check on the map
-        # where to serve it.  For non floating devices that
-        # information is part of the device definition, no map is
-        # needed.
-        uid_to_host = {}
-        uid_to_port = {}
         if isinstance(cls, type) and issubclass(cls, FloatingDeviceMixin):
             # In addition to the maps of uid to host/port, floating
             # devices SDKs need the number of devices to index them.
@@ -477,64 +1193,41 @@ def serve_devices(devices, options: DeviceServerOptions, exit_event=None):
                 dev["conf"]["index"] = count
                 count += 1
 
-        for dev in devs:
-            servers.append(
-                DeviceServer(
-                    dev,
-                    options,
-                    uid_to_host,
-                    uid_to_port,
-                    exit_event=exit_event,
-                )
+    # Devices in the same group are served by the same DeviceServer.
+    for device_def in _group_devices(device_defs):
+        servers.append(
+            DeviceServer(
+                device_def,
+                options,
+                uid_to_host,
+                uid_to_port,
+                exit_event=exit_event,
+                address_queue=address_queue,
             )
-            servers[-1].start()
-
-    # Main thread must be idle to process signals correctly, so use another
-    # thread to check DeviceServers, restarting them where necessary. Define
-    # the thread target here so that it can access variables in __main__ scope.
-    def keep_alive():
-        """Keep DeviceServers alive."""
-        while not exit_event.is_set():
-            for s in servers:
-                if s.is_alive():
-                    continue
-                else:
-                    _logger.info(
-                        "DeviceServer Failure. Process %s is dead with"
-                        " exitcode %s. Restarting...",
-                        s.pid,
-                        s.exitcode,
-                    )
-                    servers.remove(s)
-                    servers.append(s.clone())
-
-                    try:
-                        s.join(30)
-                    except:
-                        _logger.error("... could not join PID %s.", s.pid)
-                    else:
-                        old_pid = s.pid
-                        del s
-                        servers[-1].start()
-                        _logger.info(
-                            "... DeviceServer with PID %s restarted"
-                            " as PID %s.",
-                            old_pid,
-                            servers[-1].pid,
-                        )
-            if not servers:
-                # Log and exit if no servers running. May want to change this
-                # if we add some interface to interactively restart servers.
-                _logger.info("No servers running. Exiting.")
-                exit_event.set()
-            else:
-                try:
-                    time.sleep(5)
-                except (KeyboardInterrupt, IOError):
-                    pass
-
-    keep_alive_thread = Thread(target=keep_alive)
-    keep_alive_thread.start()
+        )
+
+    # Main thread must be idle to process signals correctly, so use
+    # another thread to start and supervise the DeviceServers.
+    supervisor = _Supervisor(
+        servers,
+        exit_event,
+        address_queue,
+        health_check_interval=options.health_check_interval,
+        health_check_timeout=options.health_check_timeout,
+    )
+    supervisor_thread = Thread(target=supervisor.run)
+    supervisor_thread.start()
+
+    metrics_server = None
+    if options.metrics_port is not None:
+        metrics_server = _MetricsServer(
+            (options.metrics_host, options.metrics_port), supervisor
+        )
+        Thread(target=metrics_server.serve_forever, daemon=True).start()
+        _logger.info(
+            "Serving metrics on http://%s:%d/metrics",
+            *metrics_server.server_address[:2],
+        )
 
     _logger.info("Device Server started. Press Ctrl+C to exit.")
     while not exit_event.is_set():
@@ -545,6 +1238,11 @@ def serve_devices(devices, options: DeviceServerOptions, exit_event=None):
             exit_event.set()
 
     _logger.debug("Shutting down servers ...")
+    if metrics_server is not None:
+        metrics_server.shutdown()
+        metrics_server.server_close()
+    supervisor_thread.join()
+    servers = supervisor.servers
     while servers:
         for s in servers:
             if not s.is_alive():
@@ -553,7 +1251,6 @@ def serve_devices(devices, options: DeviceServerOptions, exit_event=None):
         time.sleep(1)
     _logger.info(" ... No more servers running.")
     _logger.debug("Joining threads ...")
-    keep_alive_thread.join()
     _logger.debug("... Threads joined. Exiting.")
     return
 
@@ -575,6 +1272,35 @@ def _parse_cmd_line_args(args: Sequence[str]) -> DeviceServerOptions:
         default="",
         help="Directory where log files are written to",
     )
+    parser.add_argument(
+        "--health-check-interval",
+        action="store",
+        type=float,
+        default=0.0,
+        help="Seconds between health checks of each device server"
+        " (disabled by default)",
+    )
+    parser.add_argument(
+        "--health-check-timeout",
+        action="store",
+        type=float,
+        default=5.0,
+        help="Seconds to wait for devices to respond to a health check",
+    )
+    parser.add_argument(
+        "--metrics-host",
+        action="store",
+        type=str,
+        default="127.0.0.1",
+        help="Host where to serve metrics",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        action="store",
+        type=int,
+        default=None,
+        help="Port where to serve metrics over HTTP (disabled by default)",
+    )
 
     parser.add_argument(
         "config_fpath",
@@ -588,6 +1314,10 @@ def _parse_cmd_line_args(args: Sequence[str]) -> DeviceServerOptions:
         config_fpath=parsed.config_fpath,
         logging_level=getattr(logging, parsed.logging_level.upper()),
         logging_dir=parsed.logging_dir,
+        health_check_interval=parsed.health_check_interval,
+        health_check_timeout=parsed.health_check_timeout,
+        metrics_host=parsed.metrics_host,
+        metrics_port=parsed.metrics_port,
     )
 
 
@@ -607,6 +1337,7 @@ def validate_devices(configfile):
         raise Exception("No 'DEVICES=...' in config file.")
     if not isinstance(devices, Iterable):
         raise Exception("Error in config: DEVICES should be an iterable.")
+    _group_devices(devices)
     return devices
 
 
@@ -29,6 +29,7 @@ hardware behaviour.  They implement the different ABC.
 import logging
 import math
 import random
+import threading
 import time
 from typing import Mapping, Tuple
 
@@ -36,10 +37,12 @@ import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
 import microscope
+import microscope._logging
 import microscope._utils
 import microscope.abc
 
 _logger = logging.getLogger(__name__)
+_hot_logger = microscope._logging.HotPathLogger(_logger)
 
 
 ## PIL 9.2 deprecated ImageFont.getsize and PIL 10.0 removed it in
@@ -179,6 +182,8 @@ class SimulatedCamera(
             self._image_generator.method,
             self._image_generator.set_method,
             self._image_generator.get_methods,
+            requires_restart=False,
+            static_values=True,
         )
         self.add_setting(
             "image data type",
@@ -186,6 +191,8 @@ class SimulatedCamera(
             self._image_generator.data_type,
             self._image_generator.set_data_type,
             self._image_generator.get_data_types,
+            requires_restart=False,
+            static_values=True,
         )
         self.add_setting(
             "display image number",
@@ -193,6 +200,7 @@ class SimulatedCamera(
             lambda: self._image_generator.numbering,
             self._image_generator.enable_numbering,
             None,
+            requires_restart=False,
         )
         # Software buffers and parameters for data conversion.
         self._a_setting = 0
@@ -202,6 +210,7 @@ class SimulatedCamera(
             lambda: self._a_setting,
             lambda val: setattr(self, "_a_setting", val),
             lambda: (1, 100),
+            requires_restart=False,
         )
         self._error_percent = 0
         self.add_setting(
@@ -210,6 +219,7 @@ class SimulatedCamera(
             lambda: self._error_percent,
             self._set_error_percent,
             lambda: (0, 100),
+            requires_restart=False,
         )
         self._gain = 0
         self.add_setting(
@@ -218,10 +228,13 @@ class SimulatedCamera(
             lambda: self._gain,
             self._set_gain,
             lambda: (0, 8192),
+            requires_restart=False,
         )
         self._acquiring = False
         self._exposure_time = 0.1
         self._triggered = 0
+        # Signals a new trigger to the fetch thread.
+        self._triggered_condition = threading.Condition()
         # Count number of images sent since last enable.
         self._sent = 0
 
@@ -244,13 +257,14 @@ class SimulatedCamera(
     def _fetch_data(self):
         if self._acquiring and self._triggered > 0:
             if random.randint(0, 100) < self._error_percent:
-                _logger.info("Raising exception")
+                _hot_logger.info("Raising exception")
                 raise microscope.DeviceError(
                     "Exception raised in SimulatedCamera._fetch_data"
                 )
-            _logger.info("Sending image")
+            _hot_logger.info("Sending image")
             time.sleep(self._exposure_time)
-            self._triggered -= 1
+            with self._triggered_condition:
+                self._triggered -= 1
             # Create an image
             dark = int(32 * np.random.rand())
             light = int(255 - 128 * np.random.rand())
@@ -259,9 +273,16 @@ class SimulatedCamera(
             image = self._image_generator.get_image(
                 width, height, dark, light, index=self._sent
             )
+            self._set_frame_metadata(frame_number=self._sent)
             self._sent += 1
             return image
 
+    def _wait_for_data(self, timeout: float) -> bool:
+        with self._triggered_condition:
+            return self._triggered_condition.wait_for(
+                lambda: self._acquiring and self._triggered > 0, timeout
+            )
+
     def abort(self):
         _logger.info("Disabling acquisition; %d images sent.", self._sent)
         if self._acquiring:
@@ -297,11 +318,13 @@ class SimulatedCamera(
         self.trigger()
 
     def _do_trigger(self) -> None:
-        _logger.info(
+        _hot_logger.info(
             "Trigger received; self._acquiring is %s.", self._acquiring
         )
         if self._acquiring:
-            self._triggered += 1
+            with self._triggered_condition:
+                self._triggered += 1
+                self._triggered_condition.notify()
 
     def _get_binning(self):
         return self._binning
@@ -30,6 +30,7 @@ import PIL.Image
 import scipy.ndimage
 
 import microscope
+import microscope._logging
 import microscope.abc
 from microscope.simulators import (
     SimulatedCamera,
@@ -38,6 +39,7 @@ from microscope.simulators import (
 )
 
 _logger = logging.getLogger(__name__)
+_hot_logger = microscope._logging.HotPathLogger(_logger)
 
 
 class StageAwareCamera(SimulatedCamera):
@@ -99,8 +101,9 @@ class StageAwareCamera(SimulatedCamera):
             return None
 
         time.sleep(self._exposure_time)
-        self._triggered -= 1
-        _logger.info("Creating image")
+        with self._triggered_condition:
+            self._triggered -= 1
+        _hot_logger.info("Creating image")
 
         # Use filter wheel position to select the image channel.
         channel = self._filterwheel.position
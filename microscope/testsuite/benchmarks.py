@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+
+## Copyright (C) 2026 David Miguel Susano Pinto <carandraug@gmail.com>
+##
+## This file is part of Microscope.
+##
+## Microscope is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Microscope is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmarks of the acquisition pipeline with simulated cameras.
+
+Each benchmark acquires frames from a :class:`SimulatedCamera` or a
+:class:`StageAwareCamera`, either on the same process as the clients
+("local") or served by a device server on another process and
+received through Pyro ("pyro").  It reports the frame rate, the
+latency from fetching each frame to a client receiving it, and the
+CPU time and peak memory of the process with the camera.
+
+Run all combinations of the given parameters with::
+
+    python -m microscope.testsuite.benchmarks \\
+        --camera SimulatedCamera StageAwareCamera \\
+        --shape 512x512 2048x2048 --dtype uint8 uint16 \\
+        --clients 1 4 --mode local pyro
+
+and save the results with ``--json`` to compare them across changes.
+CPU time and memory of the device server are only available on
+Linux.
+
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import Pyro4
+import Pyro4.errors
+
+import microscope
+import microscope.clients
+import microscope.device_server
+from microscope.simulators import (
+    SimulatedCamera,
+    SimulatedFilterWheel,
+    SimulatedStage,
+)
+from microscope.simulators.stage_aware_camera import StageAwareCamera
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows.
+    resource = None
+
+
+CAMERAS = ("SimulatedCamera", "StageAwareCamera")
+MODES = ("local", "pyro")
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    """Parameters of a single benchmark.
+
+    Attributes:
+        camera: name of the simulated camera class.
+        shape: sensor shape, as `(width, height)`.
+        dtype: name of the data type of the images.
+        fps: frame rate to acquire at.  Zero means as fast as
+            possible.
+        clients: number of clients receiving all frames.
+        frames: number of frames to acquire.
+        mode: either ``"local"`` or ``"pyro"``.
+    """
+
+    camera: str = "SimulatedCamera"
+    shape: Tuple[int, int] = (512, 512)
+    dtype: str = "uint8"
+    fps: float = 0.0
+    clients: int = 1
+    frames: int = 200
+    mode: str = "local"
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of a single benchmark.
+
+    Latencies are in milliseconds, from fetching each frame to a
+    client receiving it.  CPU time and memory are of the process with
+    the camera, and are `None` if not available.
+    """
+
+    config: BenchmarkConfig
+    fps: float
+    latency_p50: float
+    latency_p90: float
+    latency_p99: float
+    latency_max: float
+    cpu_seconds: Optional[float]
+    peak_rss_mb: Optional[float]
+
+
+def _stage_aware_setup(sensor_shape, dtype):
+    """Devices for a :class:`StageAwareCamera` over a random image."""
+    width, height = sensor_shape
+    shape = (2 * height, 2 * width, 3)
+    image = np.random.randint(0, 255, size=shape).astype(dtype)
+    stage = SimulatedStage(
+        {
+            "x": microscope.AxisLimits(0, image.shape[1]),
+            "y": microscope.AxisLimits(0, image.shape[0]),
+            "z": microscope.AxisLimits(-50, 50),
+        }
+    )
+    stage.enable()
+    # Centre the field of view in the image and in focus.
+    stage.move_to({"x": width, "y": height, "z": 0.0})
+    filterwheel = SimulatedFilterWheel(positions=image.shape[2])
+    camera = StageAwareCamera(
+        image, stage, filterwheel, sensor_shape=sensor_shape
+    )
+    return {"camera": camera, "stage": stage, "filterwheel": filterwheel}
+
+
+def _set_enum_setting(device, name: str, label: str) -> None:
+    values = {
+        label: value
+        for value, label in device.describe_setting(name)["values"]
+    }
+    device.set_setting(name, values[label])
+
+
+def _simulated_camera(sensor_shape, dtype):
+    camera = SimulatedCamera(sensor_shape=sensor_shape)
+    # Black images with no frame number are the cheapest to generate
+    # so that the benchmark measures the pipeline and not the
+    # simulation.
+    _set_enum_setting(camera, "image pattern", "black")
+    _set_enum_setting(camera, "image data type", dtype)
+    camera.set_setting("display image number", False)
+    return {"camera": camera}
+
+
+def _make_devices(config: BenchmarkConfig):
+    if config.camera == "SimulatedCamera":
+        return _simulated_camera(config.shape, config.dtype)
+    elif config.camera == "StageAwareCamera":
+        return _stage_aware_setup(config.shape, config.dtype)
+    else:
+        raise ValueError("unknown camera '%s'" % config.camera)
+
+
+class _LatencyRecorder:
+    """Local client that records the latency of each frame."""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.received = threading.Semaphore(0)
+
+    def put(self, item) -> None:
+        data, metadata = item
+        self.latencies.append(time.time() - metadata.timestamp)
+        self.received.release()
+
+
+class _RemoteLatencyRecorder(microscope.clients.DataClient):
+    """Remote client that records the latency of each frame."""
+
+    def __init__(self, url) -> None:
+        super().__init__(url, metadata=True)
+        self.latencies: List[float] = []
+        self.received = threading.Semaphore(0)
+
+    def _put(self, item) -> None:
+        data, timestamp, metadata = item
+        self.latencies.append(time.time() - metadata.timestamp)
+        self.received.release()
+
+
+def _process_usage(pid: int) -> Tuple[Optional[float], Optional[float]]:
+    """CPU time, in seconds, and peak RSS, in MB, of a process.
+
+    Reads ``/proc`` so it is only available on Linux.
+    """
+    try:
+        with open("/proc/%d/stat" % pid) as fh:
+            # The process name may have spaces but is between
+            # parentheses, the other fields are after it.
+            fields = fh.read().rsplit(")", 1)[1].split()
+        with open("/proc/%d/status" % pid) as fh:
+            status = dict(line.split(":", 1) for line in fh)
+    except OSError:
+        return None, None
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu = (int(fields[11]) + int(fields[12])) / ticks
+    peak_rss = int(status["VmHWM"].split()[0]) / 1024
+    return cpu, peak_rss
+
+
+def _own_usage() -> Tuple[Optional[float], Optional[float]]:
+    peak_rss = None
+    if resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+        if sys.platform == "darwin":
+            peak_rss = maxrss / 1024 / 1024
+        else:
+            peak_rss = maxrss / 1024
+    return time.process_time(), peak_rss
+
+
+def _acquire(camera, recorders, config: BenchmarkConfig) -> float:
+    """Acquire frames and return the time it took, in seconds."""
+    if config.fps > 0:
+        camera.set_exposure_time(1.0 / config.fps)
+    else:
+        camera.set_exposure_time(0.0)
+    camera.enable()
+    start = time.perf_counter()
+    # The simulated cameras queue software triggers so send them all
+    # at once, in a single call if remote.
+    camera.call_many([("trigger",)] * config.frames)
+    for recorder in recorders:
+        for _ in range(config.frames):
+            if not recorder.received.acquire(timeout=60.0):
+                raise TimeoutError("frames not received in time")
+    elapsed = time.perf_counter() - start
+    camera.disable()
+    return elapsed
+
+
+def _result(config, elapsed, recorders, usage) -> BenchmarkResult:
+    latencies = np.concatenate([r.latencies for r in recorders]) * 1000.0
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return BenchmarkResult(
+        config=config,
+        fps=config.frames / elapsed,
+        latency_p50=float(p50),
+        latency_p90=float(p90),
+        latency_p99=float(p99),
+        latency_max=float(latencies.max()),
+        cpu_seconds=usage[0],
+        peak_rss_mb=usage[1],
+    )
+
+
+def run_local(config: BenchmarkConfig) -> BenchmarkResult:
+    """Benchmark a camera on this process with local clients."""
+    devices = _make_devices(config)
+    camera = devices["camera"]
+    recorders = [_LatencyRecorder() for _ in range(config.clients)]
+    try:
+        camera.set_client(recorders[0], send_metadata=True)
+        for recorder in recorders[1:]:
+            camera.add_subscriber(recorder, send_metadata=True)
+        cpu_start = time.process_time()
+        elapsed = _acquire(camera, recorders, config)
+        cpu, peak_rss = _own_usage()
+    finally:
+        for device in devices.values():
+            device.shutdown()
+    return _result(config, elapsed, recorders, (cpu - cpu_start, peak_rss))
+
+
+def _wait_until_ready(host: str, port: int, timeout: float = 30.0) -> dict:
+    """Wait for a device server and return the URIs of its devices."""
+    status = Pyro4.Proxy(
+        "PYRO:%s@%s:%d"
+        % (microscope.device_server.STATUS_OBJECT_ID, host, port)
+    )
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if status.is_ready():
+                return status.get_devices()
+        except Pyro4.errors.CommunicationError:
+            pass
+        if time.monotonic() > deadline:
+            raise TimeoutError("device server not ready in time")
+        time.sleep(0.1)
+
+
+def run_pyro(
+    config: BenchmarkConfig, host: str = "127.0.0.1", port: int = 8000
+) -> BenchmarkResult:
+    """Benchmark a camera on a device server with remote clients."""
+    device_def = microscope.device_server.device(
+        _make_devices, host, port, conf={"config": config}
+    )
+    options = microscope.device_server.DeviceServerOptions(
+        config_fpath="",
+        logging_level=logging.WARNING,
+        logging_dir=tempfile.mkdtemp(),
+    )
+    server = microscope.device_server.DeviceServer(
+        device_def, options, {}, {}, exit_event=multiprocessing.Event()
+    )
+    server.start()
+    try:
+        uris = _wait_until_ready(host, port)
+        camera = microscope.clients.Client(uris["camera"])
+        recorders = [
+            _RemoteLatencyRecorder(uris["camera"])
+            for _ in range(config.clients)
+        ]
+        recorders[0].enable()
+        for recorder in recorders[1:]:
+            camera.add_subscriber(recorder._client_uri, send_metadata=True)
+        cpu_start = _process_usage(server.pid)[0]
+        elapsed = _acquire(camera, recorders, config)
+        cpu, peak_rss = _process_usage(server.pid)
+        if cpu is not None:
+            cpu -= cpu_start
+    finally:
+        server.exit_event.set()
+        server.join(10.0)
+        if server.is_alive():
+            server.kill()
+    return _result(config, elapsed, recorders, (cpu, peak_rss))
+
+
+def run(config: BenchmarkConfig) -> BenchmarkResult:
+    if config.mode == "local":
+        return run_local(config)
+    elif config.mode == "pyro":
+        return run_pyro(config)
+    else:
+        raise ValueError("unknown mode '%s'" % config.mode)
+
+
+def _format_result(result: BenchmarkResult) -> str:
+    config = result.config
+    usage = []
+    if result.cpu_seconds is not None:
+        usage.append("cpu %6.2f s" % result.cpu_seconds)
+    if result.peak_rss_mb is not None:
+        usage.append("rss %7.1f MB" % result.peak_rss_mb)
+    return (
+        "%-16s %-5s %9s %-6s fps %5g clients %d: %8.1f fps,"
+        " latency p50 %7.2f p90 %7.2f p99 %7.2f max %7.2f ms, %s"
+        % (
+            config.camera,
+            config.mode,
+            "%dx%d" % config.shape,
+            config.dtype,
+            config.fps,
+            config.clients,
+            result.fps,
+            result.latency_p50,
+            result.latency_p90,
+            result.latency_p99,
+            result.latency_max,
+            ", ".join(usage),
+        )
+    )
+
+
+def _parse_shape(text: str) -> Tuple[int, int]:
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def _parse_cmd_line_args(args: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="microscope-benchmarks")
+    parser.add_argument(
+        "--camera", nargs="+", choices=CAMERAS, default=[CAMERAS[0]]
+    )
+    parser.add_argument(
+        "--shape",
+        nargs="+",
+        type=_parse_shape,
+        default=[(512, 512)],
+        help="Sensor shapes, as WIDTHxHEIGHT",
+    )
+    parser.add_argument(
+        "--dtype", nargs="+", choices=["uint8", "uint16"], default=["uint8"]
+    )
+    parser.add_argument(
+        "--fps",
+        nargs="+",
+        type=float,
+        default=[0.0],
+        help="Frame rates, zero for as fast as possible",
+    )
+    parser.add_argument("--clients", nargs="+", type=int, default=[1])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--mode", nargs="+", choices=MODES, default=["local"])
+    parser.add_argument(
+        "--json", type=str, default=None, help="File to save results to"
+    )
+    return parser.parse_args(args)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = _parse_cmd_line_args(argv[1:])
+    results = []
+    for camera, shape, dtype, fps, clients, mode in itertools.product(
+        args.camera, args.shape, args.dtype, args.fps, args.clients, args.mode
+    ):
+        config = BenchmarkConfig(
+            camera=camera,
+            shape=shape,
+            dtype=dtype,
+            fps=fps,
+            clients=clients,
+            frames=args.frames,
+            mode=mode,
+        )
+        result = run(config)
+        print(_format_result(result), flush=True)
+        results.append(result)
+    if args.json is not None:
+        with open(args.json, "w") as fh:
+            json.dump([asdict(r) for r in results], fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
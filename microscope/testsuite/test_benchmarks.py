@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+## Copyright (C) 2026 David Miguel Susano Pinto <carandraug@gmail.com>
+##
+## This file is part of Microscope.
+##
+## Microscope is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Microscope is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the benchmarks of the acquisition pipeline."""
+
+import unittest
+
+from microscope.testsuite import benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_local(self):
+        for camera in benchmarks.CAMERAS:
+            config = benchmarks.BenchmarkConfig(
+                camera=camera, shape=(32, 32), clients=2, frames=5
+            )
+            with self.subTest(camera=camera):
+                result = benchmarks.run_local(config)
+                self.assertGreater(result.fps, 0)
+                self.assertLessEqual(result.latency_p50, result.latency_max)
+
+
+if __name__ == "__main__":
+    unittest.main()
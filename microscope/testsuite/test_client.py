@@ -17,12 +17,18 @@
 ## You should have received a copy of the GNU General Public License
 ## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
+import queue
 import threading
 import unittest
+import unittest.mock
 
+import numpy as np
 import Pyro4
 
+import microscope._transport
 import microscope.clients
+import microscope.simulators
 import microscope.testsuite.devices as dummies
 
 
@@ -47,6 +53,10 @@ class PyroService:
     def attr(self, value):  # exposed as 'proxy.attr' writable
         self._value = value
 
+    def add(self, value):
+        self._value += value
+        return self._value
+
 
 @Pyro4.expose
 class ExposedDeformableMirror(dummies.TestDeformableMirror):
@@ -64,6 +74,7 @@ class ExposedDeformableMirror(dummies.TestDeformableMirror):
 
 class TestClient(unittest.TestCase):
     def setUp(self):
+        microscope.clients.clear_metadata_cache()
         self.daemon = Pyro4.Daemon()
         self.thread = threading.Thread(target=self.daemon.requestLoop)
 
@@ -99,6 +110,228 @@ class TestClient(unittest.TestCase):
         self.assertTrue(client.attr, 10)
         self.assertTrue(obj.attr, 10)
 
+    def test_property_writing_reaches_remote(self):
+        obj = PyroService()
+        client = (self._serve_objs([obj]))[0]
+        client.attr = 10
+        self.assertEqual(obj.attr, 10)
+        self.assertEqual(client.attr, 10)
+
+    def test_metadata_cached_per_uri(self):
+        obj = PyroService()
+        uri = self.daemon.register(obj)
+        self.thread.start()
+        microscope.clients.Client(uri)
+        with unittest.mock.patch.object(Pyro4.Proxy, "_pyroInvoke") as invoke:
+            client = microscope.clients.Client(uri)
+            invoke.assert_not_called()
+        self.assertEqual(client.attr, 42)
+        self.assertIn("attr", dir(client))
+
+    def test_clear_metadata_cache(self):
+        obj = PyroService()
+        uri = self.daemon.register(obj)
+        self.thread.start()
+        microscope.clients.Client(uri)
+        microscope.clients.clear_metadata_cache(uri)
+        with unittest.mock.patch.object(
+            Pyro4.Proxy, "_pyroGetMetadata", autospec=True
+        ) as get_metadata:
+            get_metadata.side_effect = lambda proxy: None
+            microscope.clients.Client(uri)
+        get_metadata.assert_called_once()
+
+    @unittest.mock.patch.object(Pyro4.config, "REQUIRE_EXPOSE", False)
+    def test_call_many(self):
+        obj = ExposedDeformableMirror(10)
+        client = (self._serve_objs([obj]))[0]
+        self.assertEqual(
+            client.call_many(["get_is_enabled", "n_actuators"]),
+            [False, 10],
+        )
+
+    def test_call_many_with_pyro_batch(self):
+        # Any Pyro object, not only devices, can be used.
+        client = (self._serve_objs([PyroService()]))[0]
+        self.assertEqual(
+            client.call_many([("add", (1,)), ("add", (), {"value": 2})]),
+            [43, 45],
+        )
+        results = client.call_many(
+            [("add", ("a",)), ("add", (1,))], return_exceptions=True
+        )
+        self.assertIsInstance(results[0], TypeError)
+        self.assertEqual(results[1], 46)
+
+    @unittest.mock.patch.object(Pyro4.config, "REQUIRE_EXPOSE", False)
+    def test_batch(self):
+        obj = ExposedDeformableMirror(10)
+        client = (self._serve_objs([obj]))[0]
+        with client.batch(return_exceptions=True) as batch:
+            batch.get_is_enabled()
+            batch.get_setting("not a setting")
+        self.assertFalse(batch.results[0])
+        self.assertIsInstance(batch.results[1], KeyError)
+
+    @unittest.mock.patch.object(Pyro4.config, "REQUIRE_EXPOSE", False)
+    def test_change_listener(self):
+        device = microscope.simulators.SimulatedFilterWheel(positions=4)
+        device._change_interval = 0.01
+        device._change_poll_interval = 0.01
+        client = (self._serve_objs([device]))[0]
+        changes = queue.Queue()
+        client.add_change_listener(changes.put)
+        client.enable()
+        self.assertEqual(changes.get(timeout=5), {"enabled": True})
+        client.remove_change_listener(changes.put)
+        self.assertEqual(device._change_listeners, {})
+        device.shutdown()
+
+    def test_unknown_attribute(self):
+        client = (self._serve_objs([PyroService()]))[0]
+        with self.assertRaises(AttributeError):
+            client.not_an_attribute
+
+
+class TestDataClient(unittest.TestCase):
+    def setUp(self):
+        # Like the device server, serve the device without @expose.
+        patcher = unittest.mock.patch.object(
+            Pyro4.config, "REQUIRE_EXPOSE", False
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.camera = microscope.simulators.SimulatedCamera(
+            sensor_shape=(16, 16)
+        )
+        self.camera.set_exposure_time(0.0)
+        self.daemon = Pyro4.Daemon()
+        self.uri = str(self.daemon.register(self.camera))
+        self.thread = threading.Thread(target=self.daemon.requestLoop)
+        self.thread.start()
+
+    def tearDown(self):
+        self.camera.shutdown()
+        self.daemon.shutdown()
+        self.thread.join()
+
+    def test_receive_data(self):
+        client = microscope.clients.DataClient(self.uri)
+        client.enable()
+        data, timestamp = client.trigger_and_wait()
+        self.assertEqual(data.shape, (16, 16))
+        self.assertIsInstance(timestamp, float)
+
+    def test_receive_metadata(self):
+        client = microscope.clients.DataClient(self.uri, metadata=True)
+        client.enable()
+        data, timestamp, metadata = client.trigger_and_wait()
+        self.assertEqual(metadata.frame_number, 0)
+        self.assertEqual(metadata.timestamp, timestamp)
+
+    @unittest.skipIf(
+        microscope._transport.shared_memory is None,
+        "requires multiprocessing.shared_memory",
+    )
+    def test_shared_memory_transport(self):
+        client = microscope.clients.DataClient(self.uri, transport="shm")
+        client.enable()
+        for i in range(3):
+            data, timestamp = client.trigger_and_wait()
+            self.assertIsInstance(data, np.ndarray)
+            self.assertEqual(data.shape, (16, 16))
+
+    def test_compression(self):
+        client = microscope.clients.DataClient(self.uri, compression="zlib")
+        client.enable()
+        data, timestamp = client.trigger_and_wait()
+        self.assertIsInstance(data, np.ndarray)
+        self.assertEqual(data.shape, (16, 16))
+
+    @unittest.skipUnless(
+        microscope._transport.HAS_OUT_OF_BAND_PICKLE,
+        "requires pickle protocol 5",
+    )
+    def test_stream_transport(self):
+        client = microscope.clients.DataClient(
+            self.uri, metadata=True, transport="stream"
+        )
+        client.enable()
+        for i in range(3):
+            data, timestamp, metadata = client.trigger_and_wait()
+            self.assertEqual(data.shape, (16, 16))
+            self.assertEqual(metadata.frame_number, i)
+
+
+class TestAsyncDataClient(unittest.TestCase):
+    def setUp(self):
+        patcher = unittest.mock.patch.object(
+            Pyro4.config, "REQUIRE_EXPOSE", False
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cameras = [
+            microscope.simulators.SimulatedCamera(sensor_shape=(16, 16))
+            for i in range(2)
+        ]
+        self.daemon = Pyro4.Daemon()
+        self.uris = []
+        for camera in self.cameras:
+            camera.set_exposure_time(0.0)
+            self.uris.append(str(self.daemon.register(camera)))
+        self.thread = threading.Thread(target=self.daemon.requestLoop)
+        self.thread.start()
+
+    def tearDown(self):
+        for camera in self.cameras:
+            camera.shutdown()
+        self.daemon.shutdown()
+        self.thread.join()
+
+    def _run(self, coroutine):
+        return asyncio.run(asyncio.wait_for(coroutine, timeout=10))
+
+    def test_grab(self):
+        async def grab():
+            client = microscope.clients.AsyncDataClient(self.uris[0])
+            await client.enable()
+            return await client.grab()
+
+        data, timestamp = self._run(grab())
+        self.assertEqual(data.shape, (16, 16))
+
+    def test_stream(self):
+        async def stream():
+            client = microscope.clients.AsyncDataClient(
+                self.uris[0], metadata=True
+            )
+            await client.enable()
+            for i in range(3):
+                await client.trigger()
+            return [m.frame_number async for d, t, m in client.stream(3)]
+
+        self.assertEqual(sorted(self._run(stream())), [0, 1, 2])
+
+    def test_concurrent_devices(self):
+        async def grab_all():
+            clients = [
+                microscope.clients.AsyncDataClient(uri) for uri in self.uris
+            ]
+            await asyncio.gather(*[client.enable() for client in clients])
+            return await asyncio.gather(*[client.grab() for client in clients])
+
+        self.assertEqual(len(self._run(grab_all())), 2)
+
+    def test_remote_methods(self):
+        async def get_exposure_time():
+            client = microscope.clients.AsyncDataClient(self.uris[0])
+            await client.set_exposure_time(0.5)
+            return await client.get_exposure_time()
+
+        self.assertEqual(self._run(get_exposure_time()), 0.5)
+        with self.assertRaises(AttributeError):
+            microscope.clients.AsyncDataClient(self.uris[0]).not_a_method
+
 
 if __name__ == "__main__":
     unittest.main()
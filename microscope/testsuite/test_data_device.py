@@ -0,0 +1,787 @@
+#!/usr/bin/env python3
+
+## Copyright (C) 2026 David Miguel Susano Pinto <carandraug@gmail.com>
+##
+## This file is part of Microscope.
+##
+## Microscope is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Microscope is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the data handling machinery of :class:`DataDevice`."""
+
+import itertools
+import json
+import pickle
+import queue
+import threading
+import time
+import unittest
+import unittest.mock
+
+import numpy as np
+import Pyro4
+
+import microscope
+import microscope._transport
+import microscope.abc
+from microscope import simulators
+
+
+def _mock_remote_client():
+    """Mock of a Pyro proxy to a client with a `receiveData` method."""
+    client = unittest.mock.MagicMock()
+    client.__class__ = Pyro4.Proxy
+    del client.put
+    return client
+
+
+def _join_dispatch(device):
+    """Wait until all data has been sent to all clients."""
+    for worker in list(device._dispatch_workers.values()):
+        worker.queue.join()
+
+
+class TestBufferPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = microscope.abc._BufferPool(capacity=2)
+
+    def test_reuse_released_array(self):
+        array = self.pool.acquire((4, 8), np.uint16)
+        self.assertEqual(array.shape, (4, 8))
+        self.assertEqual(array.dtype, np.uint16)
+        self.pool.release(array)
+        self.assertIs(self.pool.acquire((4, 8), np.uint16), array)
+        self.assertEqual((self.pool.hits, self.pool.misses), (1, 1))
+
+    def test_keyed_by_shape_and_dtype(self):
+        array = self.pool.acquire((4, 8), np.uint16)
+        self.pool.release(array)
+        self.assertIsNot(self.pool.acquire((8, 4), np.uint16), array)
+        self.assertIsNot(self.pool.acquire((4, 8), np.uint8), array)
+
+    def test_ignore_foreign_arrays(self):
+        self.pool.release(np.zeros((4, 8)))
+        self.assertEqual(self.pool.n_free, 0)
+
+    def test_capacity(self):
+        arrays = [self.pool.acquire((2, 2), np.uint8) for i in range(3)]
+        for array in arrays:
+            self.pool.release(array)
+        self.assertEqual(self.pool.n_free, 2)
+        self.assertEqual(self.pool.n_lent, 0)
+
+    def test_retained_array(self):
+        array = self.pool.acquire((2, 2), np.uint8)
+        self.pool.retain(array)
+        self.pool.release(array)
+        self.assertEqual(self.pool.n_free, 0)
+        self.pool.release(array)
+        self.assertEqual(self.pool.n_free, 1)
+
+    def test_release_without_reuse(self):
+        array = self.pool.acquire((2, 2), np.uint8)
+        self.pool.retain(array)
+        self.pool.release(array, reuse=False)
+        self.pool.release(array)
+        self.assertEqual(self.pool.n_free, 0)
+        self.assertEqual(self.pool.n_lent, 0)
+
+
+class TestDataDeviceBufferPool(unittest.TestCase):
+    def setUp(self):
+        self.device = simulators.SimulatedCamera(sensor_shape=(16, 16))
+        self.device.set_setting("display image number", False)
+        self.device.set_exposure_time(0.0)
+
+    def tearDown(self):
+        self.device.shutdown()
+
+    def test_release_after_sending_to_remote_client(self):
+        client = _mock_remote_client()
+        self.device.set_client(client)
+        frame = self.device._acquire_buffer((16, 16), np.uint8)
+        self.device._put(frame, 0.0)
+        self.device.enable()
+        _join_dispatch(self.device)
+        client.receiveData.assert_called_once()
+        self.assertEqual(self.device._buffer_pool.n_free, 1)
+
+    def test_local_clients_keep_frames(self):
+        client = queue.Queue()
+        self.device.set_client(client)
+        self.device.enable()
+        frame = self.device._acquire_buffer((16, 16), np.uint8)
+        self.device._put(frame, 0.0)
+        self.assertTrue(np.shares_memory(client.get(timeout=5), frame))
+        _join_dispatch(self.device)
+        self.assertEqual(self.device._buffer_pool.n_free, 0)
+        self.assertEqual(self.device._buffer_pool.n_lent, 0)
+
+    def test_pool_metrics(self):
+        metrics = self.device.get_metrics()
+        for name in ["hits_total", "misses_total", "bytes"]:
+            self.assertEqual(metrics["buffer_pool_" + name], 0)
+        self.device.set_setting("buffer pool capacity", 2)
+        self.assertEqual(self.device._buffer_pool.capacity, 2)
+
+
+class TestBatchedDispatch(unittest.TestCase):
+    def setUp(self):
+        self.device = simulators.SimulatedCamera(sensor_shape=(16, 16))
+        self.client = _mock_remote_client()
+        self.device.set_client(self.client)
+
+    def tearDown(self):
+        self.device.shutdown()
+
+    def _put_frames(self, n):
+        frames = [np.full((16, 16), i, dtype=np.uint8) for i in range(n)]
+        for i, frame in enumerate(frames):
+            self.device._put(frame, float(i))
+        return frames
+
+    def test_no_batching_by_default(self):
+        self._put_frames(3)
+        self.device.enable()
+        _join_dispatch(self.device)
+        self.assertEqual(self.client.receiveData.call_count, 3)
+
+    def test_batch_queued_frames(self):
+        self.device.set_setting("dispatch batch size", 4)
+        frames = self._put_frames(3)
+        self.device.enable()
+        _join_dispatch(self.device)
+        self.client.receiveData.assert_called_once()
+        data, timestamps = self.client.receiveData.call_args[0]
+        np.testing.assert_array_equal(data, np.stack(frames))
+        np.testing.assert_array_equal(timestamps, [0.0, 1.0, 2.0])
+
+    def test_max_batch_size(self):
+        self.device.set_setting("dispatch batch size", 2)
+        self._put_frames(5)
+        self.device.enable()
+        _join_dispatch(self.device)
+        self.assertEqual(
+            [np.size(c[0][1]) for c in self.client.receiveData.call_args_list],
+            [2, 2, 1],
+        )
+
+    def test_exceptions_are_not_batched(self):
+        self.device.set_setting("dispatch batch size", 4)
+        self._put_frames(1)
+        self.device._put(microscope.DeviceError("foo"), 1.0)
+        self._put_frames(1)
+        self.device.enable()
+        _join_dispatch(self.device)
+        self.assertEqual(self.client.receiveData.call_count, 3)
+        self.assertIsInstance(
+            self.client.receiveData.call_args_list[1][0][0], Exception
+        )
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.device = simulators.SimulatedCamera(sensor_shape=(16, 16))
+        self.device.set_setting("display image number", False)
+        self.device.set_exposure_time(0.0)
+        self.client = queue.Queue()
+        self.device.set_client(self.client)
+
+    def tearDown(self):
+        self.device.shutdown()
+
+    def _spans(self):
+        trace = self.device.get_trace()
+        return [e for e in trace["traceEvents"] if e["ph"] == "X"]
+
+    def test_disabled_by_default(self):
+        self.assertEqual(self.device.get_setting("trace buffer length"), 0)
+        self.device.enable()
+        self.device.trigger()
+        self.client.get(timeout=5)
+        _join_dispatch(self.device)
+        self.assertEqual(self._spans(), [])
+
+    def test_trace_stages(self):
+        self.device.set_setting("trace buffer length", 100)
+        self.device.enable()
+        self.device.trigger()
+        self.client.get(timeout=5)
+        _join_dispatch(self.device)
+        spans = self._spans()
+        self.assertCountEqual(
+            [s["name"] for s in spans],
+            ["fetch", "put", "queue", "process", "send"],
+        )
+        self.assertEqual(len(set(s["args"]["timestamp"] for s in spans)), 1)
+        # The trace can be saved as JSON.
+        trace = self.device.get_trace()
+        self.assertEqual(json.loads(json.dumps(trace)), trace)
+
+    def test_ring_buffer(self):
+        self.device.set_setting("trace buffer length", 3)
+        for i in range(4):
+            self.device._put(np.zeros((2, 2)), float(i))
+        self.assertEqual(
+            [s["args"]["timestamp"] for s in self._spans()], [1.0, 2.0, 3.0]
+        )
+        self.device.clear_trace()
+        self.assertEqual(self._spans(), [])
+
+
+class TestSubscribers(unittest.TestCase):
+    def setUp(self):
+        self.device = simulators.SimulatedCamera(sensor_shape=(16, 16))
+        self.client = queue.Queue()
+        self.subscriber = queue.Queue()
+        self.device.set_client(self.client)
+        self.device.add_subscriber(self.subscriber)
+
+    def tearDown(self):
+        self.device.shutdown()
+
+    def test_fan_out_without_copy(self):
+        frame = np.zeros((2, 2))
+        self.device._put(frame, 0.0)
+        self.device.enable()
+        self.assertTrue(np.shares_memory(self.client.get(timeout=5), frame))
+        self.assertTrue(
+            np.shares_memory(self.subscriber.get(timeout=5), frame)
+        )
+
+    def test_subscribers_ignore_client_stack(self):
+        self.device.set_client(None)
+        self.device._put(np.zeros((2, 2)), 0.0)
+        self.device.enable()
+        self.subscriber.get(timeout=5)
+        self.assertTrue(self.client.empty())
+
+    def test_remove_subscriber(self):
+        self.device.remove_subscriber(self.subscriber)
+        self.device._put(np.zeros((2, 2)), 0.0)
+        self.device.enable()
+        self.client.get(timeout=5)
+        self.assertTrue(self.subscriber.empty())
+        with self.assertRaises(ValueError):
+            self.device.remove_subscriber(self.subscriber)
+
+    def test_slow_client_does_not_delay_others(self):
+        slow = _mock_remote_client()
+        slow.receiveData.side_effect = lambda *args: time.sleep(0.5)
+        self.device.add_subscriber(slow)
+        self.device.enable()
+        for i in range(3):
+            self.device._put(np.full((2, 2), i), float(i))
+        start = time.monotonic()
+        for i in range(3):
+            self.client.get(timeout=5)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_pooled_frame_reused_after_all_remote_clients(self):
+        self.device.set_client(None)
+        self.device.remove_subscriber(self.subscriber)
+        clients = [_mock_remote_client() for i in range(2)]
+        for client in clients:
+            self.device.add_subscriber(client)
+        self.device._put(self.device._acquire_buffer((2, 2), "u1"), 0.0)
+        self.device.enable()
+        _join_dispatch(self.device)
+        for client in clients:
+            client.receiveData.assert_called_once()
+        self.assertEqual(self.device._buffer_pool.n_free, 1)
+
+
+class TestWaitForData(unittest.TestCase):
+    def setUp(self):
+        self.device = simulators.SimulatedCamera(sensor_shape=(16, 16))
+        self.device.set_exposure_time(0.0)
+        self.buffer = queue.Queue()
+        self.device.set_client(self.buffer)
+
+    def tearDown(self):
+        self.device.shutdown()
+
+    def test_fetch_waits_for_data(self):
+        with unittest.mock.patch.object(
+            self.device, "_fetch_data", wraps=self.device._fetch_data
+        ) as fetch:
+            self.device.enable()
+            time.sleep(0.3)
+            # Without a trigger, the fetch thread sleeps waiting for
+            # the trigger instead of continuously polling.
+            self.assertLess(fetch.call_count, 10)
+            self.device.trigger()
+            self.buffer.get(timeout=1)
+
+    def test_polling_backoff(self):
+        self.device._poll_interval = self.device._min_poll_interval
+        for i in range(20):
+            microscope.abc.DataDevice._wait_for_data(self.device, 0.1)
+        self.assertEqual(
+            self.device._poll_interval, self.device._max_poll_interval
+        )
+
+
+class TestOverflowPolicy(unittest.TestCase):
+    def setUp(self):
+        self.device = simulators.SimulatedCamera(buffer_length=2)
+        self.buffer = queue.Queue()
+        self.device.set_client(self.buffer)
+
+    def tearDown(self):
+        self.device.shutdown()
+
+    def _set_policy(self, policy):
+        self.device.set_setting("dispatch overflow policy", policy.value)
+
+    def _put_and_dispatch(self, n):
+        for i in range(n):
+            self.device._put(np.full((2, 2), i), float(i))
+        self.device.enable()
+        _join_dispatch(self.device)
+        received = []
+        while not self.buffer.empty():
+            received.append(int(self.buffer.get()[0, 0]))
+        return received
+
+    def test_default_policy_is_block(self):
+        self.assertEqual(
+            self.device.get_setting("dispatch overflow policy"),
+            microscope.OverflowPolicy.BLOCK.value,
+        )
+
+    def test_drop_oldest(self):
+        self._set_policy(microscope.OverflowPolicy.DROP_OLDEST)
+        self.assertEqual(self._put_and_dispatch(5), [3, 4])
+        self.assertEqual(self.device.get_metrics()["frames_dropped_total"], 3)
+
+    def test_drop_newest(self):
+        self._set_policy(microscope.OverflowPolicy.DROP_NEWEST)
+        self.assertEqual(self._put_and_dispatch(5), [0, 1])
+        self.assertEqual(self.device.get_metrics()["frames_dropped_total"], 3)
+
+    def test_latest_only(self):
+        self._set_policy(microscope.OverflowPolicy.LATEST_ONLY)
+        self.device.set_setting("dispatch buffer length", 0)
+        self.assertEqual(self._put_and_dispatch(5), [4])
+        self.assertEqual(self.device.get_metrics()["frames_dropped_total"], 4)
+
+    def test_metrics(self):
+        self._set_policy(microscope.OverflowPolicy.DROP_NEWEST)
+        self._put_and_dispatch(5)
+        metrics = self.device.get_metrics()
+        self.assertEqual(metrics["frames_fetched_total"], 5)
+        self.assertEqual(metrics["frames_dispatched_total"], 2)
+        self.assertEqual(metrics["frames_dropped_total"], 3)
+        self.assertEqual(metrics["dispatch_clients"], 1)
+        self.assertEqual(metrics["dispatch_buffer_depth"], 0)
+        self.assertEqual(metrics["dispatch_latency_seconds"]["count"], 2)
+
+    def test_stop_worker_does_not_block(self):
+        self.device._put(np.zeros((2, 2)), 0.0)
+        self.device._put(np.zeros((2, 2)), 1.0)
+        worker = self.device._dispatch_workers[self.buffer]
+        drop_oldest = self.device._drop_oldest
+
+        def refill(worker, count=True):
+            # Like a put that was blocked on the full buffer.
+            if not drop_oldest(worker, count):
+                while not worker.queue.full():
+                    worker.queue.put_nowait((np.zeros((2, 2)), 2.0, None))
+                return False
+            return True
+
+        with unittest.mock.patch.object(
+            self.device, "_drop_oldest", side_effect=refill
+        ):
+            stopper = threading.Thread(
+                target=self.device._stop_dispatch_worker,
+                args=(worker,),
+                daemon=True,
+            )
+            stopper.start()
+            stopper.join(timeout=5)
+        self.assertFalse(stopper.is_alive())
+
+        # The dispatch thread stops on the next data without sending it.
+        dispatcher = threading.Thread(
+            target=self.device._dispatch_loop, args=(worker,), daemon=True
+        )
+        dispatcher.start()
+        dispatcher.join(timeout=5)
+        self.assertFalse(dispatcher.is_alive())
+        self.assertTrue(self.buffer.empty())
+
+    def test_drop_releases_pooled_buffers(self):
+        self._set_policy(microscope.OverflowPolicy.DROP_NEWEST)
+        for i in range(3):
+            self.device._put(self.device._acquire_buffer((2, 2), "u1"), 0.0)
+        self.assertEqual(self.device._buffer_pool.n_free, 1)
+
+
+class TestFrameMetadata(unittest.TestCase):
+    def setUp(self):
+        self.device = simulators.SimulatedCamera(sensor_shape=(16, 16))
+        self.device.set_exposure_time(0.0)
+
+    def tearDown(self):
+        self.device.shutdown()
+
+    def test_pickle(self):
+        metadata = microscope.FrameMetadata(
+            timestamp=1.0, frame_number=2, roi=microscope.ROI(0, 0, 4, 4)
+        )
+        copy = pickle.loads(pickle.dumps(metadata))
+        self.assertEqual(repr(copy), repr(metadata))
+
+    def test_no_metadata_by_default(self):
+        client = queue.Queue()
+        self.device.set_client(client)
+        self.device.enable()
+        self.device.trigger()
+        self.assertIsInstance(client.get(timeout=5), np.ndarray)
+
+    def test_metadata_to_local_client(self):
+        client = queue.Queue()
+        self.device.set_client(client, send_metadata=True)
+        self.device.enable()
+        for i in range(2):
+            self.device.trigger()
+            data, metadata = client.get(timeout=5)
+            self.assertIsInstance(data, np.ndarray)
+            self.assertEqual(metadata.frame_number, i)
+            self.assertEqual(metadata.roi, self.device.get_roi())
+            self.assertEqual(metadata.binning, self.device.get_binning())
+            self.assertEqual(metadata.exposure_time, 0.0)
+            self.assertIsNotNone(metadata.timestamp)
+
+    def test_exposure_time_change_while_enabled(self):
+        client = queue.Queue()
+        self.device.set_client(client, send_metadata=True)
+        self.device.enable()
+        self.device.set_exposure_time(0.05)
+        self.device.trigger()
+        data, metadata = client.get(timeout=5)
+        self.assertEqual(metadata.exposure_time, 0.05)
+
+    def test_metadata_to_remote_client(self):
+        client = _mock_remote_client()
+        self.device.set_client(client, send_metadata=True)
+        self.device._put(np.zeros((2, 2)), 1.0)
+        self.device.enable()
+        _join_dispatch(self.device)
+        data, timestamp, metadata = client.receiveData.call_args[0]
+        self.assertEqual(timestamp, 1.0)
+        self.assertEqual(metadata.timestamp, 1.0)
+
+    def test_batch_metadata(self):
+        client = _mock_remote_client()
+        self.device.set_client(client, send_metadata=True)
+        self.device.set_setting("dispatch batch size", 2)
+        for i in range(2):
+            self.device._set_frame_metadata(frame_number=i)
+            self.device._put(np.zeros((2, 2)), float(i))
+        self.device.enable()
+        _join_dispatch(self.device)
+        data, timestamps, metadata = client.receiveData.call_args[0]
+        self.assertEqual([m.frame_number for m in metadata], [0, 1])
+
+    def test_driver_fields_only_for_next_frame(self):
+        self.device._set_frame_metadata(hardware_timestamp=5)
+        self.assertEqual(
+            self.device._new_frame_metadata(0.0).hardware_timestamp, 5
+        )
+        self.assertIsNone(
+            self.device._new_frame_metadata(0.0).hardware_timestamp
+        )
+
+    def test_defaults_updated_on_roi_change(self):
+        self.device.enable()
+        self.device.set_roi(microscope.ROI(0, 0, 8, 8))
+        self.assertEqual(
+            self.device._new_frame_metadata(0.0).roi,
+            microscope.ROI(0, 0, 8, 8),
+        )
+
+    def test_defaults_read_on_enable(self):
+        with unittest.mock.patch.object(
+            self.device,
+            "_get_frame_metadata_defaults",
+            wraps=self.device._get_frame_metadata_defaults,
+        ) as get_defaults:
+            self.device.enable()
+            get_defaults.assert_called_once_with()
+            self.device._new_frame_metadata(0.0)
+            self.device._new_frame_metadata(1.0)
+            get_defaults.assert_called_once_with()
+
+    def test_no_metadata_unless_requested(self):
+        client = _mock_remote_client()
+        self.device.set_client(client)
+        self.device._set_frame_metadata(hardware_timestamp=5)
+        with unittest.mock.patch.object(
+            self.device, "_new_frame_metadata"
+        ) as new_metadata:
+            self.device._put(np.zeros((2, 2)), 1.0)
+        new_metadata.assert_not_called()
+        self.assertIsNone(self.device._frame_metadata)
+
+
+@unittest.skipIf(
+    microscope._transport.shared_memory is None,
+    "requires multiprocessing.shared_memory",
+)
+class TestSharedMemoryTransport(unittest.TestCase):
+    def setUp(self):
+        self.ring = microscope._transport.SharedMemoryRing(2)
+        self.reader = microscope._transport.SharedMemoryReader()
+
+    def tearDown(self):
+        self.reader.close()
+        self.ring.close()
+
+    def test_read_frame(self):
+        array = np.arange(12, dtype=np.uint16).reshape(3, 4)
+        read = self.reader.read(self.ring.write(array))
+        np.testing.assert_array_equal(read, array)
+        self.assertEqual(read.dtype, array.dtype)
+
+    def test_write_strided_array(self):
+        array = np.rot90(np.arange(12).reshape(3, 4))
+        read = self.reader.read(self.ring.write(array))
+        np.testing.assert_array_equal(read, array)
+
+    def test_overwritten_frame(self):
+        frames = [self.ring.write(np.full((2, 2), i)) for i in range(3)]
+        self.assertIsNone(self.reader.read(frames[0]))
+        self.assertEqual(self.reader.read(frames[2])[0, 0], 2)
+
+    def test_larger_frame(self):
+        small = self.ring.write(np.zeros((2, 2)))
+        large = self.ring.write(np.ones((8, 8)))
+        self.assertNotEqual(small.name, large.name)
+        np.testing.assert_array_equal(self.reader.read(large), np.ones((8, 8)))
+
+    def test_grows_geometrically(self):
+        names = set()
+        for size in range(100, 200, 10):
+            names.add(self.ring.write(np.zeros(size, dtype=np.uint8)).name)
+        self.assertEqual(len(names), 2)
+
+    def test_released_when_transport_changes(self):
+        device = simulators.SimulatedCamera(sensor_shape=(16, 16))
+        self.addCleanup(device.shutdown)
+        client = _mock_remote_client()
+        device.set_client(client, transport="shm")
+        device.enable()
+        device._put(np.zeros((2, 2)), 0.0)
+        _join_dispatch(device)
+        ring = device._dispatch_workers[client].shared_memory
+        self.assertIsNotNone(ring._shm)
+        device.set_client(client)
+        device._put(np.zeros((2, 2)), 1.0)
+        _join_dispatch(device)
+        self.assertIsNone(ring._shm)
+        self.assertIsInstance(client.receiveData.call_args[0][0], np.ndarray)
+
+    def test_device_sends_location(self):
+        device = simulators.SimulatedCamera(sensor_shape=(16, 16))
+        self.addCleanup(device.shutdown)
+        client = _mock_remote_client()
+        device.set_client(client, transport="shm")
+        frame = np.arange(6).reshape(2, 3)
+        device._put(frame, 0.0)
+        device.enable()
+        _join_dispatch(device)
+        location, timestamp = client.receiveData.call_args[0]
+        self.assertIsInstance(
+            location, microscope._transport.SharedMemoryFrame
+        )
+        np.testing.assert_array_equal(
+            self.reader.read(location), device._process_data(frame)
+        )
+
+    def test_only_remote_clients(self):
+        device = simulators.SimulatedCamera()
+        self.addCleanup(device.shutdown)
+        with self.assertRaises(ValueError):
+            device.set_client(queue.Queue(), transport="shm")
+        with self.assertRaises(ValueError):
+            device.set_client(_mock_remote_client(), transport="foo")
+
+
+class TestCompression(unittest.TestCase):
+    def test_codecs(self):
+        array = np.rot90(np.arange(4096, dtype=np.uint16).reshape(64, 64))
+        for name in ["zlib", "lz4", "zstd", "blosc"]:
+            with self.subTest(codec=name):
+                try:
+                    codec = microscope._transport.get_codec(name)
+                except ImportError:
+                    self.skipTest("no package for %s" % name)
+                frame = pickle.loads(pickle.dumps(codec.compress(array)))
+                decompressed = frame.decompress()
+                np.testing.assert_array_equal(decompressed, array)
+                self.assertTrue(decompressed.flags.writeable)
+
+    def test_device_compresses(self):
+        device = simulators.SimulatedCamera()
+        self.addCleanup(device.shutdown)
+        client = _mock_remote_client()
+        device.set_client(client, compression="zlib")
+        device._put(np.zeros((64, 64), dtype=np.uint16), 0.0)
+        device._put(microscope.DeviceError("foo"), 1.0)
+        device.enable()
+        _join_dispatch(device)
+        frame = client.receiveData.call_args_list[0][0][0]
+        self.assertIsInstance(frame, microscope._transport.CompressedFrame)
+        np.testing.assert_array_equal(
+            frame.decompress(), np.zeros((64, 64), dtype=np.uint16)
+        )
+        self.assertIsInstance(
+            client.receiveData.call_args_list[1][0][0], Exception
+        )
+        metrics = device.get_metrics()
+        self.assertGreater(
+            metrics["compression_input_bytes_total"],
+            10 * metrics["compression_output_bytes_total"],
+        )
+        self.assertGreater(metrics["compression_seconds_total"], 0)
+
+    def test_invalid_options(self):
+        device = simulators.SimulatedCamera()
+        self.addCleanup(device.shutdown)
+        with self.assertRaises(ValueError):
+            device.set_client(_mock_remote_client(), compression="foo")
+        with self.assertRaises(ValueError):
+            device.set_client(queue.Queue(), compression="zlib")
+
+
+class _HardwareFlipCamera(simulators.SimulatedCamera):
+    """Camera that flips images in hardware, as if during readout."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.hardware_transforms = []
+
+    def _set_hardware_transform(self, transform):
+        self.hardware_transforms.append(transform)
+        return (False, False, transform[2])
+
+
+class TestCameraTransform(unittest.TestCase):
+    def setUp(self):
+        self.device = simulators.SimulatedCamera()
+        self.data = np.arange(12).reshape(3, 4)
+
+    def tearDown(self):
+        self.device.shutdown()
+
+    def test_transforms(self):
+        for lr, ud, rot in itertools.product([False, True], repeat=3):
+            with self.subTest(transform=(lr, ud, rot)):
+                self.device.set_transform((lr, ud, rot))
+                expected = np.rot90(self.data, rot)
+                if ud:
+                    expected = np.flipud(expected)
+                if lr:
+                    expected = np.fliplr(expected)
+                processed = self.device._process_data(self.data)
+                np.testing.assert_array_equal(processed, expected)
+                self.assertTrue(np.shares_memory(processed, self.data))
+
+    def test_no_hardware_transform_setting_by_default(self):
+        self.assertNotIn(
+            "transform in hardware", self.device.get_all_settings()
+        )
+
+    def test_hardware_transform(self):
+        device = _HardwareFlipCamera()
+        self.addCleanup(device.shutdown)
+        device.set_transform((True, False, True))
+        self.assertEqual(device.hardware_transforms, [])
+        device.set_setting("transform in hardware", True)
+        self.assertEqual(device.hardware_transforms, [(True, False, True)])
+        np.testing.assert_array_equal(
+            device._process_data(self.data), np.rot90(self.data)
+        )
+        self.assertEqual(device.get_transform(), (True, False, True))
+        device.set_setting("transform in hardware", False)
+        self.assertEqual(device.hardware_transforms[-1], (False, False, False))
+        np.testing.assert_array_equal(
+            device._process_data(self.data), np.fliplr(np.rot90(self.data))
+        )
+
+
+@unittest.skipUnless(
+    microscope._transport.HAS_OUT_OF_BAND_PICKLE, "requires pickle protocol 5"
+)
+class TestStreamTransport(unittest.TestCase):
+    def setUp(self):
+        self.received = queue.Queue()
+        self.receiver = microscope._transport.StreamReceiver(
+            "127.0.0.1", lambda *args: self.received.put(args)
+        )
+        self.sender = microscope._transport.StreamSender(self.receiver.address)
+
+    def tearDown(self):
+        self.sender.close()
+        self.receiver.close()
+
+    def test_send_arrays(self):
+        arrays = [
+            np.arange(12, dtype=np.uint16).reshape(3, 4),
+            np.asfortranarray(np.ones((4, 5))),
+            np.rot90(np.arange(6).reshape(2, 3)),
+        ]
+        for i, array in enumerate(arrays):
+            self.sender.send(array, float(i), None)
+        for i, array in enumerate(arrays):
+            data, timestamp, metadata = self.received.get(timeout=5)
+            np.testing.assert_array_equal(data, array)
+            self.assertEqual(timestamp, float(i))
+
+    def test_send_other_data(self):
+        self.sender.send(Exception("foo"), 1.0, None)
+        self.sender.send(np.ones((2, 2)), np.array([1.0]), ["bar"])
+        data, timestamp, metadata = self.received.get(timeout=5)
+        self.assertIsInstance(data, Exception)
+        data, timestamp, metadata = self.received.get(timeout=5)
+        self.assertEqual(metadata, ["bar"])
+
+    def test_device_sends_to_stream(self):
+        device = simulators.SimulatedCamera(sensor_shape=(4, 4))
+        self.addCleanup(device.shutdown)
+        client = _mock_remote_client()
+        device.set_client(
+            client, transport="stream", stream_address=self.receiver.address
+        )
+        device.set_transform((False, False, True))
+        frame = device._acquire_buffer((4, 4), np.uint16)
+        frame[:] = np.arange(16).reshape(4, 4)
+        expected = device._process_data(frame.copy())
+        device._put(frame, 1.0)
+        device.enable()
+        data, timestamp, metadata = self.received.get(timeout=5)
+        np.testing.assert_array_equal(data, expected)
+        client.receiveData.assert_not_called()
+
+    def test_requires_address(self):
+        device = simulators.SimulatedCamera()
+        self.addCleanup(device.shutdown)
+        with self.assertRaises(ValueError):
+            device.set_client(_mock_remote_client(), transport="stream")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,9 +23,12 @@ import os
 import os.path
 import signal
 import tempfile
+import threading
 import time
 import unittest
 import unittest.mock
+import urllib.error
+import urllib.request
 
 import Pyro4
 import Pyro4.errors
@@ -101,11 +104,14 @@ class BaseTestServeDevices(unittest.TestCase):
         DEVICES (list): list of :class:`microscope.devices` to initialise.
         TIMEOUT (number): time given for service to terminate after
             receiving signal to terminate.
+        OPTIONS (dict): options to override on
+            :class:`microscope.device_server.DeviceServerOptions`.
         p (multiprocessing.Process): device server process.
     """
 
     DEVICES = []
     TIMEOUT = 5
+    OPTIONS = {}
 
     @_patch_out_device_server_logs
     def setUp(self):
@@ -113,6 +119,7 @@ class BaseTestServeDevices(unittest.TestCase):
             config_fpath="",
             logging_level=logging.INFO,
             logging_dir="",
+            **self.OPTIONS,
         )
         self.p = multiprocessing.Process(
             target=microscope.device_server.serve_devices,
@@ -389,6 +396,125 @@ class TestCopyOfDeviceConf(BaseTestServeDevices):
         )
 
 
+class OtherExposePIDDevice(ExposePIDDevice):
+    pass
+
+
+class TestGroupedDevices(BaseTestServeDevices):
+    DEVICES = [
+        microscope.device_server.device(
+            ExposePIDDevice, "127.0.0.1", 8001, group="pid"
+        ),
+        microscope.device_server.device(
+            OtherExposePIDDevice, "127.0.0.1", 8001, group="pid"
+        ),
+        microscope.device_server.device(
+            TestFilterWheel, "127.0.0.1", 8002, {"positions": 3}
+        ),
+    ]
+
+    def test_same_process(self):
+        device1 = Pyro4.Proxy("PYRO:ExposePIDDevice@127.0.0.1:8001")
+        device2 = Pyro4.Proxy("PYRO:OtherExposePIDDevice@127.0.0.1:8001")
+        self.assertEqual(device1.get_pid(), device2.get_pid())
+        filterwheel = Pyro4.Proxy("PYRO:SimulatedFilterWheel@127.0.0.1:8002")
+        self.assertEqual(filterwheel.n_positions, 3)
+
+
+class TestGroupDevices(unittest.TestCase):
+    def test_groups(self):
+        devices = [
+            microscope.device_server.device(
+                TestFilterWheel, "127.0.0.1", 8001, group="a"
+            ),
+            microscope.device_server.device(TestCamera, "127.0.0.1", 8002),
+            microscope.device_server.device(
+                ExposePIDDevice, "127.0.0.1", 8001, group="a"
+            ),
+        ]
+        self.assertEqual(
+            microscope.device_server._group_devices(devices),
+            [[devices[0], devices[2]], devices[1]],
+        )
+
+    def test_different_ports(self):
+        devices = [
+            microscope.device_server.device(
+                TestFilterWheel, "127.0.0.1", 8001, group="a"
+            ),
+            microscope.device_server.device(
+                ExposePIDDevice, "127.0.0.1", 8002, group="a"
+            ),
+        ]
+        with self.assertRaisesRegex(ValueError, "group 'a'"):
+            microscope.device_server._group_devices(devices)
+
+
+class BrokenDevice(ExposePIDDevice):
+    def __init__(self, **kwargs):
+        raise RuntimeError("not yet")
+
+
+class FlakyDevice(ExposePIDDevice):
+    attempts = 0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        FlakyDevice.attempts += 1
+        if FlakyDevice.attempts < 3:
+            raise RuntimeError("not yet")
+
+    def get_attempts(self) -> int:
+        return self.attempts
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_exponential_backoff(self):
+        policy = microscope.device_server.RetryPolicy(
+            initial_delay=1.0, max_delay=5.0, factor=2.0, max_attempts=6
+        )
+        self.assertEqual(list(policy.delays()), [1.0, 2.0, 4.0, 5.0, 5.0])
+
+    def test_delay(self):
+        policy = microscope.device_server.RetryPolicy(
+            initial_delay=1.0, max_delay=5.0, factor=3.0
+        )
+        self.assertEqual([policy.delay(i) for i in range(3)], [1.0, 3.0, 5.0])
+
+    def test_no_max_attempts(self):
+        delays = microscope.device_server.RetryPolicy().delays()
+        self.assertEqual(len([next(delays) for i in range(100)]), 100)
+
+
+class TestDeviceServerStatus(BaseTestServeDevices):
+    retry = microscope.device_server.RetryPolicy(initial_delay=0.01)
+    DEVICES = [
+        microscope.device_server.device(
+            BrokenDevice, "127.0.0.1", 8001, group="a", retry_policy=retry
+        ),
+        microscope.device_server.device(
+            FlakyDevice, "127.0.0.1", 8001, group="a", retry_policy=retry
+        ),
+    ]
+
+    def test_status(self):
+        status = Pyro4.Proxy(
+            "PYRO:%s@127.0.0.1:8001"
+            % microscope.device_server.STATUS_OBJECT_ID
+        )
+        # The broken device does not stop the other from being served.
+        self.assertFalse(status.is_ready())
+        self.assertEqual(
+            status.get_devices(),
+            {"FlakyDevice": "PYRO:FlakyDevice@127.0.0.1:8001"},
+        )
+        pending = status.get_pending()
+        self.assertEqual(list(pending.keys()), ["BrokenDevice"])
+        self.assertRegex(pending["BrokenDevice"], "not yet")
+        device = Pyro4.Proxy("PYRO:FlakyDevice@127.0.0.1:8001")
+        self.assertEqual(device.get_attempts(), 3)
+
+
 class TestKeepDeviceServerAlive(BaseTestServeDevices):
     DEVICES = [
         microscope.device_server.device(
@@ -409,14 +535,141 @@ class TestKeepDeviceServerAlive(BaseTestServeDevices):
         with self.assertRaises(Pyro4.errors.ConnectionClosedError):
             device.get_pid()
 
-        # The device server checks every 5 seconds for a crashed
-        # device server so give it 6 seconds.
-        time.sleep(6)
+        # The supervisor notices a dead device server immediately but
+        # the new process needs time to start.
+        time.sleep(2)
+
+        device._pyroReconnect(tries=1)
+        new_pid = device.get_pid()
+        self.assertNotEqual(initial_pid, new_pid)
+
+
+class TestRestartHungDeviceServer(BaseTestServeDevices):
+    DEVICES = [
+        microscope.device_server.device(
+            ExposePIDDevice, "127.0.0.1", 8001, {}
+        ),
+    ]
+    OPTIONS = {"health_check_interval": 0.5, "health_check_timeout": 0.5}
+
+    @unittest.skipUnless(
+        hasattr(signal, "SIGSTOP"),
+        "can't test if we can't stop subprocess (windows)",
+    )
+    def test_restart_hung(self):
+        device = Pyro4.Proxy("PYRO:ExposePIDDevice@127.0.0.1:8001")
+        initial_pid = device.get_pid()
+
+        # A stopped process is alive but does not respond.
+        os.kill(initial_pid, signal.SIGSTOP)
+        time.sleep(3)
 
         device._pyroReconnect(tries=1)
         new_pid = device.get_pid()
         self.assertNotEqual(initial_pid, new_pid)
 
 
+class TestSupervisorHealthCheck(unittest.TestCase):
+    def setUp(self):
+        options = microscope.device_server.DeviceServerOptions(
+            config_fpath="",
+            logging_level=logging.INFO,
+            logging_dir="",
+        )
+        servers = [
+            microscope.device_server.DeviceServer(
+                microscope.device_server.device(
+                    ExposePIDDevice, "127.0.0.1", port, {}
+                ),
+                options,
+                {},
+                {},
+            )
+            for port in (8001, 8002)
+        ]
+        self.supervisor = microscope.device_server._Supervisor(
+            servers,
+            multiprocessing.Event(),
+            multiprocessing.Queue(),
+            health_check_interval=0.1,
+        )
+        self.records = self.supervisor._records
+        for record in self.records:
+            record.address = ("127.0.0.1", 0)
+
+        # The servers are never started, pretend they are alive but
+        # do not respond until told to.
+        self.release = threading.Event()
+
+        def is_responsive(name, address):
+            self.release.wait()
+            return False
+
+        patches = [
+            unittest.mock.patch.object(
+                self.supervisor, "_is_responsive", side_effect=is_responsive
+            ),
+            unittest.mock.patch.object(
+                microscope.device_server.DeviceServer,
+                "is_alive",
+                return_value=True,
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.release.set)
+
+    def check_all(self):
+        with self.supervisor._records_lock:
+            return [r for r in self.records if self.supervisor._check(r)]
+
+    def test_hung_server_does_not_block(self):
+        self.assertEqual(self.check_all(), [])
+        # Both checks are running at the same time and neither holds
+        # the lock, so the stats can still be read.
+        self.assertTrue(all(record.checking for record in self.records))
+        self.assertEqual(len(self.supervisor.get_stats()), 2)
+
+        self.release.set()
+        for _ in range(50):
+            if not any(record.checking for record in self.records):
+                break
+            time.sleep(0.1)
+        self.assertEqual(self.check_all(), self.records)
+
+
+class TestMetricsEndpoint(BaseTestServeDevices):
+    DEVICES = [
+        microscope.device_server.device(TestCamera, "127.0.0.1", 8001, {}),
+    ]
+    OPTIONS = {"metrics_port": 8010}
+
+    def test_metrics(self):
+        camera = Pyro4.Proxy("PYRO:TestCamera@127.0.0.1:8001")
+        camera.get_is_enabled()
+        with urllib.request.urlopen("http://127.0.0.1:8010/metrics") as r:
+            text = r.read().decode()
+        server = 'server="TestCamera@127.0.0.1:8001"'
+        device = server + ',device="TestCamera"'
+        self.assertIn("microscope_server_restarts_total{%s} 0" % server, text)
+        self.assertIn(
+            "microscope_pyro_request_seconds_count{%s}" % server, text
+        )
+        self.assertIn(
+            'microscope_pyro_call_seconds_count{%s,method="get_is_enabled"} 1'
+            % device,
+            text,
+        )
+        self.assertIn("microscope_frames_fetched_total{%s} 0" % device, text)
+        self.assertIn(
+            "# TYPE microscope_dispatch_latency_seconds histogram", text
+        )
+
+    def test_not_found(self):
+        with self.assertRaises(urllib.error.HTTPError):
+            urllib.request.urlopen("http://127.0.0.1:8010/")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -35,6 +35,7 @@ constructs the device instance required to run the tests.
 
 """
 
+import queue
 import unittest
 import unittest.mock
 from queue import Queue
@@ -148,6 +149,22 @@ class DeviceTests:
         self.device.disable()
         self.device.disable()
 
+    def test_call_many(self):
+        self.device.initialize()
+        self.device.enable()
+        self.assertEqual(
+            self.device.call_many(["get_is_enabled", ("enabled",)]),
+            [self.device.get_is_enabled(), self.device.enabled],
+        )
+
+    def test_call_many_exceptions(self):
+        calls = [("get_is_enabled", (1,)), "_do_shutdown"]
+        with self.assertRaises(TypeError):
+            self.device.call_many(calls)
+        results = self.device.call_many(calls, return_exceptions=True)
+        self.assertIsInstance(results[0], TypeError)
+        self.assertIsInstance(results[1], AttributeError)
+
 
 class SerialDeviceTests:
     def test_connection_defaults(self):
@@ -559,5 +576,108 @@ class TestBaseDevice(unittest.TestCase):
                 simulators.SimulatedLightSource(power=2)
 
 
+class TestChangeListeners(unittest.TestCase):
+    def setUp(self):
+        self.changes = queue.Queue()
+
+    def _listen(self, device):
+        device._change_interval = 0.01
+        device.add_change_listener(self.changes.put)
+        self.addCleanup(device.shutdown)
+
+    def test_settings(self):
+        device = simulators.SimulatedCamera()
+        self._listen(device)
+        device.set_setting("gain", 10)
+        device.set_setting("gain", 20)
+        device.update_settings({"a_setting": 5})
+        # Changes within the same interval are coalesced.
+        changes = {}
+        while changes.get("settings", {}).get("a_setting") != 5:
+            for key, value in self.changes.get(timeout=5).items():
+                if key == "settings":
+                    changes.setdefault(key, {}).update(value)
+                else:
+                    changes[key] = value
+        self.assertEqual(changes["settings"]["gain"], 20)
+
+    def test_enabled(self):
+        device = simulators.SimulatedFilterWheel(positions=4)
+        self._listen(device)
+        device.enable()
+        self.assertEqual(self.changes.get(timeout=5), {"enabled": True})
+
+    def test_light_power(self):
+        device = simulators.SimulatedLightSource()
+        device.enable()
+        self._listen(device)
+        device.power = 0.5
+        self.assertEqual(self.changes.get(timeout=5), {"power": 0.5})
+
+    def test_stage_position(self):
+        device = simulators.SimulatedStage(
+            {"x": microscope.AxisLimits(0, 100)}
+        )
+        device.enable()
+        self._listen(device)
+        device.move_to({"x": 75})
+        self.assertEqual(self.changes.get(timeout=5), {"position": {"x": 75}})
+
+    def test_stage_move_by(self):
+        device = simulators.SimulatedStage(
+            {"x": microscope.AxisLimits(0, 100)}
+        )
+        device.enable()
+        self._listen(device)
+        device.move_to({"x": 50})
+        device.move_by({"x": 10})
+        changes = self.changes.get(timeout=5)
+        while changes["position"] != {"x": 60}:
+            changes = self.changes.get(timeout=5)
+
+    def test_no_hardware_polling_by_default(self):
+        device = simulators.SimulatedLightSource()
+        device.enable()
+        self._listen(device)
+        with unittest.mock.patch.object(
+            device, "_do_get_power", wraps=device._do_get_power
+        ) as get_power:
+            # Changed on the hardware, not through the device.
+            device._do_set_power(0.5)
+            with self.assertRaises(queue.Empty):
+                self.changes.get(timeout=0.1)
+            get_power.assert_not_called()
+
+    def test_polled_hardware_values(self):
+        device = simulators.SimulatedLightSource()
+        device.enable()
+        device._change_poll_interval = 0.01
+        self._listen(device)
+        device._do_set_power(0.5)
+        self.assertEqual(self.changes.get(timeout=5), {"power": 0.5})
+
+    def test_remove_listener(self):
+        device = simulators.SimulatedFilterWheel(positions=4)
+        self._listen(device)
+        device.remove_change_listener(self.changes.put)
+        with self.assertRaises(ValueError):
+            device.remove_change_listener(self.changes.put)
+        device.enable()
+        with self.assertRaises(queue.Empty):
+            self.changes.get(timeout=0.1)
+
+    def test_failing_listener_is_removed(self):
+        device = simulators.SimulatedFilterWheel(positions=4)
+        listener = unittest.mock.Mock(side_effect=ConnectionError)
+        device._change_interval = 0.01
+        device._change_poll_interval = 0.01
+        device.add_change_listener(listener)
+        device.enable()
+        device._change_thread.join(timeout=5)
+        listener.assert_called_once_with({"enabled": True})
+        with self.assertRaises(ValueError):
+            device.remove_change_listener(listener)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+## Copyright (C) 2026 David Miguel Susano Pinto <carandraug@gmail.com>
+##
+## This file is part of Microscope.
+##
+## Microscope is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Microscope is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the Hamamatsu camera without the DCAM library.
+
+The DCAM library is replaced with a mock, so these only test the
+logic of the driver and not the calls to the library.
+"""
+
+import sys
+import threading
+import time
+import unittest
+import unittest.mock
+
+import microscope
+import microscope._utils
+import microscope.abc
+
+
+class _MockLibrary:
+    """Mock of the DCAM library where all functions return success."""
+
+    def __getattr__(self, name):
+        function = unittest.mock.MagicMock(return_value=0)
+        setattr(self, name, function)
+        return function
+
+
+def _import_with_mock_library():
+    """Import the hamamatsu module with a mock of the DCAM library."""
+    with unittest.mock.patch.dict(sys.modules), unittest.mock.patch(
+        "microscope._utils.library_loader", return_value=_MockLibrary()
+    ):
+        sys.modules.pop("microscope._wrappers.dcamapi4", None)
+        sys.modules.pop("microscope.cameras.hamamatsu", None)
+        import microscope.cameras.hamamatsu
+
+        return microscope.cameras.hamamatsu
+
+
+class TestWaitForData(unittest.TestCase):
+    def setUp(self):
+        hamamatsu = _import_with_mock_library()
+        self.dcam = hamamatsu.dcam
+        # Skip the constructor, which opens the camera.
+        self.camera = hamamatsu.HamamatsuCamera.__new__(
+            hamamatsu.HamamatsuCamera
+        )
+        microscope.abc.Camera.__init__(self.camera)
+        self.camera._hdcam = None
+        self.camera._wait_open = self.dcam.WAIT_OPEN()
+        self.camera._wait_start = self.dcam.WAIT_START()
+        self.camera._frame_ready = False
+        # A failure that is not a timeout.
+        self.dcam.wait_start.return_value = self.dcam.ERR.NOCAMERA.value
+
+    def test_failure_raises(self):
+        with self.assertRaises(microscope.DeviceError):
+            self.camera._wait_for_data(0.1)
+
+    def test_fetch_loop_does_not_spin(self):
+        fetch_thread = threading.Thread(target=self.camera._fetch_loop)
+        fetch_thread.start()
+        time.sleep(0.3)
+        self.camera._fetch_thread_run = False
+        fetch_thread.join()
+        # The fetch loop falls back to polling, which waits at least
+        # 0.1 ms and up to 10 ms between calls.
+        self.assertGreater(self.dcam.wait_start.call_count, 0)
+        self.assertLess(self.dcam.wait_start.call_count, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
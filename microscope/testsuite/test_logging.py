@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+## Copyright (C) 2026 David Miguel Susano Pinto <carandraug@gmail.com>
+##
+## This file is part of Microscope.
+##
+## Microscope is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Microscope is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the rate limited logging of the hot paths."""
+
+import logging
+import unittest
+import unittest.mock
+
+import microscope._logging
+
+
+class TestHotPathLogger(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("microscope.test-hot-path")
+        self.hot_logger = microscope._logging.HotPathLogger(
+            self.logger, interval=10.0
+        )
+
+    def test_rate_limit(self):
+        with unittest.mock.patch("time.monotonic", return_value=0.0):
+            with self.assertLogs(self.logger, logging.DEBUG) as logs:
+                for i in range(3):
+                    self.hot_logger.debug("frame %d", i)
+        self.assertEqual(logs.output, ["DEBUG:%s:frame 0" % self.logger.name])
+        with unittest.mock.patch("time.monotonic", return_value=10.0):
+            with self.assertLogs(self.logger, logging.DEBUG) as logs:
+                self.hot_logger.debug("frame %d", 3)
+        self.assertEqual(
+            logs.output,
+            [
+                "DEBUG:%s:frame 3 (2 similar messages suppressed)"
+                % self.logger.name
+            ],
+        )
+        self.assertEqual(logs.records[0].suppressed, 2)
+        self.assertEqual(self.hot_logger.get_counts(), {"frame %d": 4})
+
+    def test_disabled_level_is_not_counted(self):
+        self.logger.setLevel(logging.INFO)
+        self.addCleanup(self.logger.setLevel, logging.NOTSET)
+        self.hot_logger.debug("frame %d", 0)
+        self.assertEqual(self.hot_logger.get_counts(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+## Copyright (C) 2026 David Miguel Susano Pinto <carandraug@gmail.com>
+##
+## This file is part of Microscope.
+##
+## Microscope is free software: you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Microscope is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with Microscope.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the metrics reported by devices and device servers."""
+
+import unittest
+
+import microscope._metrics
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = microscope._metrics.Histogram(buckets=[1.0, 2.0])
+        for value in [0.5, 1.0, 1.5, 3.0]:
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(
+            snapshot["buckets"], [(1.0, 2), (2.0, 3), (float("inf"), 4)]
+        )
+        self.assertEqual(snapshot["count"], 4)
+        self.assertEqual(snapshot["sum"], 6.0)
+
+
+class TestFormatMetrics(unittest.TestCase):
+    def test_format(self):
+        text = microscope._metrics.format_metrics(
+            [
+                ("frames_total", {"device": 'a"b'}, 2),
+                ("frames_total", {"device": "c"}, 3),
+                ("healthy", {}, True),
+                ("name", {}, "not a number"),
+            ]
+        )
+        self.assertEqual(
+            text,
+            "# TYPE microscope_frames_total counter\n"
+            'microscope_frames_total{device="a\\"b"} 2\n'
+            'microscope_frames_total{device="c"} 3\n'
+            "# TYPE microscope_healthy gauge\n"
+            "microscope_healthy 1\n",
+        )
+
+    def test_special_values(self):
+        text = microscope._metrics.format_metrics(
+            [
+                ("up", {}, float("inf")),
+                ("down", {}, float("-inf")),
+                ("unknown", {}, float("nan")),
+            ]
+        )
+        self.assertEqual(
+            text,
+            "# TYPE microscope_up gauge\n"
+            "microscope_up +Inf\n"
+            "# TYPE microscope_down gauge\n"
+            "microscope_down -Inf\n"
+            "# TYPE microscope_unknown gauge\n"
+            "microscope_unknown NaN\n",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,9 +21,13 @@
 """
 
 import enum
+import functools
+import math
 import unittest
+import unittest.mock
 
 import microscope.abc
+import microscope.simulators
 
 
 class EnumSetting(enum.Enum):
@@ -77,5 +81,236 @@ class TestEnumSetting(unittest.TestCase):
         self.assertEqual(EnumSetting(2), thing.val)
 
 
+class TestSettingCache(unittest.TestCase):
+    def setUp(self):
+        self.thing = ThingWithSomething(1)
+        self.getter = unittest.mock.Mock(side_effect=self.thing.get_val)
+
+    def create_setting(self, cache_ttl):
+        return microscope.abc._Setting(
+            "foobar",
+            "int",
+            get_func=self.getter,
+            set_func=self.thing.set_val,
+            values=(0, 10),
+            cache_ttl=cache_ttl,
+        )
+
+    def test_no_cache_by_default(self):
+        setting = self.create_setting(None)
+        self.assertEqual([setting.get(), setting.get()], [1, 1])
+        self.assertEqual(self.getter.call_count, 2)
+
+    def test_static(self):
+        setting = self.create_setting(math.inf)
+        self.assertEqual([setting.get(), setting.get()], [1, 1])
+        self.getter.assert_called_once()
+
+    def test_set_invalidates(self):
+        setting = self.create_setting(math.inf)
+        setting.get()
+        setting.set(2)
+        self.assertEqual(setting.get(), 2)
+        self.assertEqual(self.getter.call_count, 2)
+
+    def test_expired(self):
+        setting = self.create_setting(10.0)
+        setting.get()
+        self.thing.val = 2
+        self.assertEqual(setting.get(), 1)
+        with unittest.mock.patch("time.monotonic", return_value=math.inf):
+            self.assertEqual(setting.get(), 2)
+
+    def test_age(self):
+        setting = self.create_setting(math.inf)
+        self.assertEqual(setting.get_with_age(), (1, 0.0))
+        value, age = setting.get_with_age()
+        self.assertGreaterEqual(age, 0.0)
+        self.getter.assert_called_once()
+        setting.get_with_age(max_age=-1.0)
+        self.assertEqual(self.getter.call_count, 2)
+
+
+class TestSettingValues(unittest.TestCase):
+    def create_setting(self, values, static_values):
+        thing = ThingWithSomething(0)
+        return microscope.abc._Setting(
+            "foobar",
+            "enum",
+            get_func=thing.get_val,
+            set_func=thing.set_val,
+            values=values,
+            static_values=static_values,
+        )
+
+    def test_values_called_each_time(self):
+        values = unittest.mock.Mock(return_value=["a", "b"])
+        setting = self.create_setting(values, False)
+        self.assertEqual(setting.values(), setting.values())
+        self.assertEqual(values.call_count, 2)
+
+    def test_static_values(self):
+        values = unittest.mock.Mock(side_effect=lambda: iter(["a", "b"]))
+        setting = self.create_setting(values, True)
+        self.assertEqual(setting.values(), [(0, "a"), (1, "b")])
+        self.assertEqual(setting.describe()["values"], [(0, "a"), (1, "b")])
+        values.assert_called_once()
+        setting.values().clear()
+        self.assertEqual(setting.values(), [(0, "a"), (1, "b")])
+        setting.invalidate()
+        setting.values()
+        self.assertEqual(values.call_count, 2)
+
+    def test_enum_values(self):
+        setting, thing = create_enum_setting(1)
+        self.assertEqual(setting.values(), [(0, "A"), (1, "B"), (2, "C")])
+        self.assertIsNotNone(setting._values_cache)
+
+    def test_no_instance_dict(self):
+        setting, thing = create_enum_setting(1)
+        with self.assertRaises(AttributeError):
+            setting.something = None
+
+
+class TestDeviceSettingsCache(unittest.TestCase):
+    def setUp(self):
+        self.device = microscope.simulators.SimulatedFilterWheel(positions=4)
+        self.thing = ThingWithSomething(1)
+        self.device.add_setting(
+            "static",
+            "int",
+            self.thing.get_val,
+            self.thing.set_val,
+            (0, 10),
+            cache_ttl=math.inf,
+        )
+
+    def test_set_setting_invalidates(self):
+        self.assertEqual(self.device.get_setting("static"), 1)
+        self.thing.val = 2
+        self.assertEqual(self.device.get_setting("static"), 1)
+        self.device.set_setting("static", 3)
+        self.assertEqual(self.device.get_setting("static"), 3)
+
+    def test_snapshot(self):
+        self.device.get_setting("static")
+        self.thing.val = 2
+        snapshot = self.device.get_settings_snapshot()
+        self.assertEqual(snapshot["static"][0], 1)
+        self.assertGreaterEqual(snapshot["static"][1], 0.0)
+        self.assertEqual(
+            self.device.get_settings_snapshot(max_age=-1.0)["static"][0], 2
+        )
+
+    def test_clear_cache(self):
+        self.device.get_setting("static")
+        self.thing.val = 2
+        self.device.clear_settings_cache("static")
+        self.assertEqual(self.device.get_setting("static"), 2)
+        self.thing.val = 3
+        self.device.clear_settings_cache()
+        self.assertEqual(self.device.get_setting("static"), 3)
+
+
+class TestUpdateSettings(unittest.TestCase):
+    def setUp(self):
+        self.device = microscope.simulators.SimulatedFilterWheel(positions=4)
+        self.calls = []
+        self.things = {}
+        for name in ["first", "second", "third"]:
+            thing = ThingWithSomething(1)
+            self.things[name] = thing
+            self.device.add_setting(
+                name,
+                "int",
+                thing.get_val,
+                functools.partial(self._set, name),
+                (0, 10),
+            )
+
+    def _set(self, name, value):
+        self.calls.append(name)
+        self.things[name].set_val(value)
+
+    def test_only_changes_are_set(self):
+        results = self.device.update_settings({"first": 1, "second": 2})
+        self.assertEqual(self.calls, ["second"])
+        self.assertEqual(results, {"second": 2})
+
+    def test_declared_order(self):
+        self.device.update_settings({"third": 3, "second": 2, "first": 0})
+        self.assertEqual(self.calls, ["first", "second", "third"])
+
+    def test_init_sets_everything(self):
+        settings = self.device.get_all_settings()
+        self.device.update_settings(settings, init=True)
+        self.assertEqual(self.calls, ["first", "second", "third"])
+        del settings["first"]
+        with self.assertRaisesRegex(Exception, "missing keys: first"):
+            self.device.update_settings(settings, init=True)
+
+    def test_init_without_readonly(self):
+        self.device.add_setting(
+            "readonly", "int", lambda: 5, None, values=tuple()
+        )
+        settings = self.device.get_all_settings()
+        del settings["readonly"]
+        results = self.device.update_settings(settings, init=True)
+        self.assertNotIn("readonly", results)
+
+
+class TestDataDeviceUpdateSettings(unittest.TestCase):
+    def setUp(self):
+        self.device = microscope.simulators.SimulatedCamera()
+        self.things = {}
+        for name in ["restart 1", "restart 2"]:
+            thing = ThingWithSomething(1)
+            self.things[name] = thing
+            self.device.add_setting(
+                name, "int", thing.get_val, thing.set_val, (0, 10)
+            )
+        self.device.enable()
+        self.addCleanup(self.device.shutdown)
+
+    def assertRestarts(self, n, func, *args):
+        with unittest.mock.patch.object(
+            self.device, "abort", wraps=self.device.abort
+        ) as abort:
+            result = func(*args)
+        self.assertEqual(abort.call_count, n)
+        self.assertTrue(self.device._acquiring)
+        return result
+
+    def test_no_restart_without_changes(self):
+        gain = self.device.get_setting("gain")
+        results = self.assertRestarts(
+            0, self.device.update_settings, {"restart 1": 1, "gain": gain}
+        )
+        self.assertEqual(results, {})
+
+    def test_restart_on_changes(self):
+        results = self.assertRestarts(
+            1, self.device.update_settings, {"restart 1": 5}
+        )
+        self.assertEqual(results, {"restart 1": 5})
+
+    def test_no_restart_if_not_required(self):
+        self.assertRestarts(0, self.device.set_setting, "gain", 10)
+        self.assertRestarts(0, self.device.update_settings, {"gain": 20})
+        self.assertEqual(self.device.get_setting("gain"), 20)
+
+    def test_set_setting_restart(self):
+        self.assertRestarts(1, self.device.set_setting, "restart 1", 5)
+        self.assertEqual(self.things["restart 1"].val, 5)
+
+    def test_restarts_coalesced(self):
+        self.assertRestarts(
+            1,
+            self.device.update_settings,
+            {"restart 1": 5, "restart 2": 6, "gain": 7},
+        )
+        self.assertEqual(self.things["restart 2"].val, 6)
+
+
 if __name__ == "__main__":
     unittest.main()